@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from typing import BinaryIO, NamedTuple, TextIO
+
+from geojson_pydantic import Feature
+
+from geodense.filters import FeatureFilter
+from geodense.geojson import CrsFeatureCollection
+from geodense.models import DenseConfig, GeodenseError
+
+CHECKPOINT_INTERVAL = 1000  # default nr of features densified between checkpoint records
+CHECKPOINT_FILE_EXT = ".checkpoint"
+
+
+class Checkpoint(NamedTuple):
+    """Checkpoint record, appended to the checkpoint file after a batch of features is densified and written to output."""
+
+    feature_index: int  # index of last completed input feature
+    input_offset: int  # UTF-8 byte offset of the end of the last completed feature in (decompressed) input
+    output_offset: int  # size of output in bytes up to and including the last completed feature
+    config_hash: str
+
+
+def get_checkpoint_path(output_file_path: str) -> str:
+    return f"{output_file_path}{CHECKPOINT_FILE_EXT}"
+
+
+def densify_with_checkpoints(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geojson_obj: CrsFeatureCollection,
+    input_offsets: list[int],
+    output_file_path: str,
+    densify_batch: Callable[[CrsFeatureCollection], CrsFeatureCollection],
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+    resume: bool = False,
+    feature_filter: FeatureFilter | None = None,
+) -> None:
+    """Densify features of geojson_obj in batches of checkpoint_interval features with densify_batch, writing output and a checkpoint record after each batch.
+
+    The output FeatureCollection is written incrementally, with one feature per line. After each batch the output is
+    flushed to disk and a Checkpoint is appended to the checkpoint file next to the output (see get_checkpoint_path).
+    With resume, the features up to the last checkpoint are skipped and the output is truncated to the size recorded
+    in the checkpoint and appended to. Resuming requires the same input file and parameters, which is verified with
+    the config hash and the input offset of the checkpoint. The checkpoint file is removed when the output is complete.
+    The crs member of the output is taken from geojson_obj, input_offsets are the byte offsets of the ends of its
+    features in the input (see _text_to_geojson_with_offsets). densify_config and feature_filter are the parameters of
+    densify_batch, used to verify that a resumed run densifies with the same parameters.
+    """
+    if checkpoint_interval < 1:
+        raise GeodenseError(f"checkpoint_interval should be at least 1, received: {checkpoint_interval}")
+    config_hash = _get_config_hash(densify_config, geojson_obj, input_offsets, feature_filter)
+    checkpoint_path = get_checkpoint_path(output_file_path)
+    checkpoint = _read_checkpoint(checkpoint_path, output_file_path, config_hash, input_offsets) if resume else None
+    prefix, suffix = _get_feature_collection_json(geojson_obj)
+    features = geojson_obj.features
+
+    with (
+        open(output_file_path, "r+b" if checkpoint is not None else "wb") as out,
+        open(checkpoint_path, "a" if checkpoint is not None else "w") as checkpoint_file,
+    ):
+        if checkpoint is None:
+            out.write(prefix)
+        else:
+            out.truncate(checkpoint.output_offset)
+            out.seek(checkpoint.output_offset)
+        first = out.tell() == len(prefix)  # no features written yet
+        for start in range(
+            checkpoint.feature_index + 1 if checkpoint is not None else 0, len(features), checkpoint_interval
+        ):
+            end = min(start + checkpoint_interval, len(features))
+            batch = geojson_obj.model_copy(update={"features": features[start:end]})
+            batch_t = densify_batch(batch)
+            for feature in batch_t.features:
+                out.write((b"\n" if first else b",\n") + _feature_to_json(feature))
+                first = False
+            _write_checkpoint(
+                out, checkpoint_file, Checkpoint(end - 1, input_offsets[end - 1], out.tell(), config_hash)
+            )
+        out.write(b"\n" + suffix + b"\n")
+    os.remove(checkpoint_path)
+
+
+def _feature_to_json(feature: Feature) -> bytes:
+    return feature.model_dump_json(exclude_none=True).encode("utf-8")
+
+
+def _get_feature_collection_json(geojson_obj: CrsFeatureCollection) -> tuple[bytes, bytes]:
+    """Returns JSON of geojson_obj before and after the elements of its features array."""
+    empty_json = geojson_obj.model_copy(update={"features": []}).model_dump_json(exclude_none=True)
+    prefix, suffix = empty_json.split('"features":[]', 1)
+    return f'{prefix}"features":['.encode(), f"]{suffix}".encode()
+
+
+def _get_config_hash(
+    densify_config: DenseConfig,
+    geojson_obj: CrsFeatureCollection,
+    input_offsets: list[int],
+    feature_filter: FeatureFilter | None,
+) -> str:
+    """Hash of the parameters that determine the output, and of the nr of features and size of the input."""
+    params = {
+        "nr_features": len(input_offsets),
+        "input_size": input_offsets[-1] if len(input_offsets) > 0 else 0,
+        "crs": geojson_obj.get_crs_auth_code(),
+        "src_crs": densify_config.src_crs.to_wkt(),
+        "dst_crs": densify_config.dst_crs.to_wkt() if densify_config.dst_crs is not None else None,
+        "max_segment_length": densify_config.max_segment_length,
+        "in_projection": densify_config.in_projection,
+        "tolerance": densify_config.tolerance,
+        "where": feature_filter.where if feature_filter is not None else None,
+        "bbox": feature_filter.bbox if feature_filter is not None else None,
+        "drop_unselected": feature_filter.drop_unselected if feature_filter is not None else None,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _read_checkpoint(
+    checkpoint_path: str, output_file_path: str, config_hash: str, input_offsets: list[int]
+) -> Checkpoint | None:
+    """Returns last checkpoint record in checkpoint file, None when the file contains no complete record."""
+    if not os.path.exists(checkpoint_path) or not os.path.exists(output_file_path):
+        raise GeodenseError(
+            f"cannot resume, no checkpoint file {checkpoint_path} or output file {output_file_path} found, the output is complete or was not written with checkpoints"
+        )
+    checkpoint: Checkpoint | None = None
+    with open(checkpoint_path) as f:
+        for line in f:
+            if not line.endswith("\n"):  # record partially written before interruption
+                break
+            checkpoint = Checkpoint(**json.loads(line))
+    if checkpoint is None:
+        return None
+    if checkpoint.config_hash != config_hash:
+        raise GeodenseError(
+            "cannot resume, input file or parameters differ from those of the checkpoint, densify with the same input file and parameters"
+        )
+    if (
+        checkpoint.feature_index >= len(input_offsets)
+        or input_offsets[checkpoint.feature_index] != checkpoint.input_offset
+    ):
+        raise GeodenseError("cannot resume, input file changed since the checkpoint")
+    if os.path.getsize(output_file_path) < checkpoint.output_offset:
+        raise GeodenseError(f"cannot resume, output file {output_file_path} is smaller than recorded in the checkpoint")
+    return checkpoint
+
+
+def _write_checkpoint(out: BinaryIO, checkpoint_file: TextIO, checkpoint: Checkpoint) -> None:
+    """Append checkpoint record to checkpoint file, after the output up to the checkpoint is written to disk."""
+    out.flush()
+    os.fsync(out.fileno())
+    checkpoint_file.write(json.dumps(checkpoint._asdict()) + "\n")
+    checkpoint_file.flush()
+    os.fsync(checkpoint_file.fileno())
@@ -0,0 +1,87 @@
+import json
+import operator
+import re
+from collections.abc import Callable
+from typing import Any
+
+from geodense.models import GeodenseError
+
+WHERE_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "!=": operator.ne,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "=": operator.eq,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+_WHERE_PATTERN = re.compile(r"^\s*([^!<>=\s]+)\s*(!=|<=|>=|=|<|>)\s*(.*?)\s*$")
+
+
+class FeatureFilter:
+    """Selects features by property predicates and bbox, features that are not selected are not densified or checked.
+
+    A where predicate has the form KEY OP VALUE, with OP one of =, !=, <, <=, >, >=, for example type=national_border
+    or population>=1000. KEY is a property name, or a dotted path for nested properties. VALUE is parsed as JSON when
+    possible (numbers, true, false, null and quoted strings), otherwise it is a string. A feature is selected when all
+    predicates match and the bbox of its geometry intersects bbox (x_min, y_min, x_max, y_max in src crs). A predicate
+    does not match when the property is missing or cannot be compared with VALUE. When drop_unselected is set, features
+    that are not selected are dropped from the output of densify instead of passed through.
+    """
+
+    def __init__(
+        self: "FeatureFilter",
+        where: list[str] | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+        drop_unselected: bool = False,
+    ) -> None:
+        self.where = where or []
+        self.predicates = [self._parse_where(x) for x in self.where]
+        if bbox is not None and (bbox[0] > bbox[2] or bbox[1] > bbox[3]):
+            raise GeodenseError(f"invalid bbox {bbox}, expected: x_min,y_min,x_max,y_max")
+        self.bbox = bbox
+        self.drop_unselected = drop_unselected
+
+    def matches(
+        self: "FeatureFilter", properties: dict[str, Any] | None, bbox: tuple[float, float, float, float] | None
+    ) -> bool:
+        """Whether feature with properties and geometry bbox (None when the geometry is null or empty) is selected."""
+        if self.bbox is not None and (
+            bbox is None
+            or bbox[0] > self.bbox[2]
+            or bbox[2] < self.bbox[0]
+            or bbox[1] > self.bbox[3]
+            or bbox[3] < self.bbox[1]
+        ):
+            return False
+        return all(self._matches_predicate(properties, *predicate) for predicate in self.predicates)
+
+    @staticmethod
+    def _parse_where(where: str) -> tuple[list[str], Callable[[Any, Any], bool], Any]:
+        match = _WHERE_PATTERN.match(where)
+        if match is None:
+            raise GeodenseError(
+                f"invalid where predicate: {where}, expected: KEY OP VALUE with OP one of {', '.join(WHERE_OPERATORS)}"
+            )
+        key, op, value = match.groups()
+        try:
+            parsed_value = json.loads(value)
+        except json.JSONDecodeError:
+            parsed_value = value
+        return key.split("."), WHERE_OPERATORS[op], parsed_value
+
+    @staticmethod
+    def _matches_predicate(
+        properties: dict[str, Any] | None,
+        path: list[str],
+        op: Callable[[Any, Any], bool],
+        value: Any,  # noqa: ANN401
+    ) -> bool:
+        node: Any = properties
+        for key in path:
+            if not isinstance(node, dict) or key not in node:
+                return False
+            node = node[key]
+        try:
+            return op(node, value)
+        except TypeError:  # e.g. ordering comparison of str and int
+            return False
@@ -0,0 +1,655 @@
+import json
+import logging
+import math
+from array import array
+from collections.abc import Iterator
+from typing import NamedTuple, cast
+
+from geojson_pydantic.types import Position, Position2D, Position3D
+from pyproj import CRS
+
+from geodense.lib import (
+    DEFAULT_CRS_2D,
+    DEFAULT_CRS_3D,
+    ReportFile,
+    bbox_may_exceed_max_segment_length,
+    cartesian_distance,
+    densify_vertex_range,
+    get_intermediate_nr_points_and_segment_length,
+    get_min_scale_factor_bbox,
+    validate_dependent_file_args,
+    write_density_report,
+)
+from geodense.models import DEFAULT_PRECISION_METERS, DenseConfig, DenseStats, GeodenseError
+from geodense.types import ReportFormat, ReportSegment
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError as e:
+    raise ImportError("GeoArrow support requires pyarrow, install with: pip install geodense[arrow]") from e
+
+# nr of nested lists of GeoArrow native geometry type, the innermost list is a linestring or ring of coordinates
+GEOARROW_LIST_LEVELS = {
+    "geoarrow.linestring": 1,
+    "geoarrow.multilinestring": 2,
+    "geoarrow.polygon": 2,
+    "geoarrow.multipolygon": 3,
+}
+GEOARROW_FILE_EXTENSIONS = [".arrow", ".arrows", ".feather", ".ipc"]
+EXTENSION_NAME_KEY = b"ARROW:extension:name"
+EXTENSION_METADATA_KEY = b"ARROW:extension:metadata"
+ITEM_SIZE = 8  # bytes per float64 coordinate
+
+logger = logging.getLogger("geodense")
+
+
+class _FlatGeometries(NamedTuple):
+    """Chunk of GeoArrow array as flat buffers: offsets per list level (starting at 0, the offsets of the innermost level index the coordinates), coordinates per dimension and null flag per geometry."""
+
+    offsets: list[list[int]]
+    xs: array
+    ys: array
+    zs: array | None
+    nulls: list[bool]
+
+
+def read_geoarrow_ipc(path: str) -> pa.Table:
+    """Read Arrow IPC file (file or stream format), memory mapped so columns are read without copying."""
+    source = pa.memory_map(path)
+    try:
+        return pyarrow.ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pyarrow.ipc.open_stream(source).read_all()
+
+
+def write_geoarrow_ipc(table: pa.Table, path: str) -> None:
+    """Write table as Arrow IPC file."""
+    with pyarrow.ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table)
+
+
+def get_geometry_column(schema: pa.Schema, column: str | None = None) -> tuple[int, str]:
+    """Index and GeoArrow extension name of geometry column, the first column with a supported GeoArrow geometry type when column is None."""
+    names = [column] if column is not None else schema.names
+    for name in names:
+        index = schema.get_field_index(name)
+        if index == -1:
+            raise GeodenseError(f"column {name} not found, columns: {', '.join(schema.names)}")
+        extension_name = _get_extension_name(schema.field(index))
+        if extension_name in GEOARROW_LIST_LEVELS:
+            return index, extension_name
+        if column is not None:
+            raise GeodenseError(
+                f"unsupported geometry type of column {column}: {extension_name}, expected one of: {', '.join(GEOARROW_LIST_LEVELS)}"
+            )
+    raise GeodenseError(
+        f"no GeoArrow geometry column found, expected column with one of: {', '.join(GEOARROW_LIST_LEVELS)}"
+    )
+
+
+def get_geoarrow_crs(field: pa.Field) -> CRS | None:
+    """CRS in GeoArrow extension metadata of field, None when not set."""
+    crs = _get_extension_metadata(field).get("crs")
+    if crs is None:
+        return None
+    return CRS.from_json_dict(crs) if isinstance(crs, dict) else CRS.from_user_input(crs)
+
+
+def densify_geoarrow(
+    densify_config: DenseConfig,
+    geometries: pa.Array | pa.ChunkedArray,
+    geometry_type: str,
+    stats: DenseStats | None = None,
+) -> pa.Array | pa.ChunkedArray:
+    """Densify (and optionally reproject) GeoArrow array of geometry_type (GeoArrow extension name), returns new array of the same type.
+
+    The coordinates are read from the Arrow buffers into flat coordinate arrays per dimension, without creating
+    position objects. Geodesic densification transforms all line segments of a chunk in one transformer call, computes
+    their geodesic distance and azimuth in one Geod.inv call and writes the intermediate points into preallocated
+    buffers, with the same result as densify_geojson_object. Densification in projection and adaptive densification
+    (tolerance) fall back to densifying the positions of each linestring. Geometries that fail to reproject are set
+    to null.
+    """
+    list_levels = _get_list_levels(geometry_type)
+    chunks = geometries.chunks if isinstance(geometries, pa.ChunkedArray) else [geometries]
+    storages = [chunk.storage if isinstance(chunk, pa.ExtensionArray) else chunk for chunk in chunks]
+    flats = [_read_flat(storage, list_levels) for storage in storages]
+    min_scale_factor = get_min_scale_factor_bbox(densify_config, _get_flats_bbox(flats))
+    result = []
+    for chunk, storage, flat in zip(chunks, storages, flats, strict=True):
+        storage_t = _write_flat(storage.type, list_levels, _densify_flat(densify_config, flat, min_scale_factor, stats))
+        result.append(pa.ExtensionArray.from_storage(chunk.type, storage_t) if chunk is not storage else storage_t)
+    if isinstance(geometries, pa.ChunkedArray):
+        return pa.chunked_array(result, type=geometries.type)
+    return result[0]
+
+
+def check_density_geoarrow(
+    densify_config: DenseConfig,
+    geometries: pa.Array | pa.ChunkedArray,
+    geometry_type: str,
+    stats: DenseStats | None = None,
+) -> Iterator[ReportSegment]:
+    """Check density of GeoArrow array of geometry_type (GeoArrow extension name), yields line segments exceeding max_segment_length in order of geometries.
+
+    The feature index of a line segment is the index of its geometry in geometries, see check_density_report_segments.
+    As with densify_geoarrow, the line segments of a chunk are checked in bulk on flat coordinate arrays, only the
+    failed line segments are converted to positions.
+    """
+    list_levels = _get_list_levels(geometry_type)
+    chunks = geometries.chunks if isinstance(geometries, pa.ChunkedArray) else [geometries]
+    flats = [
+        _read_flat(chunk.storage if isinstance(chunk, pa.ExtensionArray) else chunk, list_levels) for chunk in chunks
+    ]
+    min_scale_factor = get_min_scale_factor_bbox(densify_config, _get_flats_bbox(flats))
+    first_row = 0
+    for flat in flats:
+        yield from _check_density_flat(densify_config, flat, min_scale_factor, first_row, stats)
+        first_row += len(flat.nulls)
+
+
+def densify_geoarrow_table(
+    densify_config: DenseConfig, table: pa.Table, column: str | None = None, stats: DenseStats | None = None
+) -> pa.Table:
+    """Densify geometry column of table (see get_geometry_column), other columns are kept as is.
+
+    The geometry column is written with its storage type and the GeoArrow extension name and metadata in the field
+    metadata, when dst_crs is set the crs in the extension metadata is set to dst_crs.
+    """
+    index, geometry_type = get_geometry_column(table.schema, column)
+    field = table.schema.field(index)
+    geometries = table.column(index)
+    if isinstance(field.type, pa.ExtensionType):
+        geometries = pa.chunked_array([chunk.storage for chunk in geometries.chunks], type=field.type.storage_type)
+    geometries_t = densify_geoarrow(densify_config, geometries, geometry_type, stats)
+    extension_metadata = _get_extension_metadata(field)
+    if densify_config.dst_crs is not None:
+        extension_metadata["crs"] = densify_config.dst_crs.to_json_dict()
+        extension_metadata["crs_type"] = "projjson"
+    metadata = {
+        **(field.metadata or {}),
+        EXTENSION_NAME_KEY: geometry_type.encode("utf-8"),
+        EXTENSION_METADATA_KEY: json.dumps(extension_metadata).encode("utf-8"),
+    }
+    return table.set_column(index, pa.field(field.name, geometries_t.type, field.nullable, metadata), geometries_t)
+
+
+def densify_geoarrow_file(  # noqa: PLR0913
+    input_file_path: str,
+    output_file_path: str,
+    overwrite: bool = False,
+    max_segment_length: float | None = None,
+    densify_in_projection: bool = False,
+    src_crs: str | None = None,
+    tolerance: float | None = None,
+    dst_crs: str | None = None,
+    column: str | None = None,
+) -> None:
+    """Densify geometry column of Arrow IPC file, see densify_file for the arguments and get_geometry_column for column.
+
+    The src crs is read from the GeoArrow extension metadata of the geometry column, when not set OGC:CRS84 (or
+    OGC:CRS84h for 3D coordinates) is assumed. Columns other than the geometry column are written as is.
+    """
+    validate_dependent_file_args(input_file_path, output_file_path, overwrite)
+    table = read_geoarrow_ipc(input_file_path)
+    index, _ = get_geometry_column(table.schema, column)
+    config = DenseConfig(
+        _get_src_crs(table.schema.field(index), src_crs),
+        max_segment_length,
+        densify_in_projection,
+        tolerance,
+        CRS.from_authority(*dst_crs.split(":")) if dst_crs is not None else None,
+    )
+    stats = DenseStats()
+    table_t = densify_geoarrow_table(config, table, table.schema.names[index], stats)
+    logger.info(stats.prefilter_message())
+    write_geoarrow_ipc(table_t, output_file_path)
+
+
+def check_density_geoarrow_file(  # noqa: PLR0913
+    input_file_path: str,
+    max_segment_length: float,
+    density_check_report_path: str | None = None,
+    src_crs: str | None = None,
+    in_projection: bool = False,
+    overwrite: bool = False,
+    report_format: ReportFormat = "geojson",
+    report_geometry: bool = False,
+    column: str | None = None,
+) -> tuple[bool, str | None, int]:
+    """Check density of geometry column of Arrow IPC file, returns check status, report path and nr of failed line segments, see check_density_file."""
+    report_file = ReportFile(density_check_report_path, report_format)
+    validate_dependent_file_args(input_file_path, density_check_report_path, overwrite)
+    table = read_geoarrow_ipc(input_file_path)
+    index, geometry_type = get_geometry_column(table.schema, column)
+    config = DenseConfig(_get_src_crs(table.schema.field(index), src_crs), max_segment_length, in_projection)
+    stats = DenseStats()
+    failed_segment_count = write_density_report(
+        check_density_geoarrow(config, table.column(index), geometry_type, stats),
+        report_file,
+        report_format,
+        report_geometry,
+        ":".join(auth) if (auth := config.src_crs.to_authority()) is not None else None,
+    )
+    logger.info(stats.prefilter_message())
+    return failed_segment_count == 0, report_file.path, failed_segment_count
+
+
+def _get_extension_name(field: pa.Field) -> str | None:
+    if isinstance(field.type, pa.ExtensionType):
+        return cast(str, field.type.extension_name)
+    name = (field.metadata or {}).get(EXTENSION_NAME_KEY)
+    return cast(str, name.decode("utf-8")) if name is not None else None
+
+
+def _get_extension_metadata(field: pa.Field) -> dict:
+    if isinstance(field.type, pa.ExtensionType):
+        metadata = field.type.__arrow_ext_serialize__()
+    else:
+        metadata = (field.metadata or {}).get(EXTENSION_METADATA_KEY)
+    return cast(dict, json.loads(metadata)) if metadata else {}
+
+
+def _get_src_crs(field: pa.Field, src_crs: str | None) -> CRS:
+    if src_crs is not None:
+        return CRS.from_authority(*src_crs.split(":"))
+    crs = get_geoarrow_crs(field)
+    if crs is not None:
+        return crs
+    default_crs = DEFAULT_CRS_3D if _get_coordinate_type(field.type).num_fields == 3 else DEFAULT_CRS_2D  # noqa: PLR2004
+    logger.warning("unable to determine source CRS for geometry column %s, assuming: %s", field.name, default_crs)
+    return CRS.from_user_input(default_crs)
+
+
+def _get_coordinate_type(geometry_type: pa.DataType) -> pa.DataType:
+    coordinate_type = geometry_type.storage_type if isinstance(geometry_type, pa.ExtensionType) else geometry_type
+    while pa.types.is_list(coordinate_type) or pa.types.is_large_list(coordinate_type):
+        coordinate_type = coordinate_type.value_type
+    return coordinate_type
+
+
+def _get_list_levels(geometry_type: str) -> int:
+    if geometry_type not in GEOARROW_LIST_LEVELS:
+        raise GeodenseError(
+            f"unsupported GeoArrow geometry type: {geometry_type}, expected one of: {', '.join(GEOARROW_LIST_LEVELS)}"
+        )
+    return GEOARROW_LIST_LEVELS[geometry_type]
+
+
+def _read_flat(storage: pa.Array, list_levels: int) -> _FlatGeometries:
+    offsets: list[list[int]] = []
+    values = storage
+    for _ in range(list_levels):
+        level = values.offsets.to_pylist()
+        offsets.append([offset - level[0] for offset in level])
+        values = values.values.slice(level[0], level[-1] - level[0])
+    if pa.types.is_struct(values.type):  # separated coordinates
+        columns = [_to_float_array(child) for child in values.flatten()]
+    else:  # interleaved coordinates
+        interleaved = _to_float_array(values.flatten())
+        columns = [interleaved[i :: values.type.list_size] for i in range(values.type.list_size)]
+    return _FlatGeometries(
+        offsets,
+        columns[0],
+        columns[1],
+        columns[2] if len(columns) > 2 else None,  # noqa: PLR2004
+        storage.is_null().to_pylist(),
+    )
+
+
+def _to_float_array(values: pa.Array) -> array:
+    """Copy of float64 values in one buffer copy."""
+    if not pa.types.is_float64(values.type):
+        values = values.cast(pa.float64())
+    buffer = memoryview(values.buffers()[1]).cast("d")
+    return array("d", buffer[values.offset : values.offset + len(values)].tobytes())
+
+
+def _from_float_array(values: array) -> pa.Array:
+    """float64 Arrow array referencing the buffer of values, without copying."""
+    return pa.Array.from_buffers(pa.float64(), len(values), [None, pa.py_buffer(values)])
+
+
+def _write_flat(storage_type: pa.DataType, list_levels: int, flat: _FlatGeometries) -> pa.Array:
+    list_types = [storage_type]
+    for _ in range(list_levels):
+        list_types.append(list_types[-1].value_type)
+    coordinate_type = list_types.pop()
+    columns = [flat.xs, flat.ys] if flat.zs is None else [flat.xs, flat.ys, flat.zs]
+    values: pa.Array
+    if pa.types.is_struct(coordinate_type):
+        values = pa.StructArray.from_arrays(
+            [_from_float_array(column) for column in columns], fields=list(coordinate_type)
+        )
+    else:
+        interleaved = array("d", bytes(ITEM_SIZE * len(flat.xs) * len(columns)))
+        for i, column in enumerate(columns):
+            interleaved[i :: len(columns)] = column
+        values = pa.FixedSizeListArray.from_arrays(_from_float_array(interleaved), type=coordinate_type)
+    for level in reversed(range(list_levels)):
+        list_type = list_types[level]
+        mask = pa.array(flat.nulls) if level == 0 and any(flat.nulls) else None
+        if pa.types.is_large_list(list_type):
+            values = pa.LargeListArray.from_arrays(
+                pa.array(flat.offsets[level], pa.int64()), values, type=list_type, mask=mask
+            )
+        else:
+            values = pa.ListArray.from_arrays(
+                pa.array(flat.offsets[level], pa.int32()), values, type=list_type, mask=mask
+            )
+    return values
+
+
+def _get_linestring_range(flat: _FlatGeometries, row: int) -> tuple[int, int]:
+    """First and last (exclusive) index of linestrings of geometry row."""
+    first, last = row, row + 1
+    for level in flat.offsets[:-1]:
+        first, last = level[first], level[last]
+    return first, last
+
+
+def _get_coordinates_bbox(flat: _FlatGeometries, start: int, end: int) -> tuple[float, float, float, float] | None:
+    if start == end:
+        return None
+    xs, ys = flat.xs[start:end], flat.ys[start:end]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _get_flats_bbox(flats: list[_FlatGeometries]) -> tuple[float, float, float, float] | None:
+    """Bounding box of coordinates of all geometries that are not null, None when there are no coordinates."""
+    bboxes = []
+    for flat in flats:
+        coordinate_offsets = flat.offsets[-1]
+        for row in range(len(flat.nulls)) if any(flat.nulls) else [None]:
+            if row is not None and flat.nulls[row]:
+                continue
+            first, last = _get_linestring_range(flat, row) if row is not None else (0, len(coordinate_offsets) - 1)
+            bbox = _get_coordinates_bbox(flat, coordinate_offsets[first], coordinate_offsets[last])
+            if bbox is not None:
+                bboxes.append(bbox)
+    if len(bboxes) == 0:
+        return None
+    return (min(b[0] for b in bboxes), min(b[1] for b in bboxes), max(b[2] for b in bboxes), max(b[3] for b in bboxes))
+
+
+def _get_skipped_linestrings(
+    densify_config: DenseConfig, flat: _FlatGeometries, min_scale_factor: float | None, stats: DenseStats | None
+) -> list[bool]:
+    """Whether each linestring can be skipped by the bbox prefilters (see _skip_by_bbox_prefilter), counted in stats as in densify_geometry."""
+    coordinate_offsets = flat.offsets[-1]
+    skipped: list[bool] = []
+    for row, null in enumerate(flat.nulls):
+        if stats is not None:
+            stats.increment("features")
+        first, last = _get_linestring_range(flat, row)
+        if null:
+            skipped.extend([True] * (last - first))
+            continue
+        bbox = _get_coordinates_bbox(flat, coordinate_offsets[first], coordinate_offsets[last])
+        skip_geometry = bbox is not None and not bbox_may_exceed_max_segment_length(
+            densify_config, bbox, min_scale_factor
+        )
+        if stats is not None:
+            stats.increment("geometries")
+            stats.increment("skipped_geometries", skip_geometry)
+        for linestring in range(first, last):
+            start, end = coordinate_offsets[linestring], coordinate_offsets[linestring + 1]
+            if stats is not None:
+                stats.increment("vertices", end - start)
+            if skip_geometry:
+                skipped.append(True)
+                continue
+            bbox = _get_coordinates_bbox(flat, start, end)
+            skip = bbox is not None and not bbox_may_exceed_max_segment_length(densify_config, bbox, min_scale_factor)
+            if stats is not None:
+                stats.increment("linestrings")
+                stats.increment("skipped_linestrings", skip)
+            skipped.append(skip or end - start < 2)  # noqa: PLR2004
+    return skipped
+
+
+def _densify_flat(
+    densify_config: DenseConfig, flat: _FlatGeometries, min_scale_factor: float | None, stats: DenseStats | None
+) -> _FlatGeometries:
+    skipped = _get_skipped_linestrings(densify_config, flat, min_scale_factor, stats)
+    if densify_config.in_projection or densify_config.tolerance is not None:
+        flat_t = _densify_flat_positions(densify_config, flat, skipped)
+    else:
+        flat_t = _densify_flat_geodesic(densify_config, flat, skipped)
+    if densify_config.dst_crs is not None:
+        flat_t = _reproject_flat(densify_config, flat_t)
+    return flat_t
+
+
+def _densify_flat_geodesic(densify_config: DenseConfig, flat: _FlatGeometries, skipped: list[bool]) -> _FlatGeometries:
+    """Geodesic densify linestrings not skipped, with one transformer call and one Geod.inv call for all line segments and one Geod.fwd_intermediate call per line segment exceeding max_segment_length."""
+    coordinate_offsets = flat.offsets[-1]
+    rounded = _round_flat(densify_config, flat, skipped)
+    # a of line segment i > 0 is the rounded b of line segment i - 1, as in densify_vertex_range
+    a_xs, a_ys, b_xs, b_ys = array("d"), array("d"), array("d"), array("d")
+    for linestring in (i for i, skip in enumerate(skipped) if not skip):
+        start, end = coordinate_offsets[linestring], coordinate_offsets[linestring + 1]
+        a_xs.append(flat.xs[start])
+        a_xs.extend(rounded.xs[start + 1 : end - 1])
+        a_ys.append(flat.ys[start])
+        a_ys.extend(rounded.ys[start + 1 : end - 1])
+        b_xs.extend(flat.xs[start + 1 : end])
+        b_ys.extend(flat.ys[start + 1 : end])
+    segments = _get_geodesic_segments(densify_config, a_xs, a_ys, b_xs, b_ys)
+    lons, lats = _interpolate_geodesic_segments(densify_config, a_xs, a_ys, segments)
+
+    flat_t = _FlatGeometries([*flat.offsets[:-1], [0]], array("d"), array("d"), _empty_like(flat.zs), flat.nulls)
+    segment = 0
+    point = 0
+    for linestring, skip in enumerate(skipped):
+        start, end = coordinate_offsets[linestring], coordinate_offsets[linestring + 1]
+        if skip:
+            _extend_flat(flat_t, flat, start, end)
+            flat_t.offsets[-1].append(len(flat_t.xs))
+            continue
+        for i in range(start, end - 1):
+            _extend_flat(flat_t, rounded, i, i + 1)
+            _, nr_points, del_s, geod_dist = segments[segment]
+            segment += 1
+            flat_t.xs.extend(lons[point : point + nr_points])
+            flat_t.ys.extend(lats[point : point + nr_points])
+            point += nr_points
+            if flat_t.zs is not None and flat.zs is not None and rounded.zs is not None and nr_points > 0:
+                # interpolate height, a of first line segment is not rounded, as in _geodesic_positions
+                height_a = flat.zs[i] if i == start else rounded.zs[i]
+                delta_height_per_point = (flat.zs[i + 1] - height_a) * (del_s / geod_dist)
+                flat_t.zs.extend(
+                    round(height_a + ((k + 1) * delta_height_per_point), DEFAULT_PRECISION_METERS)
+                    for k in range(nr_points)
+                )
+        _extend_flat(flat_t, rounded, end - 1, end)
+        flat_t.offsets[-1].append(len(flat_t.xs))
+    return flat_t
+
+
+def _round_flat(densify_config: DenseConfig, flat: _FlatGeometries, skipped: list[bool]) -> _FlatGeometries:
+    """Copy of flat with rounded coordinates of linestrings not skipped, see _round_coordinates."""
+    prec = densify_config.kernel.precision
+    coordinate_offsets = flat.offsets[-1]
+    rounded = _FlatGeometries(flat.offsets, array("d", flat.xs), array("d", flat.ys), _copy(flat.zs), flat.nulls)
+    for linestring in (i for i, skip in enumerate(skipped) if not skip):
+        start, end = coordinate_offsets[linestring], coordinate_offsets[linestring + 1]
+        rounded.xs[start:end] = array("d", [round(x, prec) for x in flat.xs[start:end]])
+        rounded.ys[start:end] = array("d", [round(y, prec) for y in flat.ys[start:end]])
+        if rounded.zs is not None and flat.zs is not None:
+            rounded.zs[start:end] = array("d", [round(z, DEFAULT_PRECISION_METERS) for z in flat.zs[start:end]])
+    return rounded
+
+
+def _extend_flat(target: _FlatGeometries, source: _FlatGeometries, start: int, end: int) -> None:
+    """Append coordinates start up to end of source to coordinates of target."""
+    target.xs.extend(source.xs[start:end])
+    target.ys.extend(source.ys[start:end])
+    if target.zs is not None and source.zs is not None:
+        target.zs.extend(source.zs[start:end])
+
+
+def _empty_like(values: array | None) -> array | None:
+    return array("d") if values is not None else None
+
+
+def _copy(values: array | None) -> array | None:
+    return array("d", values) if values is not None else None
+
+
+def _get_geodesic_segments(
+    densify_config: DenseConfig, a_xs: array, a_ys: array, b_xs: array, b_ys: array
+) -> list[tuple[float, int, float, float]]:
+    """Azimuth, nr of intermediate points, distance between intermediate points and geodesic distance per line segment a-b, converts a and b to the base geographic crs in place."""
+    if len(a_xs) == 0:
+        return []
+    kernel = densify_config.kernel
+    max_segment_length = kernel.max_segment_length
+    if kernel.transformer is not None:  # src_crs is projected
+        kernel.transformer.transform(a_xs, a_ys, inplace=True)
+        kernel.transformer.transform(b_xs, b_ys, inplace=True)
+    az12s, _, geod_dists = kernel.geod.inv(a_xs, a_ys, b_xs, b_ys, return_back_azimuth=True)
+    segments: list[tuple[float, int, float, float]] = []
+    for az12, geod_dist in zip(az12s, geod_dists, strict=True):
+        if math.isnan(geod_dist):
+            raise GeodenseError(
+                f"unable to calculate geodesic distance, output calculation geodesic distance: {geod_dist}, expected: floating-point number"
+            )
+        if geod_dist <= max_segment_length:
+            segments.append((az12, 0, 0.0, geod_dist))
+            continue
+        nr_points, del_s = get_intermediate_nr_points_and_segment_length(geod_dist, max_segment_length)
+        segments.append((az12, nr_points, del_s, geod_dist))
+    return segments
+
+
+def _interpolate_geodesic_segments(
+    densify_config: DenseConfig, a_xs: array, a_ys: array, segments: list[tuple[float, int, float, float]]
+) -> tuple[list[float], list[float]]:
+    """Rounded intermediate points of all line segments, interpolated into one preallocated pair of buffers, a_xs and a_ys are the start points in the base geographic crs."""
+    nr_points_total = sum(segment[1] for segment in segments)
+    if nr_points_total == 0:
+        return [], []
+    kernel = densify_config.kernel
+    lons = array("d", bytes(ITEM_SIZE * nr_points_total))
+    lats = array("d", bytes(ITEM_SIZE * nr_points_total))
+    lons_view, lats_view = memoryview(lons), memoryview(lats)
+    offset = 0
+    for i, (az12, nr_points, del_s, _) in enumerate(segments):
+        if nr_points == 0:
+            continue
+        kernel.geod.fwd_intermediate(
+            a_xs[i],
+            a_ys[i],
+            az12,
+            npts=nr_points,
+            del_s=del_s,
+            return_back_azimuth=True,
+            out_lons=lons_view[offset : offset + nr_points],
+            out_lats=lats_view[offset : offset + nr_points],
+        )
+        offset += nr_points
+    lons_view.release()
+    lats_view.release()
+    if kernel.back_transformer is not None:  # src_crs is projected
+        kernel.back_transformer.transform(lons, lats, inplace=True)
+    prec = kernel.precision
+    return [round(lon, prec) for lon in lons], [round(lat, prec) for lat in lats]
+
+
+def _densify_flat_positions(densify_config: DenseConfig, flat: _FlatGeometries, skipped: list[bool]) -> _FlatGeometries:
+    """Densify linestrings not skipped in projection or adaptively, by densifying their positions with densify_vertex_range."""
+    coordinate_offsets = flat.offsets[-1]
+    flat_t = _FlatGeometries([*flat.offsets[:-1], [0]], array("d"), array("d"), _empty_like(flat.zs), flat.nulls)
+    for linestring, skip in enumerate(skipped):
+        start, end = coordinate_offsets[linestring], coordinate_offsets[linestring + 1]
+        if skip:
+            _extend_flat(flat_t, flat, start, end)
+        else:
+            positions = [_get_position(flat, i) for i in range(start, end)]
+            for p in densify_vertex_range(densify_config, positions, 0, len(positions) - 1):
+                flat_t.xs.append(p.longitude)
+                flat_t.ys.append(p.latitude)
+                if flat_t.zs is not None:
+                    flat_t.zs.append(cast(Position3D, p).altitude)
+        flat_t.offsets[-1].append(len(flat_t.xs))
+    return flat_t
+
+
+def _reproject_flat(densify_config: DenseConfig, flat: _FlatGeometries) -> _FlatGeometries:
+    """Reproject coordinates in place to dst_crs in one transformer call, geometries with infinite coordinates after reprojection are set to null, as in _drop_failed_geometries."""
+    transformer = densify_config.dst_transformer
+    if transformer is None:
+        raise GeodenseError("dst_transformer cannot be None when reprojecting to dst_crs")
+    if flat.zs is not None:
+        transformer.transform(flat.xs, flat.ys, flat.zs, inplace=True)
+    else:
+        transformer.transform(flat.xs, flat.ys, inplace=True)
+    coordinate_offsets = flat.offsets[-1]
+    nulls = list(flat.nulls)
+    for row, null in enumerate(flat.nulls):
+        first, last = _get_linestring_range(flat, row)
+        start, end = coordinate_offsets[first], coordinate_offsets[last]
+        # sum is not finite when any coordinate is infinite or NaN
+        if not null and not (math.isfinite(sum(flat.xs[start:end])) and math.isfinite(sum(flat.ys[start:end]))):
+            nulls[row] = True
+    prec = densify_config.get_dst_coord_precision()
+    return _FlatGeometries(
+        flat.offsets,
+        array("d", [round(x, prec) for x in flat.xs]),
+        array("d", [round(y, prec) for y in flat.ys]),
+        array("d", [round(z, DEFAULT_PRECISION_METERS) for z in flat.zs]) if flat.zs is not None else None,
+        nulls,
+    )
+
+
+def _get_position(flat: _FlatGeometries, i: int) -> Position:
+    if flat.zs is not None:
+        return Position3D(longitude=flat.xs[i], latitude=flat.ys[i], altitude=flat.zs[i])
+    return Position2D(longitude=flat.xs[i], latitude=flat.ys[i])
+
+
+def _check_density_flat(
+    densify_config: DenseConfig,
+    flat: _FlatGeometries,
+    min_scale_factor: float | None,
+    first_row: int,
+    stats: DenseStats | None,
+) -> Iterator[ReportSegment]:
+    """Check density of line segments of linestrings not skipped, with one transformer call and one Geod.inv call for all line segments that may exceed max_segment_length, see _check_density_segments."""
+    skipped = _get_skipped_linestrings(densify_config, flat, min_scale_factor, stats)
+    coordinate_offsets = flat.offsets[-1]
+    # feature index, part index, segment index and index of vertex a per line segment to check
+    segments: list[tuple[int, int, int, int]] = []
+    lengths: list[float] = []
+    for row in range(len(flat.nulls)):
+        first, last = _get_linestring_range(flat, row)
+        for linestring in range(first, last):
+            if skipped[linestring]:
+                continue
+            for i in range(coordinate_offsets[linestring], coordinate_offsets[linestring + 1] - 1):
+                distance = cartesian_distance((flat.xs[i], flat.ys[i]), (flat.xs[i + 1], flat.ys[i + 1]))
+                if not densify_config.in_projection and (
+                    min_scale_factor is not None and distance / min_scale_factor <= densify_config.max_segment_length
+                ):
+                    continue  # segment cannot exceed max_segment_length, skip conversion and geodesic calculation
+                segments.append((first_row + row, linestring - first, i - coordinate_offsets[linestring], i))
+                lengths.append(distance)
+
+    if not densify_config.in_projection and len(segments) > 0:
+        a_xs = array("d", [flat.xs[i] for _, _, _, i in segments])
+        a_ys = array("d", [flat.ys[i] for _, _, _, i in segments])
+        b_xs = array("d", [flat.xs[i + 1] for _, _, _, i in segments])
+        b_ys = array("d", [flat.ys[i + 1] for _, _, _, i in segments])
+        lengths = [geod_dist for _, _, _, geod_dist in _get_geodesic_segments(densify_config, a_xs, a_ys, b_xs, b_ys)]
+    for (feature_index, part_index, segment_index, i), length in zip(segments, lengths, strict=True):
+        if length > (densify_config.max_segment_length + 0.001):
+            yield (
+                feature_index,
+                part_index,
+                segment_index,
+                length,
+                (_get_position(flat, i), _get_position(flat, i + 1)),
+            )
@@ -1,13 +1,25 @@
+import csv
 import json
 import logging
 import math
 import os
-import sys
+import random
+import re
+import statistics
 import tempfile
-from collections.abc import Callable, Iterable, Sequence
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, ExitStack, nullcontext
+from copy import deepcopy
 from enum import Enum
 from functools import partial
-from typing import Literal, TextIO, cast
+from itertools import accumulate, chain, count, pairwise
+from statistics import NormalDist
+from typing import Any, Literal, TextIO, cast
 
 from geojson_pydantic import (
     Feature,
@@ -22,18 +34,37 @@ from geojson_pydantic import (
 from geojson_pydantic.geometries import Geometry
 from geojson_pydantic.types import LineStringCoords, Position, Position2D, Position3D
 from pydantic import BaseModel
-from pyproj import CRS
+from pyproj import CRS, Geod, Proj
+from pyproj.exceptions import CRSError, ProjError
 from shapely import LineString as ShpLineString
 from shapely import Point as ShpPoint
 
+from geodense.checkpoint import CHECKPOINT_INTERVAL, densify_with_checkpoints
+from geodense.filters import FeatureFilter
 from geodense.geojson import CrsFeatureCollection
-from geodense.models import DEFAULT_PRECISION_METERS, DenseConfig, GeodenseError
+from geodense.models import (
+    DEFAULT_PRECISION_METERS,
+    MAX_ADAPTIVE_DEPTH,
+    DenseConfig,
+    DenseEstimate,
+    DenseKernel,
+    DenseStats,
+    DensitySample,
+    GeodenseError,
+    RawGeojson,
+    RawMember,
+)
+from geodense.progress import MemoryStats, ProgressReporter
+from geodense.streams import get_compression, open_input, open_output, strip_compression_ext
 from geodense.types import (
+    GeodesicInverse,
     GeojsonCoordinates,
     GeojsonGeomNoGeomCollection,
     GeojsonObject,
     Nested,
+    ReportFormat,
     ReportLineString,
+    ReportSegment,
     T,
 )
 
@@ -41,9 +72,27 @@ TWO_DIMENSIONAL = 2
 THREE_DIMENSIONAL = 3
 DEFAULT_CRS_2D = "OGC:CRS84"
 DEFAULT_CRS_3D = "OGC:CRS84h"
+SCALE_FACTOR_GRID_SIZE = 11  # nr of samples per axis to estimate the min scale factor of projection
+SCALE_FACTOR_SAFETY_FACTOR = 0.99  # applied to the estimated min scale factor, the grid estimate is not a strict bound
+LINESTRING_CHUNK_SIZE = 50_000  # max nr of line segments per task when processing a long linestring with threads
+WORK_UNITS_PER_THREAD = 4  # target nr of work units per worker thread, linestrings costing more are split
+MIN_WORK_UNIT_COST = 1_000  # estimated cost below which linestrings are never split
+SAMPLE_CONFIDENCE = (
+    0.95  # default confidence level of the interval of a failure rate estimated by sample_density_geojson_object
+)
+ESTIMATE_SAMPLE_VERTICES = 10_000  # nr of output vertices densified to measure throughput for the runtime estimate
 SUPPORTED_FILE_FORMATS = {
     "GeoJSON": [".geojson", ".json"],
 }
+REPORT_FILE_FORMATS: dict[ReportFormat, list[str]] = {
+    "geojson": [".json", ".geojson"],
+    "ndjson": [".ndjson", ".geojsonl", ".jsonl"],
+    "csv": [".csv"],
+}
+REPORT_COLUMNS = ["feature_index", "part_index", "segment_index", "segment_length"]
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
 
 logger = logging.getLogger("geodense")
 
@@ -52,59 +101,974 @@ class InfValCoordinateError(Exception):
     pass
 
 
-def densify_geojson_object(densify_config: DenseConfig, geojson_obj: GeojsonObject) -> GeojsonObject:
+def densify_geojson_object(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    stats: DenseStats | None = None,
+    threads: int | None = None,
+    processes: int | None = None,
+    feature_filter: FeatureFilter | None = None,
+) -> GeojsonObject:
+    """Densify geometries in geojson_obj, returns densified copy of geojson_obj.
+
+    When threads > 1 the linestrings (and rings) of all geometries are densified concurrently in a thread pool, each
+    worker thread uses its own pyproj objects (see DenseConfig). The work is scheduled by estimated cost (see
+    _get_max_work_unit_cost), linestrings costing more than a fair share of a worker thread, or with more than
+    LINESTRING_CHUNK_SIZE line segments, are split in vertex ranges that are densified concurrently and stitched
+    afterwards. When processes > 1 the linestrings are densified in a pool of worker processes instead, exchanging
+    coordinates through shared memory (see densify_geometries_in_processes). Worker processes are started with the
+    spawn start method, which imports the main module of the caller in each worker, so a script calling this function
+    with processes > 1 must guard its entry point with if __name__ == "__main__".
+
+    With feature_filter only the selected features are densified, the other features are passed through (reprojected
+    when dst_crs is set), or dropped with feature_filter.drop_unselected.
+    """
     validate_geom_type(geojson_obj, "densify")
-    _densify_geometry = partial(densify_geometry, densify_config)
-    return traverse_geojson_geometries(geojson_obj, _densify_geometry)
+    try:
+        if feature_filter is not None:
+            return _densify_selected_features(densify_config, geojson_obj, feature_filter, stats, threads, processes)
+        return _densify_geojson_object(densify_config, geojson_obj, stats, threads, processes)
+    except InfValCoordinateError as e:
+        raise geometry_inf_val_error(e) from e
+
+
+def geometry_inf_val_error(e: InfValCoordinateError) -> GeodenseError:
+    """InfValCoordinateError is only raised for a geometry that is not in a feature, since the geometry of a feature is set to null instead."""
+    return GeodenseError(
+        f"{e}, unlike the geometry of a Feature a GeoJSON geometry cannot be written as null, check the source and destination CRS"
+    )
+
+
+def _densify_geojson_object(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    stats: DenseStats | None,
+    threads: int | None,
+    processes: int | None,
+    executor: Executor | None = None,
+) -> GeojsonObject:
+    """Densify geometries in geojson_obj without validating geometry types, see densify_geojson_object. With executor its worker threads or processes are used, instead of starting a pool per call (see _get_executor)."""
+    if threads is not None and threads > 1 and processes is not None and processes > 1:
+        raise GeodenseError("threads and processes cannot be combined")
+    min_scale_factor = get_min_scale_factor_geojson(densify_config, geojson_obj)
+    if (threads is None or threads <= 1) and (processes is None or processes <= 1):
+        _densify_geometry = partial(densify_geometry, densify_config, min_scale_factor=min_scale_factor, stats=stats)
+        return traverse_geojson_geometries(geojson_obj, _densify_geometry, get_feature_counter(stats))
+
+    geometries: list[GeojsonGeomNoGeomCollection] = []
+    result = traverse_geojson_geometries(
+        geojson_obj, lambda g: geometries.append(cast(GeojsonGeomNoGeomCollection, g)), get_feature_counter(stats)
+    )
+    if processes is not None and processes > 1:
+        # imported here, since geodense.multiprocess builds on the functions of this module
+        from geodense.multiprocess import densify_geometries_in_processes
+
+        failed = densify_geometries_in_processes(
+            densify_config, geometries, min_scale_factor, processes, stats, cast(ProcessPoolExecutor | None, executor)
+        )
+        _drop_failed_geometries(result, {id(geometries[i]) for i in failed})
+        return result
+    threads = cast(int, threads)
+    linestrings = chain.from_iterable(_get_linestrings(g.coordinates) for g in geometries)
+    max_unit_cost = _get_max_work_unit_cost(densify_config, linestrings, threads, densify=True)
+
+    units: list[tuple[float, Callable[[], None]]] = []
+    pending: list[tuple[GeojsonGeomNoGeomCollection, int, int, list[Callable[[], None]]]] = []
+    for geometry in geometries:
+        stitch_tasks: list[Callable[[], None]] = []
+        tasks = _densify_geometry_tasks(densify_config, geometry, min_scale_factor, stats, max_unit_cost, stitch_tasks)
+        pending.append((geometry, len(units), len(units) + len(tasks), stitch_tasks))
+        units.extend(tasks)
+
+    with ExitStack() as stack:
+        thread_executor = executor or stack.enter_context(
+            ThreadPoolExecutor(max_workers=threads, thread_name_prefix="geodense")
+        )
+        futures = _submit_longest_first(thread_executor, threads, units, stats)
+        failed_geometries: set[int] = set()
+        for geometry, first, last, stitch_tasks in pending:
+            if _has_inf_val_error(futures[first:last]):
+                failed_geometries.add(id(geometry))
+                continue
+            for stitch_task in stitch_tasks:
+                stitch_task()
+    _drop_failed_geometries(result, failed_geometries)
+    return result
+
+
+def _densify_selected_features(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    feature_filter: FeatureFilter,
+    stats: DenseStats | None,
+    threads: int | None,
+    processes: int | None,
+    executor: Executor | None = None,
+) -> GeojsonObject:
+    if not isinstance(geojson_obj, CrsFeatureCollection | Feature):
+        raise GeodenseError("feature filter requires GeoJSON FeatureCollection or Feature input")
+    features = cast(list[Feature], _get_features(geojson_obj))
+    selected = _get_selected_features(feature_filter, features, stats)
+    subset = [feature for feature, is_selected in zip(features, selected, strict=True) if is_selected]
+    densified: Iterator[Feature] = iter([])
+    if len(subset) > 0:
+        subset_obj: GeojsonObject = (
+            geojson_obj.model_copy(update={"features": subset})
+            if isinstance(geojson_obj, CrsFeatureCollection)
+            else geojson_obj
+        )
+        densified = iter(
+            cast(
+                list[Feature],
+                _get_features(_densify_geojson_object(densify_config, subset_obj, stats, threads, processes, executor)),
+            )
+        )
+    _reproject_geometry = partial(reproject_geometry, densify_config) if densify_config.dst_crs is not None else None
+    feature_counter = get_feature_counter(stats)
+    features_t: list[Feature] = []
+    for feature, is_selected in zip(features, selected, strict=True):
+        if is_selected:
+            features_t.append(next(densified))
+        elif not feature_filter.drop_unselected or isinstance(geojson_obj, Feature):
+            features_t.append(cast(Feature, traverse_geojson_geometries(feature, _reproject_geometry, feature_counter)))
+        elif stats is not None:  # dropped feature
+            stats.increment("features")
+    if isinstance(geojson_obj, Feature):
+        return features_t[0]
+    return geojson_obj.model_copy(update={"features": features_t})
+
+
+def _get_selected_features(
+    feature_filter: FeatureFilter, features: Sequence[Feature | GeojsonObject], stats: DenseStats | None
+) -> list[bool]:
+    """Returns per feature whether it is selected by feature_filter, a geometry (without properties) is matched on its bbox only."""
+    selected = [
+        feature_filter.matches(
+            feature.properties if isinstance(feature, Feature) else None,
+            _get_bbox(feature),
+        )
+        for feature in features
+    ]
+    if stats is not None:
+        stats.increment("unselected_features", selected.count(False))
+    return selected
+
+
+def densify_features(
+    densify_config: DenseConfig,
+    features: Iterable[Feature | dict[str, Any]],
+    stats: DenseStats | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> Iterator[Feature]:
+    """Densify features one at a time, yields densified copy of each feature in order of features.
+
+    Features can be Feature models or GeoJSON Feature dicts, and are read lazily from features. No references to
+    processed input features are kept, so memory use does not grow with the nr of features. The bbox prefilter of a
+    projected src_crs needs the bbox (in src_crs) of all features, without bbox it is only applied to geographic crs
+    and densification in projection. A GeodenseError is raised for a feature outside bbox, and, after the last feature,
+    when all features only contained (Multi)Point geometries (see validate_geom_type).
+    """
+    min_scale_factor = get_min_scale_factor_bbox(densify_config, bbox)
+    _densify_geometry = partial(densify_geometry, densify_config, min_scale_factor=min_scale_factor, stats=stats)
+    feature_counter = get_feature_counter(stats)
+    validator = _FeatureStreamValidator("densify", bbox)
+    for feature in features:
+        feature_obj = _to_feature(feature)
+        del feature  # do not keep input feature alive while the consumer processes feature_t
+        validator.validate(feature_obj)
+        feature_t = traverse_geojson_geometries(feature_obj, _densify_geometry, feature_counter)
+        del feature_obj
+        yield cast(Feature, feature_t)
+    validator.finish()
+
+
+def _to_feature(feature: Feature | dict[str, Any]) -> Feature:
+    if isinstance(feature, Feature):
+        return feature
+    feature_obj = dict_to_geojson(feature)
+    if not isinstance(feature_obj, Feature):
+        raise GeodenseError(f"expected GeoJSON Feature, received: {feature.get('type')}")
+    return feature_obj
+
+
+def get_feature_counter(stats: DenseStats | None) -> Callable | None:
+    """Returns node_callback for traverse_geojson_geometries counting features in stats, None when stats is None."""
+    if stats is None:
+        return None
+
+    def _count_feature(node: GeojsonObject) -> None:
+        if isinstance(node, Feature):
+            stats.increment("features")
+
+    return _count_feature
+
+
+def densify_geometry(
+    densify_config: DenseConfig,
+    geometry: GeojsonGeomNoGeomCollection,
+    min_scale_factor: float | None = None,
+    stats: DenseStats | None = None,
+    inverses: Callable[[int, LineStringCoords], Sequence[GeodesicInverse | None]] | None = None,
+) -> None:
+    """Densify (and reproject) geometry in place.
+
+    inverses can return the precomputed inverse geodesics of the line segments of a linestring, called with the index
+    of the linestring in geometry (in traversal order) and the linestring, see get_geodesic_inverses.
+    """
+    for _, task in _densify_geometry_tasks(densify_config, geometry, min_scale_factor, stats, inverses=inverses):
+        task()
+
+
+def _densify_geometry_tasks(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geometry: GeojsonGeomNoGeomCollection,
+    min_scale_factor: float | None,
+    stats: DenseStats | None,
+    max_unit_cost: float | None = None,
+    stitch_tasks: list[Callable[[], None]] | None = None,
+    inverses: Callable[[int, LineStringCoords], Sequence[GeodesicInverse | None]] | None = None,
+) -> list[tuple[float, Callable[[], None]]]:
+    """Returns tasks with their estimated cost to densify (and optionally reproject) geometry in place, one task per linestring, tasks are independent so can run concurrently.
+
+    When max_unit_cost and stitch_tasks are set, linestrings with an estimated cost above max_unit_cost or with more
+    than LINESTRING_CHUNK_SIZE line segments get one task per vertex range, and a task to stitch the ranges into the
+    linestring is appended to stitch_tasks. Stitch tasks must run after all returned tasks are done. inverses (see
+    densify_geometry) is only used for linestrings densified in one task.
+    """
+    if isinstance(geometry.coordinates, tuple):  # point geometry
+        if densify_config.dst_crs is None:
+            return []
+        return [(1, partial(reproject_geometry, densify_config, geometry))]
+
+    skip_densify = _skip_by_bbox_prefilter(densify_config, geometry, min_scale_factor, stats)
+    tasks: list[tuple[float, Callable[[], None]]] = []
+    linestring_indices = count()
+
+    def _add_task(coords: GeojsonCoordinates) -> None:
+        linestring = cast(LineStringCoords, coords)
+        linestring_index = next(linestring_indices)
+        cost = _estimate_linestring_cost(densify_config, linestring, 0, len(linestring) - 1, not skip_densify)
+        if (
+            max_unit_cost is None
+            or stitch_tasks is None
+            or (cost <= max_unit_cost and len(linestring) - 1 <= LINESTRING_CHUNK_SIZE)
+        ):
+            tasks.append(
+                (
+                    cost,
+                    partial(
+                        _densify_and_reproject_linestring,
+                        densify_config,
+                        coords,
+                        skip_densify,
+                        min_scale_factor,
+                        stats,
+                        None if inverses is None else partial(inverses, linestring_index),
+                    ),
+                )
+            )
+            return
+        skip = skip_densify or _skip_linestring_by_bbox_prefilter(densify_config, linestring, min_scale_factor, stats)
+        if skip and densify_config.dst_crs is None:
+            if stats is not None:
+                stats.increment("vertices", len(linestring))
+            return
+        ranges = _split_linestring_by_cost(densify_config, linestring, max_unit_cost, not skip)
+        parts: list[list[Position]] = [[] for _ in ranges]
+        for index, (start, end, range_cost) in enumerate(ranges):
+            tasks.append(
+                (
+                    range_cost,
+                    partial(
+                        _densify_and_reproject_range, densify_config, linestring, start, end, skip, parts, index, stats
+                    ),
+                )
+            )
+        stitch_tasks.append(partial(_stitch_ranges, linestring, parts))
+
+    traverse_linestrings_in_coordinates(geometry.coordinates, _add_task)
+    return tasks
 
 
-def densify_geometry(densify_config: DenseConfig, geometry: GeojsonGeomNoGeomCollection) -> None:
-    _densify_line_segment = partial(densify_line_segment, densify_config)
-    result: GeojsonCoordinates = traverse_linestrings_in_coordinates(geometry.coordinates, _densify_line_segment)
-    geometry.coordinates = result
+def _densify_and_reproject_linestring(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    coords: GeojsonCoordinates,
+    skip_densify: bool,
+    min_scale_factor: float | None,
+    stats: DenseStats | None,
+    inverses: Callable[[LineStringCoords], Sequence[GeodesicInverse | None]] | None = None,
+) -> None:
+    if stats is not None:
+        stats.increment("vertices", len(coords))
+    if not skip_densify:
+        densify_line_segment(densify_config, coords, min_scale_factor, stats, inverses)
+    if densify_config.dst_crs is not None:
+        linestring = cast(LineStringCoords, coords)
+        linestring[:] = _reproject_positions(densify_config, linestring)
+
+
+def _densify_and_reproject_range(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    linestring: LineStringCoords,
+    start: int,
+    end: int,
+    skip_densify: bool,
+    parts: list[list[Position]],
+    index: int,
+    stats: DenseStats | None = None,
+) -> None:
+    if stats is not None:
+        stats.increment("vertices", end - start + (start == 0))
+    part = (
+        list(linestring[start : end + 1])
+        if skip_densify
+        else densify_vertex_range(densify_config, linestring, start, end)
+    )
+    if densify_config.dst_crs is not None:
+        part = _reproject_positions(densify_config, part)
+    parts[index] = part
+
+
+def _get_max_work_unit_cost(
+    densify_config: DenseConfig, linestrings: Iterable[LineStringCoords], threads: int, densify: bool
+) -> float:
+    """Estimated cost above which a linestring is split in vertex ranges, so the work can be balanced over threads.
+
+    Feature cost is very skewed in practice, a single coastline can cost more than thousands of parcels. The total
+    estimated cost is spread over WORK_UNITS_PER_THREAD work units per thread, so longest-first scheduling (see
+    _submit_longest_first) can fill up idle threads with the smaller units.
+    """
+    total_cost = sum(
+        _estimate_linestring_cost(densify_config, linestring, 0, len(linestring) - 1, densify)
+        for linestring in linestrings
+    )
+    return max(total_cost / (threads * WORK_UNITS_PER_THREAD), MIN_WORK_UNIT_COST)
+
+
+def _estimate_linestring_cost(
+    densify_config: DenseConfig, linestring: LineStringCoords, start: int, end: int, densify: bool
+) -> float:
+    """Estimated cost of processing line segments start up to end of linestring: nr of vertices and, when densify, the estimated nr of vertices to add (planar length of line segments over max_segment_length)."""
+    cost = float(end - start + 1)
+    if densify and end > start:
+        cost += (
+            _planar_length(linestring, start, end)
+            * _get_meters_per_unit(densify_config)
+            / densify_config.max_segment_length
+        )
+    return cost
+
+
+def _split_linestring_by_cost(
+    densify_config: DenseConfig, linestring: LineStringCoords, max_unit_cost: float, densify: bool
+) -> list[tuple[int, int, float]]:
+    """Split linestring in vertex ranges of at most max_unit_cost estimated cost and LINESTRING_CHUNK_SIZE line segments, returns start, end and estimated cost per range.
+
+    Ranges overlap at their boundary vertex, a range contains at least one line segment.
+    """
+    meters_per_unit = _get_meters_per_unit(densify_config)
+    ranges: list[tuple[int, int, float]] = []
+    start = 0
+    cost = 1.0
+    for i, (a, b) in enumerate(pairwise(linestring)):
+        segment_cost = 1.0
+        if densify:
+            segment_cost += math.dist(a[0:2], b[0:2]) * meters_per_unit / densify_config.max_segment_length
+        if i > start and (cost + segment_cost > max_unit_cost or i - start >= LINESTRING_CHUNK_SIZE):
+            ranges.append((start, i, cost))
+            start = i
+            cost = 1.0
+        cost += segment_cost
+    ranges.append((start, len(linestring) - 1, cost))
+    return ranges
+
+
+def _planar_length(linestring: LineStringCoords, start: int, end: int) -> float:
+    return sum(math.dist(a[0:2], b[0:2]) for a, b in pairwise(linestring[start : end + 1]))
+
+
+def _get_meters_per_unit(densify_config: DenseConfig) -> float:
+    """Approximate nr of meters per coordinate unit of src_crs, meters per degree along the equator for geographic crs."""
+    if densify_config.src_crs.is_geographic:
+        return densify_config.geod.a * math.pi / 180
+    return 1.0
+
+
+def _submit_longest_first(
+    executor: Executor,
+    threads: int,
+    units: Sequence[tuple[float, Callable[[], T]]],
+    stats: DenseStats | None,
+) -> list[Future[T]]:
+    """Submits work units to executor in order of decreasing estimated cost, returns futures in order of units.
+
+    Idle worker threads take the next unit from the queue of the executor, so submitting longest-first results in
+    longest-processing-time-first scheduling: the big units start early and the small units fill up the gaps at the
+    end. When stats is set, the busy time per worker thread is recorded to report the achieved balance.
+    """
+    if stats is not None:
+        stats.set_work_units(len(units), threads)
+    futures: list[Future[T] | None] = [None] * len(units)
+    for i in sorted(range(len(units)), key=lambda i: units[i][0], reverse=True):
+        task = units[i][1]
+        futures[i] = executor.submit(_run_timed, task, stats) if stats is not None else executor.submit(task)
+    return cast(list[Future[T]], futures)
+
+
+def _run_timed(task: Callable[[], T], stats: DenseStats) -> T:
+    start_time = time.perf_counter()
+    try:
+        return task()
+    finally:
+        stats.add_worker_time(threading.current_thread().name, time.perf_counter() - start_time)
+
+
+def _stitch_ranges(linestring: LineStringCoords, parts: list[list[Position]]) -> None:
+    """Stitch densified vertex ranges into linestring, ranges overlap at boundary vertex so first vertex of each subsequent range is dropped."""
+    linestring[:] = list(chain(parts[0], *(part[1:] for part in parts[1:])))
+
+
+def _has_inf_val_error(futures: list[Future]) -> bool:
+    """Waits for futures, returns True if any raised InfValCoordinateError, reraises other exceptions."""
+    result = False
+    for future in futures:
+        exc = future.exception()
+        if isinstance(exc, InfValCoordinateError):
+            result = True
+        elif exc is not None:
+            raise exc
+    return result
+
+
+def _drop_failed_geometries(geojson_obj: GeojsonObject, failed_geometries: set[int]) -> None:
+    """Set geometry of features to None when one of its geometries is in failed_geometries (by id), consistent with traverse_geojson_geometries for InfValCoordinateError."""
+
+    def _geometry_failed(geometry: Geometry | None) -> bool:
+        if isinstance(geometry, GeometryCollection):
+            return any(_geometry_failed(g) for g in geometry.geometries)
+        return id(geometry) in failed_geometries
+
+    if len(failed_geometries) == 0:
+        return
+    if isinstance(geojson_obj, CrsFeatureCollection):
+        for feature in geojson_obj.features:
+            _drop_failed_geometries(feature, failed_geometries)
+    elif isinstance(geojson_obj, Feature):
+        if _geometry_failed(geojson_obj.geometry):
+            geojson_obj.geometry = None
+    else:
+        raise InfValCoordinateError("reprojection resulted in infinite coordinates")
+
+
+def reproject_geometry(densify_config: DenseConfig, geometry: GeojsonGeomNoGeomCollection) -> None:
+    """Reproject geometry in place from src_crs to dst_crs, with one transformer call per coordinates sequence.
+
+    Raises:
+        InfValCoordinateError: when reprojection results in coordinates with infinite values
+    """
+    if isinstance(geometry.coordinates, tuple):  # point geometry
+        geometry.coordinates = _reproject_positions(densify_config, [geometry.coordinates])[0]
+        return
+
+    def _reproject_linestring(coords: GeojsonCoordinates) -> None:
+        linestring = cast(LineStringCoords, coords)
+        linestring[:] = _reproject_positions(densify_config, linestring)
+
+    traverse_linestrings_in_coordinates(geometry.coordinates, _reproject_linestring)
+
+
+def _reproject_positions(densify_config: DenseConfig, positions: Sequence[Position]) -> list[Position]:
+    kernel = densify_config.kernel
+    transformer = kernel.dst_transformer
+    if transformer is None or kernel.dst_precision is None:
+        raise GeodenseError("dst_transformer cannot be None when reprojecting to dst_crs")
+    prec = kernel.dst_precision
+    xs = [p[0] for p in positions]
+    ys = [p[1] for p in positions]
+    all_three_dimensional = all(len(p) == THREE_DIMENSIONAL for p in positions)
+    if all_three_dimensional:
+        xs_t, ys_t, zs_t = transformer.transform(xs, ys, [cast(Position3D, p).altitude for p in positions])
+    else:  # when mixed 2D/3D only reproject horizontal component
+        xs_t, ys_t = transformer.transform(xs, ys)
+        zs_t = [cast(Position3D, p).altitude if len(p) == THREE_DIMENSIONAL else None for p in positions]
+    if not all(math.isfinite(v) for v in (*xs_t, *ys_t)):
+        raise InfValCoordinateError(f"reprojection to {densify_config.dst_crs} resulted in infinite coordinates")
+    return [
+        _round_coordinates(
+            Position2D(longitude=x, latitude=y) if z is None else Position3D(longitude=x, latitude=y, altitude=z),
+            prec,
+        )
+        for x, y, z in zip(xs_t, ys_t, zs_t, strict=True)
+    ]
 
 
 def densify_line_segment(
     densify_config: DenseConfig,
     coords: GeojsonCoordinates,
+    min_scale_factor: float | None = None,
+    stats: DenseStats | None = None,
+    inverses: Callable[[LineStringCoords], Sequence[GeodesicInverse | None]] | None = None,
 ) -> None:
+    """Densify linestring coords in place, inverses can return the precomputed inverse geodesics of its line segments (see get_geodesic_inverses)."""
     linestring = cast(LineStringCoords, coords)
-    added_nodes = 0
-    stop = len(linestring) - 1
-    for i, _ in enumerate(linestring[:stop]):
-        added_nodes += _add_vertices_to_line_segment(linestring, i + added_nodes, densify_config)
+    if _skip_linestring_by_bbox_prefilter(densify_config, linestring, min_scale_factor, stats):
+        return
+    if len(linestring) < 2:  # noqa: PLR2004
+        return
+    linestring[:] = densify_vertex_range(
+        densify_config, linestring, 0, len(linestring) - 1, None if inverses is None else inverses(linestring)
+    )
+
+
+def densify_vertex_range(
+    densify_config: DenseConfig,
+    linestring: LineStringCoords,
+    start: int,
+    end: int,
+    inverses: Sequence[GeodesicInverse | None] | None = None,
+) -> list[Position]:
+    """Densify line segments between vertex start and vertex end of linestring, returns densified vertices start up to and including end.
+
+    Result for a vertex range is identical to the corresponding part of the result for the complete linestring, so
+    ranges can be densified independently and stitched at their boundary vertex. With geodesic densification,
+    inverses can be the precomputed inverse geodesics of the line segments (see get_geodesic_inverses).
+    """
+    kernel = densify_config.kernel
+    prec = kernel.precision
+    rounded = [_round_coordinates(x, prec) for x in linestring[start : end + 1]]
+
+    # a of line segment i > 0 is the rounded b of line segment i - 1
+    segment_points: Sequence[LineStringCoords]
+    if kernel.geodesic:
+        segment_points = _interpolate_geodesic_range(linestring, rounded, start, kernel, inverses)
+    else:
+        segment_points = [
+            [
+                _round_coordinates(p, prec)
+                for p in _get_intermediate_points(
+                    linestring[0] if i == 0 else rounded[i - start], linestring[i + 1], kernel
+                )
+            ]
+            for i in range(start, end)
+        ]
+
+    # build densified vertex range in one forward pass, sized in advance from nr of intermediate points
+    result: list[Position | None] = [None] * (len(rounded) + sum(len(p) for p in segment_points))
+    result[0] = rounded[0]
+    j = 1
+    for i, points in enumerate(segment_points):
+        for p in points:
+            result[j] = p
+            j += 1
+        result[j] = rounded[i + 1]
+        j += 1
+    return cast(list[Position], result)
+
+
+def _interpolate_geodesic_range(
+    linestring: LineStringCoords,
+    rounded: list[Position],
+    start: int,
+    kernel: DenseKernel,
+    inverses: Sequence[GeodesicInverse | None] | None = None,
+) -> list[list[Position]]:
+    """Geodesic interpolate intermediate points of line segments start up to start + len(rounded) - 1, returns rounded intermediate points per line segment.
+
+    The total nr of intermediate points is known before interpolating, so Geod.fwd_intermediate writes the points of
+    all line segments into one preallocated pair of buffers, which are back converted and rounded in bulk.
+    """
+    if inverses is None:
+        inverses = _get_geodesic_inverses(linestring, rounded, start, kernel)
+    segments = [_get_geodesic_segment_from_inverse(inverse, kernel.max_segment_length) for inverse in inverses]
+    nr_points_total = sum(segment[2] for segment in segments if segment is not None)
+    if nr_points_total == 0:
+        return [[] for _ in segments]
+
+    lons = array("d", [0.0]) * nr_points_total
+    lats = array("d", [0.0]) * nr_points_total
+    lons_view, lats_view = memoryview(lons), memoryview(lats)
+    offset = 0
+    for segment in segments:
+        if segment is None:
+            continue
+        a_t, az12, nr_points, del_s, _ = segment
+        kernel.geod.fwd_intermediate(
+            *a_t,
+            az12,
+            npts=nr_points,
+            del_s=del_s,
+            return_back_azimuth=True,
+            out_lons=lons_view[offset : offset + nr_points],
+            out_lats=lats_view[offset : offset + nr_points],
+        )
+        offset += nr_points
+    lons_view.release()
+    lats_view.release()
+
+    if kernel.back_transformer is not None:  # src_crs is projected
+        kernel.back_transformer.transform(lons, lats, inplace=True)
+    prec = kernel.precision
+    lons_rounded = [round(lon, prec) for lon in lons]
+    lats_rounded = [round(lat, prec) for lat in lats]
+
+    result: list[list[Position]] = []
+    offset = 0
+    for i, segment in enumerate(segments):
+        if segment is None:
+            result.append([])
+            continue
+        nr_points = segment[2]
+        a = linestring[0] if start + i == 0 else rounded[i]
+        result.append(
+            _geodesic_positions(
+                a,
+                linestring[start + i + 1],
+                lons_rounded[offset : offset + nr_points],
+                lats_rounded[offset : offset + nr_points],
+                segment,
+            )
+        )
+        offset += nr_points
+    return result
+
+
+def check_density_geojson_object(
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    stats: DenseStats | None = None,
+    threads: int | None = None,
+    feature_filter: FeatureFilter | None = None,
+) -> CrsFeatureCollection:
+    """Check density of geometries in geojson_obj, returns report with line segments exceeding max_segment_length.
+
+    When threads > 1 the linestrings (and rings) of all geometries are checked concurrently in a thread pool. With
+    feature_filter only the selected features are checked.
+    """
+    report: list[ReportLineString] = [
+        (segment_length, segment)
+        for _, _, _, segment_length, segment in check_density_report_segments(
+            densify_config, geojson_obj, stats, threads, feature_filter
+        )
+    ]
+    return _report_line_string_to_geojson(report, ":".join(densify_config.src_crs.to_authority()))
+
+
+def check_density_report_segments(
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    stats: DenseStats | None = None,
+    threads: int | None = None,
+    feature_filter: FeatureFilter | None = None,
+) -> Iterator[ReportSegment]:
+    """Check density of geometries in geojson_obj, yields line segments exceeding max_segment_length in order of geojson_obj.
+
+    Each line segment is yielded with the index of its feature, the index of its part and the index of the line segment
+    in the part. The part index is the index of the linestring (line or ring) in the geometry of the feature, in order of
+    appearance and counted across the polygons of a multipolygon and the geometries of a geometry collection.
+
+    When threads > 1 the linestrings (and rings) of all geometries are checked concurrently in a thread pool, scheduled
+    longest-first by nr of line segments. Linestrings with more line segments than a fair share of a worker thread, or
+    more than LINESTRING_CHUNK_SIZE, are checked in vertex ranges.
+
+    With feature_filter only the selected features are checked, feature indices remain the indices in geojson_obj.
+    """
+    validate_geom_type(geojson_obj, "density-check")
+    min_scale_factor = get_min_scale_factor_geojson(densify_config, geojson_obj)
+    if threads is None or threads <= 1:
+        for feature_index, part_index, linestring in _iter_linestrings_to_check(
+            densify_config, geojson_obj, min_scale_factor, stats, feature_filter
+        ):
+            for segment_index, (segment_length, segment) in _check_density_linestring_segments(
+                densify_config, linestring, min_scale_factor, stats
+            ):
+                yield (feature_index, part_index, segment_index, segment_length, segment)
+        return
+
+    linestrings = list(_iter_linestrings_to_check(densify_config, geojson_obj, min_scale_factor, stats, feature_filter))
+    max_unit_cost = _get_max_work_unit_cost(densify_config, (ls for _, _, ls in linestrings), threads, densify=False)
+    units: list[tuple[float, Callable[[], list[tuple[int, ReportLineString]]]]] = []
+    indices: list[tuple[int, int]] = []
+    for feature_index, part_index, linestring in linestrings:
+        if len(linestring) <= max_unit_cost and len(linestring) - 1 <= LINESTRING_CHUNK_SIZE:
+            units.append(
+                (
+                    len(linestring),
+                    partial(_check_density_linestring_segments, densify_config, linestring, min_scale_factor, stats),
+                )
+            )
+            indices.append((feature_index, part_index))
+            continue
+        if _skip_linestring_by_bbox_prefilter(densify_config, linestring, min_scale_factor, stats):
+            continue
+        for start, end, cost in _split_linestring_by_cost(densify_config, linestring, max_unit_cost, densify=False):
+            units.append(
+                (
+                    cost,
+                    partial(
+                        _check_density_segments,
+                        densify_config,
+                        linestring[start : end + 1],
+                        min_scale_factor,
+                        start,
+                        stats,
+                    ),
+                )
+            )
+            indices.append((feature_index, part_index))
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="geodense") as executor:
+        futures = _submit_longest_first(executor, threads, units, stats)
+        for (feature_index, part_index), future in zip(indices, futures, strict=True):
+            for segment_index, (segment_length, segment) in future.result():
+                yield (feature_index, part_index, segment_index, segment_length, segment)
 
 
-def check_density_geojson_object(densify_config: DenseConfig, geojson_obj: GeojsonObject) -> CrsFeatureCollection:
+def check_density_features(
+    densify_config: DenseConfig,
+    features: Iterable[Feature | dict[str, Any]],
+    stats: DenseStats | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> Iterator[list[ReportSegment]]:
+    """Check density of features one at a time, yields line segments exceeding max_segment_length per feature in order of features.
+
+    An empty list is yielded for features without line segments exceeding max_segment_length, the feature index of the
+    line segments is the index of the feature in features (see check_density_report_segments). As with
+    densify_features, features are read lazily, no references to processed input features are kept and features are
+    validated against bbox and geometry type.
+    """
+    min_scale_factor = get_min_scale_factor_bbox(densify_config, bbox)
+    validator = _FeatureStreamValidator("density-check", bbox)
+    for feature_index, feature in enumerate(features):
+        feature_obj = _to_feature(feature)
+        del feature
+        validator.validate(feature_obj)
+        yield [
+            (feature_index, part_index, segment_index, segment_length, segment)
+            for _, part_index, linestring in _iter_linestrings_to_check(
+                densify_config, feature_obj, min_scale_factor, stats
+            )
+            for segment_index, (segment_length, segment) in _check_density_linestring_segments(
+                densify_config, linestring, min_scale_factor, stats
+            )
+        ]
+    validator.finish()
+
+
+def sample_density_geojson_object(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    sample: float,
+    seed: int = 0,
+    feature_filter: FeatureFilter | None = None,
+    confidence: float = SAMPLE_CONFIDENCE,
+) -> DensitySample:
+    """Estimate fraction of line segments in geojson_obj exceeding max_segment_length by checking a random sample of line segments, instead of all line segments.
+
+    With sample below 1 it is the fraction of line segments to check, otherwise the nr of line segments to check.
+    Line segments are drawn with replacement, with probability proportional to their planar length, so long line
+    segments (the ones that can exceed max_segment_length) are over-represented. The sample is reproducible for the
+    same seed. The fraction is estimated with the Hansen-Hurwitz estimator (each failed line segment counts inversely
+    to its probability of being drawn), its confidence interval with the normal approximation. When no sampled line
+    segment fails, the upper bound is the one-sided bound 1 - (1 - confidence)^(1 / sample size) of the length share of
+    failing line segments, which bounds their fraction as long as failing line segments are longer than average.
+    """
     validate_geom_type(geojson_obj, "density-check")
-    _check_density_geometry = partial(check_density_geometry, densify_config)
-    result: Nested[ReportLineString] | None = transform_geojson_geometries(geojson_obj, _check_density_geometry)
-    if result is None:
-        raise ValueError("_check_density_geometry returned None")
-
-    flat_result: list[ReportLineString] = (
-        list(  # filter out None values, these occur when point geometries are part of input
-            filter(lambda x: x is not None, _flatten(result))
+    linestrings = _get_sample_linestrings(geojson_obj, feature_filter)
+    nr_segments = sum(len(linestring) - 1 for linestring in linestrings)
+    sample_size = _get_sample_size(sample, nr_segments)
+    cumulative_lengths = list(accumulate(_planar_length(ls, 0, len(ls) - 1) for ls in linestrings))
+    total_length = cumulative_lengths[-1] if len(cumulative_lengths) > 0 else 0.0
+    if sample_size == 0 or total_length == 0:
+        return DensitySample(nr_segments, 0, 0, 0.0, 0.0, 0.0, confidence)
+
+    min_scale_factor = get_min_scale_factor_geojson(densify_config, geojson_obj)
+    rng = random.Random(seed)  # noqa: S311, not used for security
+    segment_cumulative_lengths: dict[int, list[float]] = {}  # per sampled linestring
+    estimates: list[float] = []
+    for _ in range(sample_size):
+        target = rng.random() * total_length
+        i = min(bisect_right(cumulative_lengths, target), len(linestrings) - 1)
+        linestring = linestrings[i]
+        if i not in segment_cumulative_lengths:
+            segment_cumulative_lengths[i] = list(accumulate(math.dist(a[0:2], b[0:2]) for a, b in pairwise(linestring)))
+        lengths = segment_cumulative_lengths[i]
+        k = min(bisect_right(lengths, target - (cumulative_lengths[i - 1] if i > 0 else 0.0)), len(lengths) - 1)
+        segment_length = lengths[k] - (lengths[k - 1] if k > 0 else 0.0)
+        failed = len(_check_density_segments(densify_config, linestring[k : k + 2], min_scale_factor)) > 0
+        # failed line segment is counted inversely to its probability segment_length / total_length
+        estimates.append(total_length / segment_length if failed else 0.0)
+    return _get_density_sample(estimates, nr_segments, confidence)
+
+
+def _get_sample_linestrings(geojson_obj: GeojsonObject, feature_filter: FeatureFilter | None) -> list[LineStringCoords]:
+    """Linestrings with at least one line segment in geojson_obj, of features selected by feature_filter."""
+    features = _get_features(geojson_obj)
+    selected = _get_selected_features(feature_filter, features, None) if feature_filter is not None else None
+    return [
+        linestring
+        for feature_index, feature in enumerate(features)
+        if selected is None or selected[feature_index]
+        for geometry in _get_geometries(feature.geometry if isinstance(feature, Feature) else feature)
+        if not isinstance(geometry, Point | MultiPoint)
+        for linestring in _get_linestrings(geometry.coordinates)
+        if len(linestring) >= 2  # noqa: PLR2004
+    ]
+
+
+def _get_sample_size(sample: float, nr_segments: int) -> int:
+    if sample <= 0 or (sample > 1 and not float(sample).is_integer()):
+        raise GeodenseError(
+            f"sample should be a fraction between 0 and 1, or a whole nr of line segments, received: {sample}"
         )
+    if sample < 1:
+        return math.ceil(sample * nr_segments)
+    return min(int(sample), nr_segments)
+
+
+def _get_density_sample(estimates: list[float], nr_segments: int, confidence: float) -> DensitySample:
+    sample_size = len(estimates)
+    failed_samples = sum(1 for x in estimates if x > 0)
+    failure_rate = math.fsum(estimates) / sample_size / nr_segments
+    if failed_samples == 0:
+        return DensitySample(
+            nr_segments, sample_size, 0, 0.0, 0.0, 1 - (1 - confidence) ** (1 / sample_size), confidence
+        )
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    margin = z * statistics.stdev(estimates) / math.sqrt(sample_size) / nr_segments if sample_size > 1 else 1.0
+    return DensitySample(
+        nr_segments,
+        sample_size,
+        failed_samples,
+        min(failure_rate, 1.0),
+        max(failure_rate - margin, 0.0),
+        min(failure_rate + margin, 1.0),
+        confidence,
     )
-    report_fc = _report_line_string_to_geojson(flat_result, ":".join(densify_config.src_crs.to_authority()))
-    return report_fc
+
+
+def _iter_linestrings_to_check(
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    min_scale_factor: float | None,
+    stats: DenseStats | None,
+    feature_filter: FeatureFilter | None = None,
+) -> Iterator[tuple[int, int, LineStringCoords]]:
+    """Yields feature index, part index and linestring for linestrings in geojson_obj, except for linestrings of geometries skipped by the bbox prefilter or of features not selected by feature_filter."""
+    features = _get_features(geojson_obj)
+    selected = _get_selected_features(feature_filter, features, stats) if feature_filter is not None else None
+    for feature_index, feature in enumerate(features):
+        if stats is not None:
+            stats.increment("features")
+        if selected is not None and not selected[feature_index]:
+            continue
+        part_index = 0
+        for geometry in _get_geometries(feature.geometry if isinstance(feature, Feature) else feature):
+            linestrings = _get_linestrings(geometry.coordinates)
+            if not _skip_by_bbox_prefilter(densify_config, geometry, min_scale_factor, stats):
+                for i, linestring in enumerate(linestrings):
+                    yield (feature_index, part_index + i, linestring)
+            elif stats is not None:
+                stats.increment("vertices", sum(len(linestring) for linestring in linestrings))
+            part_index += len(linestrings)
+
+
+def _get_features(geojson_obj: GeojsonObject) -> Sequence[Feature | GeojsonObject]:
+    """Returns features of feature collection, otherwise geojson_obj (feature or geometry) itself."""
+    return geojson_obj.features if isinstance(geojson_obj, CrsFeatureCollection) else [geojson_obj]
+
+
+def _count_linestring_vertices(geojson_obj: GeojsonObject) -> int:
+    return sum(
+        len(linestring)
+        for feature in _get_features(geojson_obj)
+        for geometry in _get_geometries(feature.geometry if isinstance(feature, Feature) else feature)
+        for linestring in _get_linestrings(geometry.coordinates)
+    )
+
+
+def get_progress_reporter(
+    progress: bool, stats: DenseStats, geojson_obj: GeojsonObject, description: str
+) -> ProgressReporter | nullcontext:
+    """Context manager reporting progress of stats for geojson_obj on stderr, a no-op context manager when progress is False."""
+    if not progress:
+        return nullcontext()
+    return ProgressReporter(
+        stats, description, len(_get_features(geojson_obj)), _count_linestring_vertices(geojson_obj)
+    )
+
+
+def _get_linestrings(coordinates: GeojsonCoordinates) -> list[LineStringCoords]:
+    linestrings: list[LineStringCoords] = []
+    traverse_linestrings_in_coordinates(coordinates, lambda coords: linestrings.append(cast(LineStringCoords, coords)))
+    return linestrings
+
+
+def _get_geometries(geometry: Geometry | GeojsonObject | None) -> list[GeojsonGeomNoGeomCollection]:
+    """Returns geometries in geometry, geometry collections are flattened."""
+    if geometry is None:
+        return []
+    if isinstance(geometry, GeometryCollection):
+        return [g for child in geometry.geometries for g in _get_geometries(child)]
+    return [cast(GeojsonGeomNoGeomCollection, geometry)]
 
 
 def check_density_geometry(
     densify_config: DenseConfig,
     geometry: GeojsonGeomNoGeomCollection,
+    min_scale_factor: float | None = None,
+    stats: DenseStats | None = None,
 ) -> Nested[ReportLineString] | None:
-    _check_density_linestring = partial(check_density_linestring, densify_config)
+    if _skip_by_bbox_prefilter(densify_config, geometry, min_scale_factor, stats):
+        return []
+    _check_density_linestring = partial(
+        check_density_linestring, densify_config, min_scale_factor=min_scale_factor, stats=stats
+    )
     return transform_linestrings_in_coordinates(geometry.coordinates, _check_density_linestring)
 
 
 def check_density_linestring(
     densify_config: DenseConfig,
     linestring: LineStringCoords,
+    min_scale_factor: float | None = None,
+    stats: DenseStats | None = None,
 ) -> list[ReportLineString]:
-    result = []
+    """Check density of linestring, returns line segments exceeding max_segment_length.
+
+    When min_scale_factor (estimated min scale factor of the projection of src_crs within the extent of the data, see
+    _get_min_scale_factor) is set, the planar length divided by min_scale_factor is used as an estimated upper bound of
+    the geodesic length. Line segments for which this estimate is below max_segment_length pass without conversion to
+    the base geographic crs.
+    """
+    return [x for _, x in _check_density_linestring_segments(densify_config, linestring, min_scale_factor, stats)]
+
+
+def _check_density_linestring_segments(
+    densify_config: DenseConfig,
+    linestring: LineStringCoords,
+    min_scale_factor: float | None,
+    stats: DenseStats | None,
+) -> list[tuple[int, ReportLineString]]:
+    if _skip_linestring_by_bbox_prefilter(densify_config, linestring, min_scale_factor, stats):
+        if stats is not None:
+            stats.increment("vertices", len(linestring))
+        return []
+    return _check_density_segments(densify_config, linestring, min_scale_factor, stats=stats)
 
+
+def _check_density_segments(
+    densify_config: DenseConfig,
+    linestring: LineStringCoords,
+    min_scale_factor: float | None,
+    first_segment_index: int = 0,
+    stats: DenseStats | None = None,
+) -> list[tuple[int, ReportLineString]]:
+    """Returns line segments of linestring exceeding max_segment_length with their index, offset by first_segment_index."""
+    if stats is not None:  # vertex ranges overlap at boundary vertex, count boundary vertex with range ending at it
+        stats.increment("vertices", len(linestring) - (first_segment_index > 0))
+    kernel = densify_config.kernel
+    max_segment_length = kernel.max_segment_length
+    g = kernel.geod
+    result: list[tuple[int, ReportLineString]] = []
     for k in range(0, len(linestring) - 1):
         a: Position = linestring[k]
         b: Position = linestring[k + 1]
@@ -112,18 +1076,14 @@ def check_density_linestring(
         a_2d = cast(Position2D, a[0:2])
         b_2d = cast(Position2D, b[0:2])
 
-        if densify_config.in_projection:
-            linesegment_dist = _cartesian_distance(a_2d, b_2d)
+        if kernel.in_projection:
+            linesegment_dist = cartesian_distance(a_2d, b_2d)
         else:
-            if densify_config.src_crs.is_projected:  # only convert to basegeographic crs if src_proj is projected
-                transformer = densify_config.transformer
-                if transformer is None:
-                    raise GeodenseError("transformer cannot be None when src_crs.is_projected=True")
-                a_t = transformer.transform(*a_2d)
-                b_t = transformer.transform(*b_2d)
-            else:  # src_crs is geographic do not transform
-                a_t, b_t = (a_2d, b_2d)
-            g = densify_config.geod
+            if min_scale_factor is not None and cartesian_distance(a_2d, b_2d) / min_scale_factor <= max_segment_length:
+                continue  # segment cannot exceed max_segment_length, skip conversion and geodesic calculation
+            a_t, b_t = _to_base_geographic(a_2d, b_2d, kernel)
+            if _geodesic_distance_upper_bound(a_t, b_t, g) <= max_segment_length:
+                continue  # segment cannot exceed max_segment_length, skip exact geodesic calculation
 
             _, _, geod_dist = g.inv(*a_t, *b_t, return_back_azimuth=True)
             if math.isnan(geod_dist):
@@ -131,16 +1091,17 @@ def check_density_linestring(
                     f"unable to calculate geodesic distance, output calculation geodesic distance: {geod_dist}, expected: floating-point number"
                 )
             linesegment_dist = geod_dist
-        if linesegment_dist > (densify_config.max_segment_length + 0.001):
-            result.append((linesegment_dist, (a, b)))
+        if linesegment_dist > (max_segment_length + 0.001):
+            result.append((first_segment_index + k, (linesegment_dist, (a, b))))
     return result
 
 
-def _validate_dependent_file_args(
+def validate_dependent_file_args(
     input_file_path: str,
     output_file_path: str | None = None,
     overwrite: bool = False,
 ) -> None:
+    """Raises GeodenseError when output_file_path is input_file_path or exists, with overwrite an existing output_file_path is removed instead."""
     if output_file_path is not None and (input_file_path == output_file_path and input_file_path != "-"):
         raise GeodenseError(
             f"input_file and output_file arguments must be different, input_file: {input_file_path}, output_file: {output_file_path}"
@@ -159,14 +1120,35 @@ def check_density_file(  # noqa: PLR0913
     src_crs: str | None = None,
     in_projection: bool = False,
     overwrite: bool = False,
-) -> tuple[bool, str, int]:
-    if density_check_report_path is None:
-        density_check_report_path = os.path.join(tempfile.mkdtemp(), "check-density-report.json")
-
-    _validate_dependent_file_args(input_file_path, density_check_report_path, overwrite)
+    threads: int | None = None,
+    report_format: ReportFormat = "geojson",
+    report_geometry: bool = False,
+    progress: bool = False,
+    memory_stats: bool = False,
+    where: list[str] | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> tuple[bool, str | None, int]:
+    """Check density of geometries in input file, returns check status, report path and nr of failed line segments.
+
+    The report is only written when the check fails. When density_check_report_path is None, the report is written to
+    a new temporary directory, which is only created when the check fails. The returned report path is therefore
+    str | None: it is None when density_check_report_path is None and the check succeeds, as then no report is
+    written. With report_format "geojson" the report is a FeatureCollection with a LineString feature per failed line
+    segment. With report_format "ndjson" or "csv" the report is written while checking, with a record per failed line
+    segment containing feature index, part index, segment index and segment length, and only with report_geometry the
+    line segment itself (as GeoJSON geometry or WKT respectively).
+
+    With progress, the nr of features and vertices checked and vertices per second are reported on stderr. With
+    memory_stats, the peak of traced memory per stage (read, check) and the peak RSS are reported on stderr. With where
+    and bbox only the features selected by them are checked (see FeatureFilter).
+    """
+    report_file = ReportFile(density_check_report_path, report_format)
+    feature_filter = _get_feature_filter(where, bbox)
+    validate_dependent_file_args(input_file_path, density_check_report_path, overwrite)
 
-    with open(input_file_path) if input_file_path != "-" else sys.stdin as src:
-        geojson_obj = textio_to_geojson(src)
+    with MemoryStats(memory_stats) as memory, open_input(input_file_path) as src:
+        with memory.stage("read"):
+            geojson_obj = textio_to_geojson(src)
         validate_geom_type(geojson_obj, "check-density")
         has_3d_coords: Has3D = _has_3d_coordinates(geojson_obj)
         geojson_src_crs = _get_crs_geojson(geojson_obj, input_file_path, src_crs, has_3d_coords)
@@ -175,15 +1157,123 @@ def check_density_file(  # noqa: PLR0913
             max_segment_length,
             in_projection=in_projection,
         )
-        report_fc = check_density_geojson_object(config, geojson_obj)
+        stats = DenseStats()
+        with memory.stage("check"), get_progress_reporter(progress, stats, geojson_obj, "check-density"):
+            failed_segment_count = write_density_report(
+                check_density_report_segments(config, geojson_obj, stats, threads, feature_filter),
+                report_file,
+                report_format,
+                report_geometry,
+                ":".join(config.src_crs.to_authority()),
+            )
+        logger.info(stats.prefilter_message())
+        if feature_filter is not None:
+            logger.info(stats.filter_message())
+        if stats.work_units > 0:
+            logger.info(stats.balance_message())
 
-    failed_segment_count = len(report_fc.features)
     check_status = failed_segment_count == 0
+    return (check_status, report_file.path, failed_segment_count)
+
+
+def sample_density_file(  # noqa: PLR0913
+    input_file_path: str,
+    max_segment_length: float,
+    sample: float,
+    src_crs: str | None = None,
+    in_projection: bool = False,
+    seed: int = 0,
+    where: list[str] | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> DensitySample:
+    """Estimate fraction of line segments in input file exceeding max_segment_length from a random sample of line segments, see sample_density_geojson_object."""
+    feature_filter = _get_feature_filter(where, bbox)
+    with open_input(input_file_path) as src:
+        geojson_obj = textio_to_geojson(src)
+    validate_geom_type(geojson_obj, "check-density")
+    geojson_src_crs = _get_crs_geojson(geojson_obj, input_file_path, src_crs, _has_3d_coordinates(geojson_obj))
+    config = DenseConfig(
+        CRS.from_authority(*geojson_src_crs.split(":")), max_segment_length, in_projection=in_projection
+    )
+    return sample_density_geojson_object(config, geojson_obj, sample, seed, feature_filter)
 
-    if not check_status:
-        with open(density_check_report_path, "w") as f:
-            f.write(report_fc.model_dump_json(indent=4, exclude_none=True))
-    return (check_status, density_check_report_path, len(report_fc.features))
+
+class ReportFile:
+    """Opens density-check report at path when called, or in a new temporary directory when path is None, which is only created on the first call."""
+
+    def __init__(self: "ReportFile", path: str | None, report_format: ReportFormat) -> None:
+        if report_format not in REPORT_FILE_FORMATS:
+            raise GeodenseError(
+                f"unsupported report format: {report_format}, expected one of: {', '.join(REPORT_FILE_FORMATS)}"
+            )
+        if path is not None:
+            _, report_ext = os.path.splitext(strip_compression_ext(path))
+            if report_ext not in REPORT_FILE_FORMATS[report_format]:
+                raise GeodenseError(
+                    f"unsupported file extension of density-check report for report format {report_format}, received: {report_ext}, expected one of: {', '.join(REPORT_FILE_FORMATS[report_format])}"
+                )
+        self.path = path
+        self.report_format = report_format
+
+    def __call__(self: "ReportFile", newline: str | None) -> TextIO:
+        if self.path is None:
+            self.path = os.path.join(
+                tempfile.mkdtemp(), f"check-density-report{REPORT_FILE_FORMATS[self.report_format][0]}"
+            )
+        return open_output(self.path, newline)
+
+
+def write_density_report(
+    report_segments: Iterable[ReportSegment],
+    open_report: Callable[[str | None], TextIO],
+    report_format: ReportFormat,
+    report_geometry: bool,
+    src_crs_auth_code: str | None,
+) -> int:
+    """Write failed line segments to report opened with open_report (called with newline argument), returns nr of failed line segments. Report is only opened when there are failed line segments."""
+    if report_format == "geojson":
+        report: list[ReportLineString] = [(length, segment) for _, _, _, length, segment in report_segments]
+        if len(report) > 0:
+            report_fc = _report_line_string_to_geojson(report, src_crs_auth_code)
+            with open_report(None) as f:
+                f.write(report_fc.model_dump_json(indent=4, exclude_none=True))
+        return len(report)
+
+    count = 0
+    with ExitStack() as stack:
+        write_record: Callable[[ReportSegment], None] | None = None
+        for report_segment in report_segments:
+            if write_record is None:  # create report on first failed line segment
+                f = stack.enter_context(open_report(""))
+                write_record = _get_report_record_writer(f, report_format, report_geometry)
+            write_record(report_segment)
+            count += 1
+    return count
+
+
+def _get_report_record_writer(
+    f: TextIO, report_format: ReportFormat, report_geometry: bool
+) -> Callable[[ReportSegment], None]:
+    if report_format == "ndjson":
+
+        def _write_ndjson_record(report_segment: ReportSegment) -> None:
+            record: dict = dict(zip(REPORT_COLUMNS, report_segment[0:4], strict=True))
+            if report_geometry:
+                record["geometry"] = {"type": "LineString", "coordinates": [list(p) for p in report_segment[4]]}
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+        return _write_ndjson_record
+
+    writer = csv.writer(f)
+    writer.writerow([*REPORT_COLUMNS, "wkt"] if report_geometry else REPORT_COLUMNS)
+
+    def _write_csv_record(report_segment: ReportSegment) -> None:
+        row: list = list(report_segment[0:4])
+        if report_geometry:
+            row.append(ShpLineString(report_segment[4]).wkt)
+        writer.writerow(row)
+
+    return _write_csv_record
 
 
 def _report_line_string_to_geojson(
@@ -210,6 +1300,19 @@ def densify_file(  # noqa: PLR0913
     max_segment_length: float | None = None,
     densify_in_projection: bool = False,
     src_crs: str | None = None,
+    tolerance: float | None = None,
+    dst_crs: str | None = None,
+    threads: int | None = None,
+    progress: bool = False,
+    memory_stats: bool = False,
+    raw_passthrough: bool = False,
+    max_output_vertices: int | None = None,
+    processes: int | None = None,
+    where: list[str] | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+    drop_unselected: bool = False,
+    checkpoint_interval: int | None = None,
+    resume: bool = False,
 ) -> None:
     """_summary_
 
@@ -222,30 +1325,333 @@ def densify_file(  # noqa: PLR0913
         max_segment_length -- max segment length to use for densification (default: {None})
         densify_in_projection -- user src projection for densification (default: {False})
         src_crs -- override src crs of input file (default: {None})
+        tolerance -- max deviation in meters between geodesic and line segment in src crs, when set densify adaptively instead of with max_segment_length (default: {None})
+        dst_crs -- reproject densified geometries to dst crs in the same pass (default: {None})
+        threads -- number of worker threads used to densify linestrings, serial when None or 1 (default: {None})
+        progress -- report nr of features and vertices processed and vertices per second on stderr (default: {False})
+        memory_stats -- report peak of traced memory per stage (read, densify, serialize, write) and peak RSS on stderr, slows down processing (default: {False})
+        raw_passthrough -- write properties and geometries that gained no vertices as raw text from input, instead of parsing and serializing them (default: {False})
+        max_output_vertices -- abort before densifying when the estimated nr of output vertices exceeds max_output_vertices, see estimate_densify_geojson_object (default: {None})
+        processes -- number of worker processes used to densify linestrings, coordinates are exchanged through shared memory, cannot be combined with threads (default: {None})
+        where -- property predicates (KEY OP VALUE) a feature must match to be densified, see FeatureFilter (default: {None})
+        bbox -- bbox (x_min, y_min, x_max, y_max in src crs) the geometry of a feature must intersect to be densified (default: {None})
+        drop_unselected -- drop features not selected by where and bbox from the output, instead of passing them through (default: {False})
+        checkpoint_interval -- write output incrementally, with a checkpoint record after every checkpoint_interval features, see densify_with_checkpoints (default: {None})
+        resume -- resume densifying from the last checkpoint of an interrupted run with the same input file and parameters (default: {False})
 
     Raises:
         ValueError: application errors
         pyproj.exceptions.CRSError: when crs cannot be found by pyproj
 
     """
-    _validate_dependent_file_args(input_file_path, output_file_path, overwrite)
+    checkpoints = checkpoint_interval is not None or resume
+    # with resume the output file of the interrupted run is appended to
+    validate_dependent_file_args(input_file_path, output_file_path if not resume else None, overwrite)
+    feature_filter = _get_feature_filter(where, bbox, drop_unselected)
+    _validate_densify_mode_args(output_file_path, raw_passthrough, feature_filter, checkpoints)
     src: TextIO
-    with open(input_file_path) if input_file_path != "-" else sys.stdin as src:
-        geojson_obj = textio_to_geojson(src)
-        has_3d_coords: Has3D = _has_3d_coordinates(geojson_obj)
-        geojson_src_crs = _get_crs_geojson(geojson_obj, input_file_path, src_crs, has_3d_coords)
-        config = DenseConfig(
-            CRS.from_authority(*geojson_src_crs.split(":")),
-            max_segment_length,
-            densify_in_projection,
+    with MemoryStats(memory_stats) as memory, open_input(input_file_path) as src:
+        raw_geojson: RawGeojson | None = None
+        input_offsets: list[int] | None = None
+        geojson_obj: GeojsonObject
+        with memory.stage("read"):
+            if checkpoints:
+                geojson_obj, input_offsets = _text_to_geojson_with_offsets(src.read())
+            elif raw_passthrough:
+                geojson_obj, raw_geojson = text_to_geojson_raw(src.read())
+            else:
+                geojson_obj = textio_to_geojson(src)
+        config = get_densify_config(
+            geojson_obj, input_file_path, max_segment_length, densify_in_projection, src_crs, tolerance, dst_crs
         )
-        densify_geojson_object(config, geojson_obj)
+        _validate_max_output_vertices(config, geojson_obj, max_output_vertices)
+        stats = DenseStats()
+        if input_offsets is not None:
+            geojson_fc = cast(CrsFeatureCollection, geojson_obj)
+            validate_geom_type(geojson_fc, "densify")
+            for crs in (src_crs, dst_crs):
+                if crs is not None:
+                    geojson_fc.set_crs_auth_code(crs)
+            with (
+                memory.stage("densify"),
+                get_progress_reporter(progress, stats, geojson_obj, "densify"),
+                _get_executor(config, threads, processes) as executor,
+            ):
+                densify_with_checkpoints(
+                    config,
+                    geojson_fc,
+                    input_offsets,
+                    output_file_path,
+                    partial(_densify_batch, config, stats, threads, processes, feature_filter, executor),
+                    checkpoint_interval or CHECKPOINT_INTERVAL,
+                    resume,
+                    feature_filter,
+                )
+            _log_densify_stats(stats, feature_filter)
+            return
+        with memory.stage("densify"), get_progress_reporter(progress, stats, geojson_obj, "densify"):
+            # input object is only kept to detect changed geometries for raw passthrough
+            input_geojson_obj = geojson_obj if raw_geojson is not None else None
+            geojson_obj = densify_geojson_object(config, geojson_obj, stats, threads, processes, feature_filter)
+        _log_densify_stats(stats, feature_filter)
         if src_crs is not None and isinstance(geojson_obj, CrsFeatureCollection):
             geojson_obj.set_crs_auth_code(src_crs)
-        with open(output_file_path, "w") if output_file_path != "-" else sys.stdout as out_f:
-            geojson_obj_model: BaseModel = cast(BaseModel, geojson_obj)
+        if dst_crs is not None and isinstance(geojson_obj, CrsFeatureCollection):
+            geojson_obj.set_crs_auth_code(dst_crs)
+        with memory.stage("serialize"):
+            if raw_geojson is not None and input_geojson_obj is not None:
+                output = geojson_to_json_raw(raw_geojson, input_geojson_obj, geojson_obj, dst_crs is not None)
+            else:
+                geojson_obj_model: BaseModel = cast(BaseModel, geojson_obj)
+                output = geojson_obj_model.model_dump_json(indent=1, exclude_none=True)
+        with memory.stage("write"), open_output(output_file_path) as out_f:
+            out_f.write(output)
+
+
+def _densify_batch(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    stats: DenseStats,
+    threads: int | None,
+    processes: int | None,
+    feature_filter: FeatureFilter | None,
+    executor: Executor | None,
+    batch: CrsFeatureCollection,
+) -> CrsFeatureCollection:
+    """Densify batch of features of a run with checkpoints, with the worker pool of the run."""
+    return cast(
+        CrsFeatureCollection,
+        _densify_selected_features(densify_config, batch, feature_filter, stats, threads, processes, executor)
+        if feature_filter is not None
+        else _densify_geojson_object(densify_config, batch, stats, threads, processes, executor),
+    )
+
+
+def _get_executor(
+    densify_config: DenseConfig, threads: int | None, processes: int | None
+) -> AbstractContextManager[Executor | None]:
+    """Worker pool of a run that densifies in multiple calls, so worker threads or processes are started once per run instead of per call. None when densifying serially."""
+    if threads is not None and threads > 1:
+        return ThreadPoolExecutor(max_workers=threads, thread_name_prefix="geodense")
+    if processes is not None and processes > 1:
+        # imported here, since geodense.multiprocess builds on the functions of this module
+        from geodense.multiprocess import get_process_pool
+
+        return get_process_pool(densify_config, processes)
+    return nullcontext(None)
 
-            out_f.write(geojson_obj_model.model_dump_json(indent=1, exclude_none=True))
+
+def _validate_densify_mode_args(
+    output_file_path: str, raw_passthrough: bool, feature_filter: FeatureFilter | None, checkpoints: bool
+) -> None:
+    if raw_passthrough and (
+        (feature_filter is not None and (len(feature_filter.where) > 0 or feature_filter.drop_unselected))
+        or checkpoints
+    ):
+        raise GeodenseError("raw_passthrough cannot be combined with where, drop_unselected or checkpoints")
+    if checkpoints and (output_file_path == "-" or get_compression(output_file_path) is not None):
+        raise GeodenseError("checkpoints require an uncompressed output file")
+
+
+def _validate_max_output_vertices(
+    densify_config: DenseConfig, geojson_obj: GeojsonObject, max_output_vertices: int | None
+) -> None:
+    if max_output_vertices is None:
+        return
+    estimate = estimate_densify_geojson_object(densify_config, geojson_obj, measure_runtime=False)
+    if estimate.output_vertices > max_output_vertices:
+        raise GeodenseError(
+            f"estimated nr of output vertices {estimate.output_vertices} exceeds max_output_vertices {max_output_vertices}, increase max_segment_length or max_output_vertices"
+        )
+
+
+def _log_densify_stats(stats: DenseStats, feature_filter: FeatureFilter | None) -> None:
+    logger.info(stats.prefilter_message())
+    if feature_filter is not None:
+        logger.info(stats.filter_message())
+    if stats.work_units > 0:
+        logger.info(stats.balance_message())
+
+
+def _get_feature_filter(
+    where: list[str] | None, bbox: tuple[float, float, float, float] | None, drop_unselected: bool = False
+) -> FeatureFilter | None:
+    if where is None and bbox is None:
+        if drop_unselected:
+            raise GeodenseError("drop_unselected requires where or bbox")
+        return None
+    return FeatureFilter(where, bbox, drop_unselected)
+
+
+def get_densify_config(  # noqa: PLR0913
+    geojson_obj: GeojsonObject,
+    input_file_path: str,
+    max_segment_length: float | None,
+    densify_in_projection: bool,
+    src_crs: str | None,
+    tolerance: float | None,
+    dst_crs: str | None,
+) -> DenseConfig:
+    """DenseConfig for geojson_obj read from input_file_path, src_crs overrides the crs of geojson_obj."""
+    has_3d_coords: Has3D = _has_3d_coordinates(geojson_obj)
+    geojson_src_crs = _get_crs_geojson(geojson_obj, input_file_path, src_crs, has_3d_coords)
+    return DenseConfig(
+        CRS.from_authority(*geojson_src_crs.split(":")),
+        max_segment_length,
+        densify_in_projection,
+        tolerance,
+        CRS.from_authority(*dst_crs.split(":")) if dst_crs is not None else None,
+    )
+
+
+def estimate_densify_file(  # noqa: PLR0913
+    input_file_path: str,
+    max_segment_length: float | None = None,
+    densify_in_projection: bool = False,
+    src_crs: str | None = None,
+    tolerance: float | None = None,
+    dst_crs: str | None = None,
+    threads: int | None = None,
+    raw_passthrough: bool = False,
+    where: list[str] | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+    drop_unselected: bool = False,
+) -> DenseEstimate:
+    """Estimate nr of output vertices, output size and runtime of densify_file for input_file_path, without densifying it.
+
+    See estimate_densify_geojson_object, arguments are the same as for densify_file. Adaptive densification (tolerance)
+    cannot be estimated.
+    """
+    feature_filter = _get_feature_filter(where, bbox, drop_unselected)
+    src: TextIO
+    with open_input(input_file_path) as src:
+        geojson_obj = textio_to_geojson(src)
+    config = get_densify_config(
+        geojson_obj, input_file_path, max_segment_length, densify_in_projection, src_crs, tolerance, dst_crs
+    )
+    return estimate_densify_geojson_object(
+        config, geojson_obj, threads, indent=None if raw_passthrough else 1, feature_filter=feature_filter
+    )
+
+
+def estimate_densify_geojson_object(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    threads: int | None = None,
+    indent: int | None = 1,
+    measure_runtime: bool = True,
+    feature_filter: FeatureFilter | None = None,
+) -> DenseEstimate:
+    """Estimate nr of output vertices, output size and runtime of densify_geojson_object, without densifying geojson_obj.
+
+    The nr of vertices added per line segment is computed with get_intermediate_nr_points_and_segment_length from the
+    length of the line segment, the lengths of all line segments of a linestring are computed in a single pyproj call.
+    The output size is the nr of output vertices times the size of a serialized vertex (with indent), so it only
+    covers the coordinates. The runtime of densification is extrapolated from the throughput of densifying the first
+    linestrings (up to ESTIMATE_SAMPLE_VERTICES output vertices), assuming perfect scaling over threads. Reading and
+    writing files is not included. With feature_filter, only selected features are densified, unselected features are
+    passed through unchanged or, with drop_unselected, dropped (as in densify_geojson_object).
+    """
+    if densify_config.tolerance is not None:
+        raise GeodenseError("cannot estimate output of adaptive densification, tolerance must be None")
+    input_vertices = 0
+    added_vertices = 0
+    sample: list[tuple[LineStringCoords, int]] = []  # linestrings and their last vertex to measure throughput
+    sample_vertices = 0
+    for linestring, is_selected in _get_output_linestrings(geojson_obj, feature_filter):
+        input_vertices += len(linestring)
+        if not is_selected:
+            continue
+        for i, nr_points in enumerate(_get_nr_points_per_segment(densify_config, linestring)):
+            added_vertices += nr_points
+            if measure_runtime and sample_vertices < ESTIMATE_SAMPLE_VERTICES:
+                sample_vertices += nr_points + 1
+                if i == 0:
+                    sample.append((linestring, 1))
+                else:
+                    sample[-1] = (linestring, i + 1)
+    output_vertices = input_vertices + added_vertices
+    seconds: float | None = None
+    if measure_runtime:
+        seconds = _measure_densify_seconds_per_vertex(densify_config, sample, sample_vertices) * output_vertices
+        seconds /= max(threads or 1, 1)
+    bytes_per_vertex = _get_bytes_per_vertex(densify_config, geojson_obj, indent)
+    return DenseEstimate(input_vertices, output_vertices, output_vertices * bytes_per_vertex, seconds)
+
+
+def _get_output_linestrings(
+    geojson_obj: GeojsonObject, feature_filter: FeatureFilter | None
+) -> Iterator[tuple[LineStringCoords, bool]]:
+    """Linestrings in output of densify_geojson_object for geojson_obj, with whether their feature is selected by feature_filter (and so densified)."""
+    features = _get_features(geojson_obj)
+    selected = _get_selected_features(feature_filter, features, None) if feature_filter is not None else None
+    drop_unselected = (
+        feature_filter is not None and feature_filter.drop_unselected and not isinstance(geojson_obj, Feature)
+    )
+    for feature_index, feature in enumerate(features):
+        is_selected = selected is None or selected[feature_index]
+        if is_selected or not drop_unselected:
+            for geometry in _get_geometries(feature.geometry if isinstance(feature, Feature) else feature):
+                for linestring in _get_linestrings(geometry.coordinates):
+                    yield linestring, is_selected
+
+
+def _get_nr_points_per_segment(densify_config: DenseConfig, linestring: LineStringCoords) -> list[int]:
+    """Nr of intermediate points densification adds per line segment of linestring, computed in bulk from the line segment lengths."""
+    if len(linestring) < 2:  # noqa: PLR2004
+        return []
+    xs = array("d", [p[0] for p in linestring])
+    ys = array("d", [p[1] for p in linestring])
+    kernel = densify_config.kernel
+    if kernel.in_projection:
+        lengths: Iterable[float] = map(math.hypot, (b - a for a, b in pairwise(xs)), (b - a for a, b in pairwise(ys)))
+    else:
+        if kernel.transformer is not None:
+            kernel.transformer.transform(xs, ys, inplace=True)
+        _, _, lengths = kernel.geod.inv(xs[:-1], ys[:-1], xs[1:], ys[1:], return_back_azimuth=True)
+    max_segment_length = kernel.max_segment_length
+    return [
+        get_intermediate_nr_points_and_segment_length(length, max_segment_length)[0]
+        if length > max_segment_length
+        else 0
+        for length in lengths
+    ]
+
+
+def _measure_densify_seconds_per_vertex(
+    densify_config: DenseConfig, sample: list[tuple[LineStringCoords, int]], sample_vertices: int
+) -> float:
+    if sample_vertices == 0:
+        return 0.0
+    start_time = time.perf_counter()
+    for linestring, end in sample:
+        # densify_geojson_object densifies a deep copy of its input, so copying is part of the measured work
+        densify_vertex_range(densify_config, deepcopy(linestring[0 : end + 1]), 0, end)
+    return (time.perf_counter() - start_time) / sample_vertices
+
+
+def _get_bytes_per_vertex(densify_config: DenseConfig, geojson_obj: GeojsonObject, indent: int | None) -> int:
+    """Size of a serialized vertex in a linestring of a feature collection, based on the first vertex of geojson_obj."""
+    linestrings = (
+        linestring
+        for feature in _get_features(geojson_obj)
+        for geometry in _get_geometries(feature.geometry if isinstance(feature, Feature) else feature)
+        for linestring in _get_linestrings(geometry.coordinates)
+    )
+    first_linestring = next(linestrings, None)
+    if first_linestring is None or len(first_linestring) == 0:
+        return 0
+    vertex = _round_coordinates(first_linestring[0], densify_config.get_coord_precision())
+    if densify_config.dst_crs is not None:
+        vertex = _reproject_positions(densify_config, [vertex])[0]
+
+    def _serialized_size(nr_vertices: int) -> int:
+        feature: Feature = Feature(
+            type="Feature", properties={}, geometry=LineString(type="LineString", coordinates=[vertex] * nr_vertices)
+        )
+        fc = CrsFeatureCollection(type="FeatureCollection", features=[feature])
+        return len(fc.model_dump_json(indent=indent, exclude_none=True).encode("utf-8"))
+
+    return _serialized_size(3) - _serialized_size(2)
 
 
 def transform_linestrings_in_coordinates(
@@ -368,23 +1774,79 @@ def transform_geojson_geometries(
 
 def interpolate_geodesic(a: Position, b: Position, densify_config: DenseConfig) -> LineStringCoords:
     """geodesic interpolate intermediate points between points a and b, with segment_length < max_segment_length. Only returns intermediate points."""
+    return _interpolate_geodesic(a, b, densify_config.kernel)
 
-    three_dimensional_points = len(a) == THREE_DIMENSIONAL and len(b) == THREE_DIMENSIONAL
+
+def _interpolate_geodesic(a: Position, b: Position, kernel: DenseKernel) -> LineStringCoords:
+    segment = _get_geodesic_segment(a, b, kernel)
+    if segment is None:
+        return []
+    a_t, az12, nr_points, del_s, _ = segment
+    r = kernel.geod.fwd_intermediate(
+        *a_t,
+        az12,
+        npts=nr_points,
+        del_s=del_s,
+        return_back_azimuth=True,
+    )
+    lons, lats = r.lons, r.lats
+    if kernel.back_transformer is not None:  # src_crs is projected
+        # technically a back conversion and not a transformation, since crs->base crs is (mostly) a conversion
+        lons, lats = kernel.back_transformer.transform(lons, lats)
+    return _geodesic_positions(a, b, lons, lats, segment)
+
+
+def get_geodesic_inverses(densify_config: DenseConfig, linestring: LineStringCoords) -> list[GeodesicInverse | None]:
+    """Inverse geodesics of the line segments of linestring, None for a line segment that cannot exceed the max_segment_length of densify_config.
+
+    The result can be passed to densify_vertex_range for any max_segment_length greater than or equal to the
+    max_segment_length of densify_config, so the inverse geodesics can be shared between max segment lengths.
+    """
+    kernel = densify_config.kernel
+    rounded = [_round_coordinates(x, kernel.precision) for x in linestring]
+    return _get_geodesic_inverses(linestring, rounded, 0, kernel)
+
+
+def _get_geodesic_inverses(
+    linestring: LineStringCoords, rounded: list[Position], start: int, kernel: DenseKernel
+) -> list[GeodesicInverse | None]:
+    """Inverse geodesics of line segments start up to start + len(rounded) - 1 of linestring, see _get_geodesic_inverse. The start point of a line segment is the rounded end point of the previous line segment."""
+    return [
+        _get_geodesic_inverse(linestring[0] if i == 0 else rounded[i - start], linestring[i + 1], kernel)
+        for i in range(start, start + len(rounded) - 1)
+    ]
+
+
+def _get_geodesic_segment(
+    a: Position, b: Position, kernel: DenseKernel
+) -> tuple[tuple[float, float], float, int, float, float] | None:
+    """Start point in base geographic crs, azimuth, nr of intermediate points, distance between intermediate points and geodesic distance of line segment a-b. None when line segment does not exceed max_segment_length."""
+    return _get_geodesic_segment_from_inverse(_get_geodesic_inverse(a, b, kernel), kernel.max_segment_length)
+
+
+def _get_geodesic_segment_from_inverse(
+    inverse: GeodesicInverse | None, max_segment_length: float
+) -> tuple[tuple[float, float], float, int, float, float] | None:
+    if inverse is None:
+        return None
+    a_t, az12, geod_dist = inverse
+    if geod_dist <= max_segment_length:
+        return None
+    nr_points, new_max_segment_length = get_intermediate_nr_points_and_segment_length(geod_dist, max_segment_length)
+    return a_t, az12, nr_points, new_max_segment_length, geod_dist
+
+
+def _get_geodesic_inverse(a: Position, b: Position, kernel: DenseKernel) -> GeodesicInverse | None:
+    """Start point in base geographic crs, azimuth and geodesic distance of line segment a-b. None when line segment cannot exceed max_segment_length, by upper bound of its geodesic distance."""
     a_2d = Position2D(longitude=a.longitude, latitude=a.latitude)
     b_2d = Position2D(longitude=b.longitude, latitude=b.latitude)
 
-    transformer = densify_config.transformer
-
-    if densify_config.src_crs.is_projected:  # only convert to basegeographic crs if src_proj is projected
-        if transformer is None:
-            raise GeodenseError("transformer cannot be None when src_crs.is_projected=True")
-        # technically the following transform call is a converion and not a transformation, since crs->base-crs will be a conversion in most cases
-        a_t: tuple[float, float] = transformer.transform(*a_2d)
-        b_t: tuple[float, float] = transformer.transform(*b_2d)
-    else:  # src_crs is geographic do not transform
-        a_t, b_t = (a_2d, b_2d)
+    # technically converting to the base geographic crs is a converion and not a transformation, since crs->base-crs will be a conversion in most cases
+    a_t, b_t = _to_base_geographic(a_2d, b_2d, kernel)
 
-    g = densify_config.geod
+    g = kernel.geod
+    if _geodesic_distance_upper_bound(a_t, b_t, g) <= kernel.max_segment_length:
+        return None  # segment cannot exceed max_segment_length, skip exact geodesic calculation
 
     az12, _, geod_dist = g.inv(*a_t, *b_t, return_back_azimuth=True)
     if math.isnan(geod_dist):
@@ -392,67 +1854,325 @@ def interpolate_geodesic(a: Position, b: Position, densify_config: DenseConfig)
             f"unable to calculate geodesic distance, output calculation geodesic distance: {geod_dist}, expected: floating-point number"
         )
 
-    if geod_dist <= densify_config.max_segment_length:
-        return []
-    else:
-        (
-            nr_points,
-            new_max_segment_length,
-        ) = _get_intermediate_nr_points_and_segment_length(geod_dist, densify_config.max_segment_length)
-        r = g.fwd_intermediate(
-            *a_t,
-            az12,
-            npts=nr_points,
-            del_s=new_max_segment_length,
-            return_back_azimuth=True,
+    return (a_t[0], a_t[1]), az12, geod_dist
+
+
+def _geodesic_positions(
+    a: Position,
+    b: Position,
+    lons: Sequence[float],
+    lats: Sequence[float],
+    segment: tuple[tuple[float, float], float, int, float, float],
+) -> list[Position]:
+    if len(a) == THREE_DIMENSIONAL and len(b) == THREE_DIMENSIONAL:
+        # interpolate height for three_dimensional_points
+        _, _, _, del_s, geod_dist = segment
+        height_a = cast(Position3D, a).altitude
+        height_b = cast(Position3D, b).altitude
+        delta_height_per_point = (height_b - height_a) * (del_s / geod_dist)
+        return [
+            Position3D(
+                longitude=lon,
+                latitude=lat,
+                altitude=round(height_a + ((i + 1) * delta_height_per_point), DEFAULT_PRECISION_METERS),
+            )
+            for i, (lon, lat) in enumerate(zip(lons, lats, strict=True))
+        ]
+    return [Position2D(longitude=lon, latitude=lat) for lon, lat in zip(lons, lats, strict=True)]
+
+
+def interpolate_geodesic_adaptive(a: Position, b: Position, densify_config: DenseConfig) -> LineStringCoords:
+    """geodesic interpolate intermediate points between points a and b, until the deviation between the geodesic and the straight line segment in the source CRS is below tolerance. Only returns intermediate points.
+
+    The geodesic is bisected recursively, a midpoint is only added when it deviates more than densify_config.tolerance meters from the chord between its neighbouring points.
+    """
+    return _interpolate_geodesic_adaptive(a, b, densify_config.kernel)
+
+
+def _interpolate_geodesic_adaptive(a: Position, b: Position, kernel: DenseKernel) -> LineStringCoords:
+    if kernel.tolerance is None:
+        raise GeodenseError("tolerance cannot be None for adaptive densification")
+    tolerance: float = kernel.tolerance
+
+    three_dimensional_points = len(a) == THREE_DIMENSIONAL and len(b) == THREE_DIMENSIONAL
+    a_2d = Position2D(longitude=a.longitude, latitude=a.latitude)
+    b_2d = Position2D(longitude=b.longitude, latitude=b.latitude)
+    a_t, b_t = _to_base_geographic(a_2d, b_2d, kernel)
+
+    g = kernel.geod
+    az12, _, geod_dist = g.inv(*a_t, *b_t, return_back_azimuth=True)
+    if math.isnan(geod_dist):
+        raise GeodenseError(
+            f"unable to calculate geodesic distance, output calculation geodesic distance: {geod_dist}, expected: floating-point number"
         )
 
-        def optional_back_transform(lon: float, lat: float) -> Position2D:
-            """technically should be named optional_back_convert, since crs->base crs is (mostly) a conversion and not a transformation"""
-            if densify_config.src_crs.is_projected:
-                if densify_config.back_transformer is None:
-                    raise GeodenseError("back_transformer cannot be None when src_crs.is_projected=True")
-                _result = densify_config.back_transformer.transform(lon, lat)
-                return Position2D(longitude=_result[0], latitude=_result[1])
-            return Position2D(longitude=lon, latitude=lat)
-
-        if three_dimensional_points:
-            # interpolate height for three_dimensional_points
-            a_3d = cast(Position3D, a)
-            b_3d = cast(Position3D, b)
-            height_a = a_3d[2:][0]
-            height_b = b_3d[2:][0]
-            delta_height_b_a = height_b - height_a
-            delta_height_per_point = delta_height_b_a * (new_max_segment_length / geod_dist)
-            return [
-                Position3D(
-                    *optional_back_transform(lon, lat),
-                    altitude=round(
-                        (height_a + ((i + 1) * delta_height_per_point)),
-                        DEFAULT_PRECISION_METERS,
-                    ),
-                )
-                for i, (lon, lat) in enumerate(zip(r.lons, r.lats, strict=True))
-            ]
-        else:
-            return [optional_back_transform(lon, lat) for lon, lat in zip(r.lons, r.lats, strict=True)]
+    def point_at(fraction: float) -> Position2D:
+        lon, lat, _ = g.fwd(*a_t, az12, geod_dist * fraction, return_back_azimuth=True)
+        return _from_base_geographic(lon, lat, kernel)
+
+    fractions: list[float] = []
+    points: list[Position2D] = []
+
+    def bisect(f_a: float, p_a: Position2D, f_b: float, p_b: Position2D, depth: int) -> None:
+        f_mid = (f_a + f_b) / 2
+        p_mid = point_at(f_mid)
+        if depth >= MAX_ADAPTIVE_DEPTH or _deviation_from_chord(p_mid, p_a, p_b, kernel) <= tolerance:
+            return
+        bisect(f_a, p_a, f_mid, p_mid, depth + 1)
+        fractions.append(f_mid)
+        points.append(p_mid)
+        bisect(f_mid, p_mid, f_b, p_b, depth + 1)
+
+    bisect(0.0, a_2d, 1.0, b_2d, 0)
+
+    if three_dimensional_points:
+        # interpolate height for three_dimensional_points
+        height_a = cast(Position3D, a).altitude
+        height_b = cast(Position3D, b).altitude
+        return [
+            Position3D(
+                *p,
+                altitude=round(height_a + f * (height_b - height_a), DEFAULT_PRECISION_METERS),
+            )
+            for f, p in zip(fractions, points, strict=True)
+        ]
+    return cast(LineStringCoords, points)
+
+
+def _to_base_geographic(
+    a: Position2D, b: Position2D, kernel: DenseKernel
+) -> tuple[tuple[float, float], tuple[float, float]]:
+    transformer = kernel.transformer
+    if transformer is not None:  # only convert to basegeographic crs if src_proj is projected
+        return transformer.transform(*a), transformer.transform(*b)
+    return (a, b)  # src_crs is geographic do not transform
+
+
+def _from_base_geographic(lon: float, lat: float, kernel: DenseKernel) -> Position2D:
+    if kernel.back_transformer is not None:  # src_crs is projected
+        lon, lat = kernel.back_transformer.transform(lon, lat)
+    return Position2D(longitude=lon, latitude=lat)
+
+
+def _geodesic_distance_upper_bound(a: Sequence[float], b: Sequence[float], geod: Geod) -> float:
+    """Cheap conservative upper bound in meters of the geodesic distance between lon/lat points a and b.
+
+    The geodesic is the shortest path on the ellipsoid, so the length of any other path between a and b is an upper
+    bound. Used path: along a meridian between the latitudes of a and b, and along the parallel of whichever of a and b
+    is closest to a pole. Meridian length is bounded by the max meridional radius of curvature (at the poles), parallel
+    length is exact.
+    """
+    d_lat = abs(b[1] - a[1])
+    d_lon = abs(b[0] - a[0]) % 360
+    d_lon = min(d_lon, 360 - d_lon)
+    lat = max(a[1], b[1], key=abs)
+    upper_bound = _max_meridional_radius(geod) * math.radians(d_lat) + _parallel_radius(lat, geod) * math.radians(d_lon)
+    return upper_bound * (1 + 1e-9)  # margin for floating point rounding
 
 
-def _cartesian_distance(a: Position, b: Position) -> float:
+def _max_meridional_radius(geod: Geod) -> float:
+    """Meridional radius of curvature at the poles, which is the max over all latitudes."""
+    return cast(float, geod.a / math.sqrt(1 - geod.es))
+
+
+def _parallel_radius(lat: float, geod: Geod) -> float:
+    sin_lat = math.sin(math.radians(lat))
+    return cast(float, geod.a * abs(math.cos(math.radians(lat))) / math.sqrt(1 - geod.es * sin_lat * sin_lat))
+
+
+def _get_min_scale_factor(densify_config: DenseConfig, bbox: tuple[float, float, float, float]) -> float | None:
+    """Estimate of the min scale factor of the projection of src_crs within bbox (in src_crs coordinates).
+
+    Scale factors (minor axis of the Tissot indicatrix) are sampled on a grid over bbox, the max difference between
+    neighbouring samples is subtracted from the smallest sample to account for variation in between samples. Sampling
+    can miss a local minimum, so the estimate is a heuristic rather than a guaranteed lower bound; it is multiplied by
+    SCALE_FACTOR_SAFETY_FACTOR to leave room for such estimation errors. Returns None when no (valid) estimate can be
+    determined.
+    """
+    if densify_config.transformer is None or densify_config.src_crs.axis_info[0].unit_name != "metre":
+        return None
+    n = SCALE_FACTOR_GRID_SIZE
+    x_min, y_min, x_max, y_max = bbox
+    xs = [x_min + (x_max - x_min) * i / (n - 1) for i in range(n)]
+    ys = [y_min + (y_max - y_min) * i / (n - 1) for i in range(n)]
+    lons, lats = densify_config.transformer.transform([x for _ in ys for x in xs], [y for y in ys for _ in xs])
+    try:
+        factors = Proj(densify_config.src_crs).get_factors(lons, lats)
+        scale_factors = list(cast(Iterable[float], factors.tissot_semiminor))
+    except (ProjError, CRSError) as e:
+        logger.debug("unable to determine scale factors of %s: %s", densify_config.src_crs.name, e)
+        return None
+    if not all(math.isfinite(k) for k in scale_factors):
+        return None
+    margin = max(
+        [abs(scale_factors[i] - scale_factors[i + 1]) for i in range(len(scale_factors) - 1) if (i + 1) % n != 0]
+        + [abs(scale_factors[i] - scale_factors[i + n]) for i in range(len(scale_factors) - n)]
+    )
+    min_scale_factor = (min(scale_factors) - margin) * SCALE_FACTOR_SAFETY_FACTOR
+    return min_scale_factor if min_scale_factor > 0 else None
+
+
+def get_min_scale_factor_geojson(densify_config: DenseConfig, geojson_obj: GeojsonObject) -> float | None:
+    """Estimated min scale factor of the projection of src_crs within the bbox of geojson_obj, see get_min_scale_factor_bbox."""
+    if not densify_config.src_crs.is_projected or densify_config.in_projection:
+        return None
+    return get_min_scale_factor_bbox(densify_config, _get_bbox(geojson_obj))
+
+
+def get_min_scale_factor_bbox(
+    densify_config: DenseConfig, bbox: tuple[float, float, float, float] | None
+) -> float | None:
+    """Estimated min scale factor of the projection of src_crs within bbox, None when not applicable (see _get_min_scale_factor)."""
+    if not densify_config.src_crs.is_projected or densify_config.in_projection or bbox is None:
+        return None
+    return _get_min_scale_factor(densify_config, bbox)
+
+
+def _skip_by_bbox_prefilter(
+    densify_config: DenseConfig,
+    geometry: GeojsonGeomNoGeomCollection,
+    min_scale_factor: float | None,
+    stats: DenseStats | None,
+) -> bool:
+    """Whether geometry can be skipped, since its bbox is too small to contain line segments exceeding max_segment_length."""
+    if isinstance(geometry, Point | MultiPoint):
+        return False
+    bbox = _get_geometry_bbox(geometry)
+    skip = bbox is not None and not bbox_may_exceed_max_segment_length(densify_config, bbox, min_scale_factor)
+    if stats is not None:
+        stats.increment("geometries")
+        stats.increment("skipped_geometries", skip)
+    return skip
+
+
+def _skip_linestring_by_bbox_prefilter(
+    densify_config: DenseConfig,
+    linestring: LineStringCoords,
+    min_scale_factor: float | None,
+    stats: DenseStats | None,
+) -> bool:
+    bbox = _get_positions_bbox(linestring)
+    skip = bbox is not None and not bbox_may_exceed_max_segment_length(densify_config, bbox, min_scale_factor)
+    if stats is not None:
+        stats.increment("linestrings")
+        stats.increment("skipped_linestrings", skip)
+    return skip
+
+
+def bbox_may_exceed_max_segment_length(
+    densify_config: DenseConfig, bbox: tuple[float, float, float, float], min_scale_factor: float | None
+) -> bool:
+    """Whether a line segment with both vertices in bbox can be longer than max_segment_length.
+
+    Always True for adaptive densification (tolerance is set), since then vertices are not added based on segment length.
+    """
+    kernel = densify_config.kernel
+    if kernel.tolerance is not None:
+        return True
+    x_min, y_min, x_max, y_max = bbox
+    if kernel.in_projection:
+        return cartesian_distance((x_min, y_min), (x_max, y_max)) > kernel.max_segment_length
+    if kernel.is_projected:
+        if min_scale_factor is None:
+            return True
+        diagonal = cartesian_distance((x_min, y_min), (x_max, y_max))
+        return diagonal / min_scale_factor > kernel.max_segment_length
+    # geographic crs, bound with the parallel closest to the equator, as that is the longest parallel within bbox
+    d_lon = x_max - x_min
+    if d_lon >= 180:  # noqa: PLR2004
+        return True
+    lat = 0.0 if y_min <= 0 <= y_max else min(y_min, y_max, key=abs)
+    g = kernel.geod
+    upper_bound = _max_meridional_radius(g) * math.radians(y_max - y_min) + _parallel_radius(lat, g) * math.radians(
+        d_lon
+    )
+    return upper_bound * (1 + 1e-9) > kernel.max_segment_length
+
+
+def _get_bbox(geojson_obj: GeojsonObject) -> tuple[float, float, float, float] | None:
+    """Bounding box (x_min, y_min, x_max, y_max) of all positions in geojson_obj, None when it contains no positions."""
+    bboxes: Nested[tuple[float, float, float, float] | None] | tuple[float, float, float, float] | None = (
+        transform_geojson_geometries(geojson_obj, _get_geometry_bbox)
+    )
+    bboxes_flat = [bboxes] if isinstance(bboxes, tuple) else list(filter(None, _flatten([bboxes])))
+    if len(bboxes_flat) == 0:
+        return None
+    return (
+        min(x[0] for x in bboxes_flat),
+        min(x[1] for x in bboxes_flat),
+        max(x[2] for x in bboxes_flat),
+        max(x[3] for x in bboxes_flat),
+    )
+
+
+def _get_geometry_bbox(geometry: GeojsonGeomNoGeomCollection) -> tuple[float, float, float, float] | None:
+    positions: Nested[Position] | Position = _transform_positions_in_coordinates(geometry.coordinates, lambda x: x)
+    positions_flat = [positions] if isinstance(positions, tuple) else list(_flatten(positions))
+    return _get_positions_bbox(positions_flat)
+
+
+def _get_positions_bbox(positions_flat: Sequence[Sequence[float]]) -> tuple[float, float, float, float] | None:
+    if len(positions_flat) == 0:
+        return None
+    return (
+        min(p[0] for p in positions_flat),
+        min(p[1] for p in positions_flat),
+        max(p[0] for p in positions_flat),
+        max(p[1] for p in positions_flat),
+    )
+
+
+def _deviation_from_chord(p: Position2D, a: Position2D, b: Position2D, kernel: DenseKernel) -> float:
+    """Deviation in meters of point p from the straight line segment a-b in the source CRS, the distance of p to the closest point of the line segment.
+
+    With a projected CRS this is the perpendicular distance in the projection. With a geographic CRS the line segment
+    is straight in lon/lat, the closest point is determined with longitudes scaled by the cosine of the latitude of p
+    (locally equidistant around p), the deviation is the geodesic distance between p and that point.
+    """
+    if kernel.is_projected:
+        return _cartesian_distance_to_line(p, a, b)
+    scale = math.cos(math.radians(p.latitude))
+    d_lon, d_lat = b.longitude - a.longitude, b.latitude - a.latitude
+    length_sq = (d_lon * scale) ** 2 + d_lat**2
+    t = (
+        0.0
+        if length_sq == 0
+        else ((p.longitude - a.longitude) * scale * scale * d_lon + (p.latitude - a.latitude) * d_lat) / length_sq
+    )
+    t = min(1.0, max(0.0, t))
+    _, _, dist = kernel.geod.inv(
+        p.longitude, p.latitude, a.longitude + t * d_lon, a.latitude + t * d_lat, return_back_azimuth=True
+    )
+    return cast(float, dist)
+
+
+def _cartesian_distance_to_line(p: Position, a: Position, b: Position) -> float:
+    """Perpendicular distance of point p to line through a and b."""
+    segment_length = cartesian_distance(a, b)
+    if segment_length == 0:
+        return cartesian_distance(p, a)
+    return abs((b[0] - a[0]) * (a[1] - p[1]) - (a[0] - p[0]) * (b[1] - a[1])) / segment_length
+
+
+def cartesian_distance(a: Sequence[float], b: Sequence[float]) -> float:
+    """Planar distance between the x and y of a and b."""
     return math.sqrt((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2)  # pythagoras
 
 
 def interpolate_src_proj(a: Position, b: Position, densify_config: DenseConfig) -> LineStringCoords:
     """Interpolate intermediate points between points a and b, with segment_length < max_segment_length. Only returns intermediate points."""
+    return _interpolate_src_proj(a, b, densify_config.kernel)
+
 
+def _interpolate_src_proj(a: Position, b: Position, kernel: DenseKernel) -> LineStringCoords:
     all_three_dimensional = len(a) == THREE_DIMENSIONAL and len(b) == THREE_DIMENSIONAL
     # when mixed 2D/3D reduce to 2D, shapely cannot do interpolation on points with mixed dimensionality
     if not all_three_dimensional:
         a = Position2D(longitude=a.longitude, latitude=a.latitude)
         b = Position2D(longitude=b.longitude, latitude=b.latitude)
 
-    dist = _cartesian_distance(a, b)
-    if dist <= densify_config.max_segment_length:
+    dist = cartesian_distance(a, b)
+    if dist <= kernel.max_segment_length:
         return []
     else:
         new_points: list[Position] = []
@@ -460,10 +2180,11 @@ def interpolate_src_proj(a: Position, b: Position, densify_config: DenseConfig)
         (
             nr_points,
             new_max_segment_length,
-        ) = _get_intermediate_nr_points_and_segment_length(dist, densify_config.max_segment_length)
+        ) = get_intermediate_nr_points_and_segment_length(dist, kernel.max_segment_length)
 
+        line = ShpLineString([a, b])
         for i in range(0, nr_points):
-            p_point: ShpPoint = ShpLineString([a, b]).interpolate(new_max_segment_length * (i + 1))
+            p_point: ShpPoint = line.interpolate(new_max_segment_length * (i + 1))
             p_2d = Position2D(longitude=p_point.coords[0][0], latitude=p_point.coords[0][1])
             if len(p_point.coords[0]) == THREE_DIMENSIONAL:
                 p: Position = Position3D(*p_2d, altitude=p_point.coords[0][2])  # type: ignore
@@ -477,6 +2198,11 @@ def interpolate_src_proj(a: Position, b: Position, densify_config: DenseConfig)
 
 def textio_to_geojson(src: TextIO) -> GeojsonObject:
     src_json = json.loads(src.read())
+    return dict_to_geojson(src_json)
+
+
+def dict_to_geojson(src_json: dict) -> GeojsonObject:
+    """Parse decoded GeoJSON (dict) into the GeojsonObject model of its type, raises GeodenseError for unsupported types."""
     type_map = {
         "Feature": Feature,
         "GeometryCollection": GeometryCollection,
@@ -498,6 +2224,233 @@ def textio_to_geojson(src: TextIO) -> GeojsonObject:
     return geojson_obj
 
 
+def text_to_geojson_raw(text: str) -> tuple[GeojsonObject, RawGeojson | None]:
+    """Parse GeoJSON text, keeping the raw text of the members of a FeatureCollection, its features or a Feature.
+
+    Properties of features are not parsed into the returned GeojsonObject (properties are None), their raw text is
+    kept in the returned RawGeojson instead, so they can be written verbatim with geojson_to_json_raw. Returns
+    RawGeojson None for other GeoJSON types.
+    """
+    try:
+        decoded, members, features, raw_features = _scan_geojson_raw(text)
+    except (json.JSONDecodeError, IndexError) as e:
+        raise GeodenseError(f"received invalid GeoJSON file, {e}") from e
+
+    if decoded.get("type") == "FeatureCollection":
+        return dict_to_geojson({**decoded, "features": features}), RawGeojson(text, members, raw_features)
+    if decoded.get("type") == "Feature":
+        return dict_to_geojson({**decoded, "properties": None}), RawGeojson(text, members, None)
+    return dict_to_geojson(decoded), None
+
+
+def _text_to_geojson_with_offsets(text: str) -> tuple[CrsFeatureCollection, list[int]]:
+    """Parse GeoJSON FeatureCollection text, returns the FeatureCollection and per feature the UTF-8 byte offset in text of the end of the feature."""
+    decoded: dict[str, Any] = {}
+    features: list[dict[str, Any]] = []
+    ends: list[int] = []
+
+    def _scan_feature(start: int) -> int:
+        feature, end = _JSON_DECODER.raw_decode(text, start)
+        features.append(feature)
+        ends.append(end)
+        return end
+
+    def _scan_member(key: str, start: int) -> int:
+        if key == "features":
+            return _scan_json_array(text, start, _scan_feature)
+        value, end = _JSON_DECODER.raw_decode(text, start)
+        decoded[key] = value
+        return end
+
+    try:
+        _, end = _scan_json_object(text, _skip_json_whitespace(text, 0), _scan_member)
+        if _skip_json_whitespace(text, end) != len(text):
+            raise json.JSONDecodeError("Extra data", text, end)
+    except (json.JSONDecodeError, IndexError) as e:
+        raise GeodenseError(f"received invalid GeoJSON file, {e}") from e
+    if decoded.get("type") != "FeatureCollection":
+        raise GeodenseError("checkpoints require GeoJSON FeatureCollection input")
+
+    offsets: list[int] = []
+    offset = 0
+    previous_end = 0
+    for end in ends:
+        offset += len(text[previous_end:end].encode("utf-8"))
+        offsets.append(offset)
+        previous_end = end
+    return cast(CrsFeatureCollection, dict_to_geojson({**decoded, "features": features})), offsets
+
+
+def _scan_geojson_raw(
+    text: str,
+) -> tuple[dict[str, Any], list[RawMember], list[dict[str, Any]], list[list[RawMember]]]:
+    """Scan GeoJSON text, returns decoded members (except properties and features), raw members, decoded features (type and geometry only) and raw members of features."""
+    decoded: dict[str, Any] = {}
+    features: list[dict[str, Any]] = []
+    raw_features: list[list[RawMember]] = []
+
+    def _scan_feature_member(feature: dict[str, Any], key: str, start: int) -> int:
+        value, end = _JSON_DECODER.raw_decode(text, start)
+        if key in ("type", "geometry"):  # other members of feature are only kept as raw text
+            feature[key] = value
+        return end
+
+    def _scan_feature(start: int) -> int:
+        feature: dict[str, Any] = {"properties": None}
+        members, end = _scan_json_object(text, start, partial(_scan_feature_member, feature))
+        features.append(feature)
+        raw_features.append(members)
+        return end
+
+    def _scan_member(key: str, start: int) -> int:
+        if key == "features":
+            return _scan_json_array(text, start, _scan_feature)
+        value, end = _JSON_DECODER.raw_decode(text, start)
+        if key != "properties":
+            decoded[key] = value
+        return end
+
+    members, end = _scan_json_object(text, _skip_json_whitespace(text, 0), _scan_member)
+    if _skip_json_whitespace(text, end) != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
+    return decoded, members, features, raw_features
+
+
+def geojson_to_json_raw(
+    raw_geojson: RawGeojson,
+    geojson_obj: GeojsonObject,
+    geojson_obj_t: GeojsonObject,
+    dst_crs: bool = False,
+) -> str:
+    """Serialize transformed geojson_obj_t, writing members as raw text from raw_geojson, except for changed geometries and crs.
+
+    A geometry is changed when it has a different nr of positions in geojson_obj_t than in geojson_obj, when it is
+    dropped (None) or when dst_crs is True (all geometries are reprojected).
+    """
+    parts: list[str] = []
+    if raw_geojson.features is None:
+        _raw_feature_to_json(parts, raw_geojson.text, raw_geojson.members, geojson_obj, geojson_obj_t, dst_crs)
+        return "".join(parts)
+
+    fc = cast(CrsFeatureCollection, geojson_obj)
+    fc_t = cast(CrsFeatureCollection, geojson_obj_t)
+    raw_features = raw_geojson.features
+    crs_t = fc_t.crs.model_dump_json(exclude_none=True) if fc_t.crs is not None and fc_t.crs != fc.crs else None
+
+    def _write_feature_collection_value(key: str, start: int, end: int) -> None:
+        if key == "features":
+            parts.append("[")
+            for i, members in enumerate(raw_features):
+                parts.append("," if i > 0 else "")
+                _raw_feature_to_json(parts, raw_geojson.text, members, fc.features[i], fc_t.features[i], dst_crs)
+            parts.append("]")
+        else:
+            parts.append(crs_t if key == "crs" and crs_t is not None else raw_geojson.text[start:end])
+
+    members = raw_geojson.members
+    if crs_t is not None and all(key != "crs" for key, _, _ in members):
+        members = [*members, ("crs", 0, 0)]
+    _raw_members_to_json(parts, members, _write_feature_collection_value)
+    return "".join(parts)
+
+
+def _raw_feature_to_json(  # noqa: PLR0913
+    parts: list[str],
+    text: str,
+    members: list[RawMember],
+    feature: GeojsonObject,
+    feature_t: GeojsonObject,
+    dst_crs: bool,
+) -> None:
+    geometry = cast(Feature, feature).geometry
+    geometry_t = cast(Feature, feature_t).geometry
+    geometry_changed = _geometry_changed(geometry, geometry_t, dst_crs)
+
+    def _write_feature_value(key: str, start: int, end: int) -> None:
+        parts.append(_geometry_to_json(geometry_t) if key == "geometry" and geometry_changed else text[start:end])
+
+    _raw_members_to_json(parts, members, _write_feature_value)
+
+
+def _raw_members_to_json(
+    parts: list[str], members: list[RawMember], write_value: Callable[[str, int, int], None]
+) -> None:
+    parts.append("{")
+    for i, (key, start, end) in enumerate(members):
+        parts.append(("," if i > 0 else "") + json.dumps(key) + ":")
+        write_value(key, start, end)
+    parts.append("}")
+
+
+def _geometry_changed(geometry: Geometry | None, geometry_t: Geometry | None, dst_crs: bool) -> bool:
+    if geometry is None:
+        return False
+    if geometry_t is None or dst_crs:
+        return True
+    return _count_positions(geometry) != _count_positions(geometry_t)
+
+
+def _geometry_to_json(geometry: Geometry | None) -> str:
+    return geometry.model_dump_json(exclude_none=True) if geometry is not None else "null"
+
+
+def _count_positions(geometry: Geometry | None) -> int:
+    count = 0
+    for g in _get_geometries(geometry):
+        positions = _transform_positions_in_coordinates(g.coordinates, lambda x: x)
+        count += 1 if isinstance(positions, tuple) else sum(1 for _ in _flatten(positions))
+    return count
+
+
+def _skip_json_whitespace(text: str, idx: int) -> int:
+    return cast(re.Match, _JSON_WHITESPACE.match(text, idx)).end()
+
+
+def _scan_json_object(text: str, idx: int, scan_member: Callable[[str, int], int]) -> tuple[list[RawMember], int]:
+    """Scan JSON object starting at idx, scan_member(key, start) scans the value of a member and returns its end.
+
+    Returns the members of the object as (key, start, end) of their raw value text, and the end of the object.
+    """
+    if text[idx] != "{":
+        raise json.JSONDecodeError("Expecting '{'", text, idx)
+    members: list[RawMember] = []
+    idx = _skip_json_whitespace(text, idx + 1)
+    if text[idx] == "}":
+        return members, idx + 1
+    while True:
+        key, idx = _JSON_DECODER.raw_decode(text, idx)
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+        idx = _skip_json_whitespace(text, idx)
+        if text[idx] != ":":
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, idx)
+        start = _skip_json_whitespace(text, idx + 1)
+        end = scan_member(key, start)
+        members.append((key, start, end))
+        idx = _skip_json_whitespace(text, end)
+        if text[idx] == "}":
+            return members, idx + 1
+        if text[idx] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx = _skip_json_whitespace(text, idx + 1)
+
+
+def _scan_json_array(text: str, idx: int, scan_element: Callable[[int], int]) -> int:
+    """Scan JSON array starting at idx, scan_element(start) scans an element and returns its end. Returns end of the array."""
+    if text[idx] != "[":
+        raise json.JSONDecodeError("Expecting '['", text, idx)
+    idx = _skip_json_whitespace(text, idx + 1)
+    if text[idx] == "]":
+        return idx + 1
+    while True:
+        idx = _skip_json_whitespace(text, scan_element(idx))
+        if text[idx] == "]":
+            return idx + 1
+        if text[idx] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx = _skip_json_whitespace(text, idx + 1)
+
+
 class Has3D(Enum):
     all: Literal["all"] = "all"
     some: Literal["some"] = "some"
@@ -584,7 +2537,8 @@ def _transform_positions_in_coordinates(
     return callback(coordinates)
 
 
-def _get_intermediate_nr_points_and_segment_length(dist: float, max_segment_length: float) -> tuple[int, float]:
+def get_intermediate_nr_points_and_segment_length(dist: float, max_segment_length: float) -> tuple[int, float]:
+    """Nr of intermediate points and the (evenly spaced) segment length for a line segment of length dist exceeding max_segment_length."""
     if dist <= max_segment_length:
         raise GeodenseError(f"max_segment_length ({max_segment_length}) cannot be bigger or equal than dist ({dist})")
     remainder = dist % max_segment_length
@@ -596,36 +2550,12 @@ def _get_intermediate_nr_points_and_segment_length(dist: float, max_segment_leng
     return nr_points, new_max_segment_length
 
 
-def _add_vertices_to_line_segment(linestring: LineStringCoords, coord_index: int, densify_config: DenseConfig) -> int:
-    """Adds vertices to linestring in place, and returns number of vertices added to linestring.
-
-    Args:
-        ft_linesegment (_type_): line segment to add vertices
-        coord_index (int): coordinate index of line segment to add vertices for
-        transformer (Transformer): pyproj transformer
-        max_segment_length (float): max segment length, if exceeded vertices will be added
-        densify_in_projection (bool): whether to use source projection to densify (not use great-circle distance)
-
-    Returns:
-        int: number of added vertices
-    """
-
-    a = linestring[coord_index]
-    b = linestring[coord_index + 1]
-
-    prec = densify_config.get_coord_precision()
-
-    if not densify_config.in_projection:
-        linestring_coords = interpolate_geodesic(a, b, densify_config)
-    else:
-        linestring_coords = interpolate_src_proj(a, b, densify_config)
-
-    p = list(map(lambda x: _round_coordinates(x, prec), linestring_coords))
-
-    linestring[coord_index] = _round_coordinates(linestring[coord_index], prec)
-    linestring[coord_index + 1] = _round_coordinates(linestring[coord_index + 1], prec)
-    linestring[coord_index + 1 : coord_index + 1] = p
-    return len(p)
+def _get_intermediate_points(a: Position, b: Position, kernel: DenseKernel) -> LineStringCoords:
+    if kernel.in_projection:
+        return _interpolate_src_proj(a, b, kernel)
+    elif kernel.tolerance is not None:
+        return _interpolate_geodesic_adaptive(a, b, kernel)
+    return _interpolate_geodesic(a, b, kernel)
 
 
 def _round_coordinates(position: Position, precision: int) -> Position:
@@ -679,23 +2609,67 @@ def _has_3d_coordinates(geojson_obj: GeojsonObject, silent: bool | None = False)
 
 
 def validate_geom_type(geojson_obj: GeojsonObject, command: str = "") -> None:
-    geom_types: Nested[str] | str = transform_geojson_geometries(geojson_obj, _get_geometry_type)
-    geom_types = [geom_types] if isinstance(geom_types, str) else geom_types
-    geom_types_flat = list(_flatten(geom_types))
+    geom_types_flat = _get_geometry_types_flat(geojson_obj)
     if all(g_t in ("Point", "MultiPoint") for g_t in geom_types_flat):
         # situation: all geoms point -> error
-        if command:
-            error_message = f"cannot run {command} on GeoJSON that only contains (Multi)Point geometries"
-        else:
-            error_message = "GeoJSON contains only (Multi)Point geometries"
-        raise GeodenseError(error_message)
+        raise _only_points_error(command)
     elif any(gt in ["Point", "MultiPoint"] for gt in geom_types_flat):
         # sitation: some geoms point -> warning
-        warning_message = "GeoJSON contains (Multi)Point geometries"
-        if command:
-            warning_message = f"{warning_message}, cannot run {command} on (Multi)Point geometries"
-
-        logger.warning(warning_message)
+        _warn_points(command)
     else:
         # situation: no geoms point -> ok
         pass
+
+
+def _get_geometry_types_flat(geojson_obj: GeojsonObject) -> list[str]:
+    geom_types: Nested[str] | str = transform_geojson_geometries(geojson_obj, _get_geometry_type)
+    geom_types = [geom_types] if isinstance(geom_types, str) else geom_types
+    return list(_flatten(geom_types))
+
+
+def _only_points_error(command: str) -> GeodenseError:
+    if command:
+        return GeodenseError(f"cannot run {command} on GeoJSON that only contains (Multi)Point geometries")
+    return GeodenseError("GeoJSON contains only (Multi)Point geometries")
+
+
+def _warn_points(command: str) -> None:
+    warning_message = "GeoJSON contains (Multi)Point geometries"
+    if command:
+        warning_message = f"{warning_message}, cannot run {command} on (Multi)Point geometries"
+    logger.warning(warning_message)
+
+
+class _FeatureStreamValidator:
+    """Validates features of a stream one at a time, as validate_geom_type does for a complete GeoJSON object, and that each feature is within the bbox given for the stream."""
+
+    def __init__(self: "_FeatureStreamValidator", command: str, bbox: tuple[float, float, float, float] | None) -> None:
+        self.command = command
+        self.bbox = bbox
+        self.nr_features = 0
+        self.has_points = False
+        self.has_non_points = False
+
+    def validate(self: "_FeatureStreamValidator", feature: Feature) -> None:
+        """Raises GeodenseError when feature is not within bbox, warns on the first feature with (Multi)Point geometries."""
+        geom_types = _get_geometry_types_flat(feature)
+        if not self.has_points and any(g_t in ("Point", "MultiPoint") for g_t in geom_types):
+            self.has_points = True
+            _warn_points(self.command)
+        self.has_non_points = self.has_non_points or any(g_t not in ("Point", "MultiPoint") for g_t in geom_types)
+        if self.bbox is not None:
+            feature_bbox = _get_bbox(feature)
+            if feature_bbox is not None and not _bbox_within(feature_bbox, self.bbox):
+                raise GeodenseError(
+                    f"bbox {feature_bbox} of feature {self.nr_features} is not within bbox {self.bbox}, bbox should contain all features"
+                )
+        self.nr_features += 1
+
+    def finish(self: "_FeatureStreamValidator") -> None:
+        """Raises GeodenseError when the stream only contained (Multi)Point geometries."""
+        if self.nr_features > 0 and not self.has_non_points:
+            raise _only_points_error(self.command)
+
+
+def _bbox_within(bbox: tuple[float, float, float, float], other: tuple[float, float, float, float]) -> bool:
+    return bbox[0] >= other[0] and bbox[1] >= other[1] and bbox[2] <= other[2] and bbox[3] <= other[3]
@@ -10,12 +10,19 @@ from typing import Any, Literal
 from rich_argparse import RichHelpFormatter
 
 from geodense import __version__, add_stderr_logger
+from geodense.checkpoint import CHECKPOINT_FILE_EXT, CHECKPOINT_INTERVAL
 from geodense.lib import (
+    REPORT_FILE_FORMATS,
     SUPPORTED_FILE_FORMATS,
     check_density_file,
     densify_file,
+    estimate_densify_file,
+    sample_density_file,
 )
 from geodense.models import DEFAULT_MAX_SEGMENT_LENGTH, GeodenseError
+from geodense.multiresolution import densify_file_multi
+from geodense.streams import COMPRESSION_FORMATS, strip_compression_ext
+from geodense.types import ReportFormat
 
 logger = logging.getLogger("geodense")
 
@@ -38,22 +45,125 @@ def cli_exception_handler(f: Callable) -> Callable:
 @cli_exception_handler
 def densify_cmd(  # noqa: PLR0913
     input_file: str,
-    output_file: str,
+    output_file: str | None,
     overwrite: bool = False,
-    max_segment_length: float | None = None,
+    max_segment_length: float | list[float] | None = None,
     in_projection: bool = False,
     src_crs: str | None = None,
+    tolerance: float | None = None,
+    dst_crs: str | None = None,
+    threads: int | None = None,
+    progress: bool = False,
+    memory_stats: bool = False,
+    raw_passthrough: bool = False,
+    estimate: bool = False,
+    max_output_vertices: int | None = None,
+    processes: int | None = None,
+    where: list[str] | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+    drop_unselected: bool = False,
+    checkpoint_interval: int | None = None,
+    resume: bool = False,
 ) -> None:
+    if isinstance(max_segment_length, list):
+        _validate_multi_resolution_options(
+            tolerance=tolerance,
+            threads=threads,
+            processes=processes,
+            memory_stats=memory_stats,
+            raw_passthrough=raw_passthrough,
+            estimate=estimate,
+            max_output_vertices=max_output_vertices,
+            where=where,
+            bbox=bbox,
+            drop_unselected=drop_unselected,
+            checkpoint=checkpoint_interval,
+            resume=resume,
+        )
+        densify_file_multi(
+            input_file,
+            _required_output_file(output_file),
+            max_segment_length,
+            overwrite,
+            in_projection,
+            src_crs,
+            dst_crs,
+            progress,
+        )
+        return
+    if estimate:
+        _validate_estimate_options(
+            max_output_vertices=max_output_vertices,
+            checkpoint=checkpoint_interval,
+            resume=resume,
+            progress=progress,
+            memory_stats=memory_stats,
+        )
+        workers = max(threads or 1, processes or 1)
+        densify_estimate = estimate_densify_file(
+            input_file,
+            max_segment_length,
+            in_projection,
+            src_crs,
+            tolerance,
+            dst_crs,
+            workers,
+            raw_passthrough,
+            where,
+            bbox,
+            drop_unselected,
+        )
+        print(densify_estimate.message())
+        return
     densify_file(
         input_file,
-        output_file,
+        _required_output_file(output_file),
         overwrite,
         max_segment_length,
         in_projection,
         src_crs,
+        tolerance,
+        dst_crs,
+        threads,
+        progress,
+        memory_stats,
+        raw_passthrough,
+        max_output_vertices,
+        processes,
+        where,
+        bbox,
+        drop_unselected,
+        checkpoint_interval,
+        resume,
     )
 
 
+def _required_output_file(output_file: str | None) -> str:
+    if output_file is None:
+        raise GeodenseError("output_file is required, unless --estimate is set")
+    return output_file
+
+
+def _validate_multi_resolution_options(**options: Any) -> None:  # noqa: ANN401
+    _validate_unset_options("multiple max segment lengths", **options)
+
+
+def _validate_estimate_options(**options: Any) -> None:  # noqa: ANN401
+    _validate_unset_options("--estimate", **options)
+
+
+def _validate_sample_options(**options: Any) -> None:  # noqa: ANN401
+    _validate_unset_options("--sample", **options)
+
+
+def _validate_unset_options(description: str, **options: Any) -> None:  # noqa: ANN401
+    unsupported = [
+        f"--{name.replace('_', '-')}" for name, value in options.items() if value is not None and value is not False
+    ]
+    if len(unsupported) > 0:
+        raise GeodenseError(f"{description} cannot be combined with {', '.join(unsupported)}")
+
+
 @cli_exception_handler
 def check_density_cmd(  # noqa: PLR0913
     input_file: str,
@@ -62,9 +172,38 @@ def check_density_cmd(  # noqa: PLR0913
     in_projection: bool = False,
     src_crs: str | None = None,
     density_check_report_path: str | None = None,
+    threads: int | None = None,
+    report_format: ReportFormat | None = None,
+    report_geometry: bool = False,
+    progress: bool = False,
+    memory_stats: bool = False,
+    where: list[str] | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+    sample: float | None = None,
+    seed: int = 0,
 ) -> None:
     print(overwrite)
 
+    if sample is not None:
+        _validate_sample_options(
+            overwrite=overwrite,
+            density_check_report_path=density_check_report_path,
+            threads=threads,
+            report_format=report_format,
+            report_geometry=report_geometry,
+            progress=progress,
+            memory_stats=memory_stats,
+        )
+        density_sample = sample_density_file(
+            input_file, max_segment_length, sample, src_crs, in_projection, seed, where=where, bbox=bbox
+        )
+        status = "OK" if density_sample.failed_samples == 0 else "FAILED"
+        print(f"density-check {status} for sample of file {input_file} with max-segment-length: {max_segment_length}")
+        print(density_sample.message())
+        sys.exit(0 if density_sample.failed_samples == 0 else 1)
+
+    report_format = report_format or "geojson"
+
     check_status, density_check_report_path, nr_line_segments = check_density_file(
         input_file,
         max_segment_length,
@@ -72,6 +211,13 @@ def check_density_cmd(  # noqa: PLR0913
         src_crs,
         in_projection=in_projection,
         overwrite=overwrite,
+        threads=threads,
+        report_format=report_format,
+        report_geometry=report_geometry,
+        progress=progress,
+        memory_stats=memory_stats,
+        where=where,
+        bbox=bbox,
     )
 
     status = "OK" if check_status else "FAILED"
@@ -82,19 +228,29 @@ def check_density_cmd(  # noqa: PLR0913
     if check_status:
         sys.exit(0)
     else:
+        report_description = (
+            "line segment geometries written to GeoJSON FeatureCollection"
+            if report_format == "geojson"
+            else f"line segments written to {report_format.upper()} report"
+        )
         print(
-            f"{nr_line_segments} line segments in data exceed max-segment-length {max_segment_length}, line segment geometries written to GeoJSON FeatureCollection: {density_check_report_path}"
+            f"{nr_line_segments} line segments in data exceed max-segment-length {max_segment_length}, {report_description}: {density_check_report_path}"
         )
         sys.exit(1)
 
 
-def main() -> None:
+def main() -> None:  # noqa: PLR0915
     input_file_help = (
         "any valid GeoJSON file, accepted GeoJSON objects: FeatureCollection, Feature, Geometry and GeometryCollection "
     )
     source_crs_help = "override source CRS, if not specified then the CRS found in the GeoJSON input file will be used; format: $AUTH:$CODE; for example: EPSG:4326"
     verbose_help = "verbose output"
     max_segment_length_help = f"max allowed segment length in meters; default: {DEFAULT_MAX_SEGMENT_LENGTH}"
+    threads_help = "number of worker threads used to process linestrings; default: 1 (serial)"
+    progress_help = "show progress on stderr: features and vertices processed and vertices per second"
+    memory_stats_help = "report peak memory per stage (tracemalloc) and peak RSS on stderr; slows down processing"
+    where_help = "only process features with a property matching predicate KEY OP VALUE, with OP one of =, !=, <, <=, >, >= and a dotted KEY for nested properties; VALUE is parsed as JSON when possible, otherwise as string; repeat to combine predicates (all must match); for example: --where type=national_border"
+    bbox_help = "only process features with a geometry intersecting bbox in source CRS; format: x_min,y_min,x_max,y_max"
 
     parser = argparse.ArgumentParser(
         prog="geodense",
@@ -117,16 +273,18 @@ def main() -> None:
     )
     densify_parser.add_argument(
         "output_file",
+        nargs="?",
+        default=None,
         type=lambda x: is_json_file_arg(parser, x, "output_file", exist_required=FileRequired.either),
-        help="output file path",
+        help="output file path; required unless --estimate is set",
     )
 
     densify_parser.add_argument(
         "--max-segment-length",
         "-m",
-        type=float,
+        type=lambda x: max_segment_lengths_arg(parser, x),
         default=DEFAULT_MAX_SEGMENT_LENGTH,
-        help=max_segment_length_help,
+        help=f"{max_segment_length_help}; comma separated list, for example 50,200,1000, to densify for each max segment length in one pass, writing an output file per max segment length with the max segment length appended to the name of output_file",
     )
 
     densify_parser.add_argument(
@@ -136,6 +294,13 @@ def main() -> None:
         default=False,
         help="densify using linear interpolation in source projection instead of the geodesic, not applicable when source CRS is geographic",
     )
+    densify_parser.add_argument(
+        "--tolerance",
+        "-t",
+        type=float,
+        default=None,
+        help="densify adaptively: add vertices until the max deviation in meters between the geodesic and the straight line segment in source CRS (distance to the closest point of the line segment, for both projected and geographic source CRS) is below tolerance, overrides max-segment-length; not applicable with --in-projection",
+    )
     densify_parser.add_argument(
         "--overwrite",
         "-o",
@@ -154,6 +319,66 @@ def main() -> None:
         default=None,
     )
 
+    densify_parser.add_argument(
+        "--dst-crs",
+        "-d",
+        type=str,
+        help="reproject densified geometries to destination CRS in the same pass; format: $AUTH:$CODE; for example: EPSG:4258",
+        default=None,
+    )
+
+    densify_parser.add_argument("--threads", "-j", type=int, default=None, help=threads_help)
+    densify_parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="number of worker processes used to densify linestrings, coordinates are exchanged through shared memory; cannot be combined with --threads; default: 1 (serial)",
+    )
+    densify_parser.add_argument("--progress", action="store_true", default=False, help=progress_help)
+    densify_parser.add_argument("--memory-stats", action="store_true", default=False, help=memory_stats_help)
+    densify_parser.add_argument(
+        "--raw-passthrough",
+        action="store_true",
+        default=False,
+        help="write feature properties and geometries that gained no vertices verbatim from input file, instead of parsing and re-encoding them; output is not indented",
+    )
+    densify_parser.add_argument(
+        "--estimate",
+        action="store_true",
+        default=False,
+        help="only estimate nr of output vertices, size of output coordinates and runtime, without densifying; output_file can be omitted and is not written; with --where and --bbox only selected features are densified in the estimate; not applicable with --tolerance, cannot be combined with --max-output-vertices, --checkpoint, --resume, --progress and --memory-stats",
+    )
+    densify_parser.add_argument(
+        "--max-output-vertices",
+        type=int,
+        default=None,
+        help="abort before densifying when the estimated nr of output vertices exceeds this limit; not applicable with --tolerance",
+    )
+    densify_parser.add_argument("--where", action="append", default=None, metavar="PREDICATE", help=where_help)
+    densify_parser.add_argument("--bbox", type=lambda x: bbox_arg(parser, x), default=None, help=bbox_help)
+    densify_parser.add_argument(
+        "--drop-unselected",
+        action="store_true",
+        default=False,
+        help="drop features not selected by --where and --bbox from output, instead of writing them unchanged (reprojected with --dst-crs)",
+    )
+    densify_parser.add_argument(
+        "--checkpoint",
+        dest="checkpoint_interval",
+        nargs="?",
+        type=int,
+        const=CHECKPOINT_INTERVAL,
+        default=None,
+        metavar="N",
+        help=f"write output incrementally, with a checkpoint record in OUTPUT_FILE{CHECKPOINT_FILE_EXT} after every N features, so an interrupted run can be resumed with --resume; output is not indented; default N: {CHECKPOINT_INTERVAL}",
+    )
+    densify_parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="resume an interrupted --checkpoint run from its last checkpoint, skipping completed features and appending to output_file; requires the same input_file and options",
+    )
+
     densify_parser.set_defaults(func=densify_cmd)
 
     check_density_parser = subparsers.add_parser(
@@ -196,7 +421,27 @@ def main() -> None:
         required=False,
         help="density-check report path, when omitted a temp file will be used. Report is only generated when density-check fails.",
         metavar="FILE_PATH",
-        type=lambda x: is_json_file_arg(parser, x, "density-check-report-path", FileRequired.either),
+        type=lambda x: is_json_file_arg(
+            parser,
+            x,
+            "density-check-report-path",
+            FileRequired.either,
+            [ext for exts in REPORT_FILE_FORMATS.values() for ext in exts],
+        ),
+    )
+    check_density_parser.add_argument(
+        "--report-format",
+        "-f",
+        choices=list(REPORT_FILE_FORMATS),
+        default=None,
+        help="format of density-check report; geojson: FeatureCollection with line segment geometries, ndjson/csv: compact report written while checking, with a record per line segment containing feature, part and segment index and segment length; default: geojson",
+    )
+    check_density_parser.add_argument(
+        "--report-geometry",
+        "-g",
+        action="store_true",
+        default=False,
+        help="include line segment geometries in ndjson (GeoJSON geometry) and csv (WKT) report, geojson report always contains geometries",
     )
     check_density_parser.add_argument(
         "--overwrite",
@@ -205,7 +450,25 @@ def main() -> None:
         default=False,
         help="overwrite density-check report if exists",
     )
+    check_density_parser.add_argument("--threads", "-j", type=int, default=None, help=threads_help)
+    check_density_parser.add_argument("--progress", action="store_true", default=False, help=progress_help)
+    check_density_parser.add_argument("--memory-stats", action="store_true", default=False, help=memory_stats_help)
     check_density_parser.add_argument("-v", "--verbose", action="store_true", default=False, help=verbose_help)
+    check_density_parser.add_argument("--where", action="append", default=None, metavar="PREDICATE", help=where_help)
+    check_density_parser.add_argument("--bbox", type=lambda x: bbox_arg(parser, x), default=None, help=bbox_help)
+    check_density_parser.add_argument(
+        "--sample",
+        type=float,
+        default=None,
+        metavar="RATE|N",
+        help="check a random sample of line segments instead of all line segments, and report the estimated fraction of line segments exceeding max-segment-length with its 95%% confidence interval; a value below 1 is the RATE (fraction) of line segments to sample, a whole number of 1 or more the nr N of line segments to sample, so --sample 1 samples a single line segment; line segments are sampled proportional to their length; no report is written, so cannot be combined with report, --threads, --progress and --memory-stats options; exit code is 1 when a sampled line segment fails",
+    )
+    check_density_parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the random sample of --sample, same seed gives same sample; default: 0",
+    )
     check_density_parser.set_defaults(func=check_density_cmd)
 
     parser._positionals.title = "commands"
@@ -222,6 +485,24 @@ def main() -> None:
         sys.exit(1)
 
 
+def max_segment_lengths_arg(parser: argparse.ArgumentParser, arg: str) -> float | list[float]:
+    try:
+        values = [float(x) for x in arg.split(",")]
+    except ValueError:
+        parser.error(f"invalid max segment length: {arg}, expected a number or comma separated list of numbers")
+    return values[0] if len(values) == 1 else values
+
+
+def bbox_arg(parser: argparse.ArgumentParser, arg: str) -> tuple[float, float, float, float]:
+    try:
+        x_min, y_min, x_max, y_max = (float(x) for x in arg.split(","))
+    except ValueError:
+        parser.error(f"invalid bbox: {arg}, expected: x_min,y_min,x_max,y_max")
+    if x_min > x_max or y_min > y_max:
+        parser.error(f"invalid bbox: {arg}, x_min and y_min cannot exceed x_max and y_max")
+    return (x_min, y_min, x_max, y_max)
+
+
 class FileRequired(Enum):
     exist: Literal["exist"] = "exist"
     not_exist: Literal["not_exist"] = "not_exist"
@@ -233,17 +514,19 @@ def is_json_file_arg(
     arg: str,
     arg_name: str,
     exist_required: FileRequired,
+    supported_ext: list[str] | None = None,
 ) -> str:
-    _, file_ext = os.path.splitext(arg)
-    unsupported_file_extension_msg = (
-        "unsupported file extension of {input_file}, received: {ext}, expected one of: {supported_ext}"
-    )
-    if arg != "-" and file_ext not in SUPPORTED_FILE_FORMATS["GeoJSON"]:
+    if supported_ext is None:
+        supported_ext = SUPPORTED_FILE_FORMATS["GeoJSON"]
+    _, file_ext = os.path.splitext(strip_compression_ext(arg))
+    unsupported_file_extension_msg = "unsupported file extension of {input_file}, received: {ext}, expected one of: {supported_ext} (optionally followed by compression extension: {compression_ext})"
+    if arg != "-" and file_ext not in supported_ext:
         parser.error(
             unsupported_file_extension_msg.format(
                 input_file=arg_name,
                 ext=file_ext,
-                supported_ext=", ".join(SUPPORTED_FILE_FORMATS["GeoJSON"]),
+                supported_ext=", ".join(supported_ext),
+                compression_ext=", ".join(ext for ext, _ in COMPRESSION_FORMATS.values()),
             )
         )
     if (
@@ -1,15 +1,23 @@
+import copy
+import threading
+from typing import Any, NamedTuple
+
 from pyproj import CRS as ProjCrs  # noqa: N811
-from pyproj import Transformer
+from pyproj import Geod, Transformer
 
 DEFAULT_MAX_SEGMENT_LENGTH = 200
 DEFAULT_PRECISION_DEGREES = 9  # digits
 DEFAULT_PRECISION_METERS = 4  # digits
+MAX_ADAPTIVE_DEPTH = 20  # max bisection depth of adaptive densification, results in at most 2^20-1 points per segment
 
 
 class GeodenseError(Exception):
     pass
 
 
+_KERNEL_FIELDS = frozenset(("src_crs", "dst_crs", "max_segment_length", "in_projection", "tolerance"))
+
+
 class DenseConfig:
     geod_empty_exc_message = "DenseConfig.geod is None, cannot perform geodetic calculations without pyproj.Geod object"
 
@@ -18,33 +26,128 @@ class DenseConfig:
         src_crs: ProjCrs,
         max_segment_length: float | None = None,
         in_projection: bool = False,
+        tolerance: float | None = None,
+        dst_crs: ProjCrs | None = None,
     ) -> None:
         self.src_crs = src_crs
+        self.dst_crs = dst_crs
 
         if self.src_crs.is_geographic and in_projection:
             raise GeodenseError(
                 f"in_projection can only be used with \
 projected coordinate reference systems, crs {self.src_crs} is a geographic crs"
             )
-        self.back_transformer = None
-        if self.src_crs.is_geographic:
-            _geod = self.src_crs.get_geod()
-            self.transformer = None
-        elif self.src_crs.is_projected:
-            base_crs = self._get_base_crs()
-            self.transformer = Transformer.from_crs(src_crs, base_crs, always_xy=True)
-            _geod = self.src_crs.get_geod()
-            self.back_transformer = Transformer.from_crs(base_crs, src_crs, always_xy=True)
-        else:
+        if tolerance is not None and in_projection:
+            raise GeodenseError(
+                "tolerance can only be used with geodesic densification, cannot be combined with in_projection"
+            )
+        if tolerance is not None and tolerance == 0:
+            raise GeodenseError("tolerance must be bigger than 0")
+        if not self.src_crs.is_geographic and not self.src_crs.is_projected:
             raise GeodenseError("unexpected crs encountered, crs is neither geographic nor projected")
-        if _geod is None:
-            raise GeodenseError(self.geod_empty_exc_message)
-        self.geod = _geod
+        self._base_crs = self._get_base_crs() if self.src_crs.is_projected else None
+        self._pyproj_overrides: dict[str, Any] = {}  # pyproj objects set by caller, see _set_pyproj_object
+        # pyproj objects are created lazily per thread, since Transformer objects cannot be shared between threads
+        self._thread_local = threading.local()
+        self._get_pyproj_objects()  # create pyproj objects for current thread, raises when crs is invalid
+        self._thread_local_kernel = threading.local()  # not shared with copies, since kernel depends on config fields
 
         self.in_projection = in_projection
         self.max_segment_length = abs(
             max_segment_length or DEFAULT_MAX_SEGMENT_LENGTH
         )  # when max_segment_length == None -> DEFAULT_MAX_SEGMENT_LENGTH
+        self.tolerance = (
+            abs(tolerance) if tolerance is not None else None
+        )  # when tolerance is set -> adaptive densification, max_segment_length is ignored
+
+    def __setattr__(self: "DenseConfig", name: str, value: Any) -> None:  # noqa: ANN401
+        """Changing a field the kernel is resolved from discards the kernels of all threads, changing src_crs or dst_crs also discards the pyproj objects."""
+        super().__setattr__(name, value)
+        if name not in _KERNEL_FIELDS or "_thread_local_kernel" not in self.__dict__:  # not initialized yet
+            return
+        if name in ("src_crs", "dst_crs"):
+            if name == "src_crs":
+                super().__setattr__("_base_crs", self._get_base_crs() if self.src_crs.is_projected else None)
+            super().__setattr__("_thread_local", threading.local())
+        super().__setattr__("_thread_local_kernel", threading.local())
+
+    def with_max_segment_length(self: "DenseConfig", max_segment_length: float) -> "DenseConfig":
+        """Copy of DenseConfig with another max_segment_length, sharing the pyproj objects of this DenseConfig."""
+        result = copy.copy(self)  # copies without thread locals, see __getstate__
+        result._thread_local = self._thread_local
+        result.max_segment_length = abs(max_segment_length)
+        return result
+
+    def __getstate__(self: "DenseConfig") -> dict:
+        """pyproj objects are not pickled, they are created again per thread after unpickling, e.g. in a worker process."""
+        state = self.__dict__.copy()
+        del state["_thread_local"]
+        del state["_thread_local_kernel"]
+        return state
+
+    def __setstate__(self: "DenseConfig", state: dict) -> None:
+        self.__dict__.update(state)
+        self._thread_local = threading.local()
+        self._thread_local_kernel = threading.local()
+
+    @property
+    def kernel(self: "DenseConfig") -> "DenseKernel":
+        """DenseKernel of this DenseConfig for the current thread, created on first use."""
+        kernel: DenseKernel | None = getattr(self._thread_local_kernel, "kernel", None)
+        if kernel is None:
+            kernel = self._get_kernel()
+            self._thread_local_kernel.kernel = kernel
+        return kernel
+
+    @property
+    def transformer(self: "DenseConfig") -> Transformer | None:
+        """Transformer from src_crs to its base geographic crs, None when src_crs is geographic."""
+        return self._get_pyproj_objects().transformer
+
+    @transformer.setter
+    def transformer(self: "DenseConfig", transformer: Transformer | None) -> None:
+        self._set_pyproj_object("transformer", transformer)
+
+    @property
+    def back_transformer(self: "DenseConfig") -> Transformer | None:
+        """Transformer from base geographic crs to src_crs, None when src_crs is geographic."""
+        return self._get_pyproj_objects().back_transformer
+
+    @back_transformer.setter
+    def back_transformer(self: "DenseConfig", back_transformer: Transformer | None) -> None:
+        self._set_pyproj_object("back_transformer", back_transformer)
+
+    @property
+    def dst_transformer(self: "DenseConfig") -> Transformer | None:
+        """Transformer from src_crs to dst_crs, None when dst_crs is not set."""
+        return self._get_pyproj_objects().dst_transformer
+
+    @dst_transformer.setter
+    def dst_transformer(self: "DenseConfig", dst_transformer: Transformer | None) -> None:
+        self._set_pyproj_object("dst_transformer", dst_transformer)
+
+    @property
+    def geod(self: "DenseConfig") -> Geod:
+        return self._get_pyproj_objects().geod
+
+    @geod.setter
+    def geod(self: "DenseConfig", geod: Geod) -> None:
+        self._set_pyproj_object("geod", geod)
+
+    def _set_pyproj_object(self: "DenseConfig", name: str, value: Any) -> None:  # noqa: ANN401
+        """Override pyproj object name in all threads with value, the caller is responsible for its thread safety when densifying with threads."""
+        self._pyproj_overrides = {**self._pyproj_overrides, name: value}  # not shared with copies
+        self._thread_local = threading.local()
+        self._thread_local_kernel = threading.local()
+
+    def _get_pyproj_objects(self: "DenseConfig") -> "_PyprojObjects":
+        pyproj_objects: _PyprojObjects | None = getattr(self._thread_local, "pyproj_objects", None)
+        if pyproj_objects is None:
+            pyproj_objects = _PyprojObjects(self.src_crs, self._base_crs, self.dst_crs)
+            for name, value in self._pyproj_overrides.items():
+                setattr(pyproj_objects, name, value)
+            self._thread_local.pyproj_objects = pyproj_objects
+        return pyproj_objects
 
     def _get_base_crs(self: "DenseConfig") -> ProjCrs:
         if self.src_crs is None:
@@ -65,3 +168,182 @@ projected coordinate reference systems, crs {self.src_crs} is a geographic crs"
         if self.src_crs is None:
             raise GeodenseError("DensifyConfig.source_crs is None")
         return DEFAULT_PRECISION_DEGREES if self.src_crs.is_geographic else DEFAULT_PRECISION_METERS
+
+    def get_dst_coord_precision(self: "DenseConfig") -> int:
+        if self.dst_crs is None:
+            raise GeodenseError("DensifyConfig.dst_crs is None")
+        return DEFAULT_PRECISION_DEGREES if self.dst_crs.is_geographic else DEFAULT_PRECISION_METERS
+
+    def _get_kernel(self: "DenseConfig") -> "DenseKernel":
+        pyproj_objects = self._get_pyproj_objects()
+        is_projected = self.src_crs.is_projected
+        if is_projected and (pyproj_objects.transformer is None or pyproj_objects.back_transformer is None):
+            raise GeodenseError("transformer and back_transformer cannot be None when src_crs.is_projected=True")
+        return DenseKernel(
+            geodesic=not self.in_projection and self.tolerance is None,
+            in_projection=self.in_projection,
+            is_projected=is_projected,
+            max_segment_length=self.max_segment_length,
+            tolerance=self.tolerance,
+            precision=self.get_coord_precision(),
+            dst_precision=self.get_dst_coord_precision() if self.dst_crs is not None else None,
+            geod=pyproj_objects.geod,
+            transformer=pyproj_objects.transformer,
+            back_transformer=pyproj_objects.back_transformer,
+            dst_transformer=pyproj_objects.dst_transformer,
+        )
+
+
+class DenseKernel(NamedTuple):
+    """DenseConfig resolved for the per line segment code paths, with the pyproj objects of one thread, see DenseConfig.kernel.
+
+    Everything that does not change while densifying or checking density (densification mode, whether src_crs is
+    projected, coordinate precision, thresholds and pyproj objects) is looked up once, instead of per line segment or
+    per intermediate point.
+    """
+
+    geodesic: bool  # geodesic densification with max_segment_length, not in projection or adaptive (tolerance)
+    in_projection: bool
+    is_projected: bool  # whether src_crs is projected, then transformer and back_transformer are not None
+    max_segment_length: float
+    tolerance: float | None
+    precision: int  # coordinate precision in src_crs
+    dst_precision: int | None  # coordinate precision in dst_crs, None when dst_crs is not set
+    geod: Geod
+    transformer: Transformer | None
+    back_transformer: Transformer | None
+    dst_transformer: Transformer | None
+
+
+class _PyprojObjects:
+    """pyproj objects of DenseConfig for a single thread."""
+
+    def __init__(self: "_PyprojObjects", src_crs: ProjCrs, base_crs: ProjCrs | None, dst_crs: ProjCrs | None) -> None:
+        self.transformer: Transformer | None = None
+        self.back_transformer: Transformer | None = None
+        if base_crs is not None:
+            self.transformer = Transformer.from_crs(src_crs, base_crs, always_xy=True)
+            self.back_transformer = Transformer.from_crs(base_crs, src_crs, always_xy=True)
+        _geod = src_crs.get_geod()
+        if _geod is None:
+            raise GeodenseError(DenseConfig.geod_empty_exc_message)
+        self.geod: Geod = _geod
+        self.dst_transformer = (
+            Transformer.from_crs(src_crs, dst_crs, always_xy=True) if dst_crs is not None else None
+        )  # when dst_crs is set -> densified geometries are reprojected to dst_crs
+
+
+RawMember = tuple[str, int, int]  # key, start and end of raw text of member value
+
+
+class RawGeojson:
+    """Raw text of GeoJSON FeatureCollection or Feature, with the positions of its members and those of its features."""
+
+    def __init__(
+        self: "RawGeojson", text: str, members: list[RawMember], features: list[list[RawMember]] | None
+    ) -> None:
+        self.text = text
+        self.members = members
+        self.features = features  # None when text is a Feature
+
+
+class DenseStats:
+    """Counters collected while running densify or density-check, for reporting purposes."""
+
+    def __init__(self: "DenseStats") -> None:
+        self.geometries = 0
+        self.skipped_geometries = 0  # skipped by bbox prefilter
+        self.linestrings = 0
+        self.skipped_linestrings = 0  # skipped by bbox prefilter
+        self.features = 0
+        self.unselected_features = 0  # not selected by FeatureFilter
+        self.vertices = 0  # vertices of processed linestrings, before densification
+        self.work_units = 0  # work units scheduled on worker threads
+        self.threads = 0  # nr of worker threads
+        self.worker_times: dict[str, float] = {}  # busy time in seconds per worker thread
+        self._lock = threading.Lock()
+
+    def increment(self: "DenseStats", counter: str, value: int = 1) -> None:
+        """Thread-safe increment of counter.
+
+        Counters are only incremented concurrently once worker threads run, which are always scheduled with
+        set_work_units first, so serial processing increments without taking the lock.
+        """
+        if self.threads == 0:
+            setattr(self, counter, getattr(self, counter) + value)
+            return
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def prefilter_message(self: "DenseStats") -> str:
+        return f"bbox prefilter skipped {self.skipped_geometries} of {self.geometries} geometries and {self.skipped_linestrings} of {self.linestrings} linestrings"
+
+    def filter_message(self: "DenseStats") -> str:
+        return f"feature filter selected {self.features - self.unselected_features} of {self.features} features"
+
+    def set_work_units(self: "DenseStats", work_units: int, threads: int) -> None:
+        with self._lock:
+            self.work_units += work_units
+            self.threads = max(self.threads, threads)
+
+    def add_worker_time(self: "DenseStats", worker: str, seconds: float) -> None:
+        """Thread-safe addition of busy time of worker thread."""
+        with self._lock:
+            self.worker_times[worker] = self.worker_times.get(worker, 0.0) + seconds
+
+    def balance(self: "DenseStats") -> float | None:
+        """Mean over max busy time of worker threads, 1.0 when perfectly balanced, None when no work was scheduled."""
+        busiest = max(self.worker_times.values(), default=0.0)
+        if self.threads == 0 or busiest == 0:
+            return None
+        return sum(self.worker_times.values()) / self.threads / busiest
+
+    def balance_message(self: "DenseStats") -> str:
+        balance = self.balance()
+        balance_str = f"{balance:.2f}" if balance is not None else "n/a"
+        return f"scheduled {self.work_units} work units on {self.threads} threads, balance {balance_str} (mean/max busy time per thread)"
+
+
+class DenseEstimate:
+    """Estimated output of densify, see estimate_densify_geojson_object."""
+
+    def __init__(
+        self: "DenseEstimate", input_vertices: int, output_vertices: int, output_bytes: int, seconds: float | None
+    ) -> None:
+        self.input_vertices = input_vertices
+        self.output_vertices = output_vertices
+        self.output_bytes = output_bytes  # size of the coordinates in the output
+        self.seconds = seconds  # None when runtime was not measured
+
+    def message(self: "DenseEstimate") -> str:
+        runtime = f", ~{self.seconds:.1f}s runtime" if self.seconds is not None else ""
+        return f"estimated output: {self.output_vertices} vertices (input: {self.input_vertices} vertices), ~{format_mebibytes(self.output_bytes)} of coordinates{runtime}"
+
+
+class DensitySample:
+    """Estimated fraction of line segments exceeding max_segment_length, from a sample of line segments, see sample_density_geojson_object."""
+
+    def __init__(  # noqa: PLR0913
+        self: "DensitySample",
+        nr_segments: int,
+        sample_size: int,
+        failed_samples: int,
+        failure_rate: float,
+        lower: float,
+        upper: float,
+        confidence: float,
+    ) -> None:
+        self.nr_segments = nr_segments  # nr of line segments sampled from
+        self.sample_size = sample_size
+        self.failed_samples = failed_samples  # nr of sampled line segments exceeding max_segment_length
+        self.failure_rate = failure_rate  # estimated fraction of line segments exceeding max_segment_length
+        self.lower = lower  # bounds of confidence interval of failure_rate
+        self.upper = upper
+        self.confidence = confidence
+
+    def message(self: "DensitySample") -> str:
+        return f"estimated {self.failure_rate:.2%} of {self.nr_segments} line segments exceed max-segment-length ({self.confidence:.0%} confidence interval: {self.lower:.2%} - {self.upper:.2%}), {self.failed_samples} of {self.sample_size} sampled line segments exceed max-segment-length"
+
+
+def format_mebibytes(nr_bytes: int) -> str:
+    return f"{nr_bytes / 2**20:.1f} MiB"
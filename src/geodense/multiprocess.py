@@ -0,0 +1,329 @@
+import time
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from functools import partial
+from multiprocessing import current_process, get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import NamedTuple, cast
+
+from geojson_pydantic.types import LineStringCoords, Position, Position2D, Position3D
+
+from geodense.lib import (
+    THREE_DIMENSIONAL,
+    InfValCoordinateError,
+    _densify_and_reproject_linestring,
+    _estimate_linestring_cost,
+    _get_linestrings,
+    _get_max_work_unit_cost,
+    _reproject_positions,
+    _round_coordinates,
+    _skip_by_bbox_prefilter,
+    _skip_linestring_by_bbox_prefilter,
+    _split_linestring_by_cost,
+    _stitch_ranges,
+    _submit_longest_first,
+    densify_vertex_range,
+    reproject_geometry,
+)
+from geodense.models import DenseConfig, DenseStats
+from geodense.types import GeojsonGeomNoGeomCollection
+
+FLAG_THREE_DIMENSIONAL = 1
+FLAG_SKIP_DENSIFY = 2
+ITEM_SIZE = 8  # bytes per int64 offset or flag and per float64 coordinate
+
+_worker_config: DenseConfig | None = None  # DenseConfig of worker process, set by _init_worker
+
+
+class _Entry(NamedTuple):
+    """Linestring, or vertex range of linestring, densified by a worker process."""
+
+    geometry_index: int
+    positions: Sequence[Position]  # linestring itself, or positions of vertex range
+    flags: int
+    cost: float
+    parts: list[list[Position]] | None  # parts of linestring to stitch, None when entry is a complete linestring
+    part_index: int
+
+
+class _UnitResult(NamedTuple):
+    """Result of work unit returned by worker process, the densified coordinates are in shared memory block shm_name."""
+
+    shm_name: str
+    first: int  # entries first up to last of the work unit
+    last: int
+    failed_entries: list[int]
+    worker_name: str
+    seconds: float
+
+
+def densify_geometries_in_processes(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geometries: Sequence[GeojsonGeomNoGeomCollection],
+    min_scale_factor: float | None,
+    processes: int,
+    stats: DenseStats | None = None,
+    executor: ProcessPoolExecutor | None = None,
+) -> set[int]:
+    """Densify (and optionally reproject) geometries in place in worker processes, returns indices of geometries that failed with InfValCoordinateError.
+
+    Instead of pickling positions to and from the workers, the coordinates of all linestrings are written into one
+    shared memory block that the workers read in place. Each worker writes the densified coordinates of its work unit
+    into a shared memory block of its own, so only block names and entry indices cross process boundaries. Linestrings
+    are split in vertex ranges and grouped in work units by estimated cost, as with threads. Workers are started with
+    the spawn start method, so callers must guard their entry point with if __name__ == "__main__". With executor the
+    worker processes of executor are used (see get_process_pool), instead of starting a pool for this call.
+    """
+    linestrings = (linestring for g in geometries for linestring in _get_linestrings(g.coordinates))
+    max_unit_cost = _get_max_work_unit_cost(densify_config, linestrings, processes, densify=True)
+    failed: set[int] = set()
+    entries: list[_Entry] = []
+    stitches: list[tuple[int, LineStringCoords, list[list[Position]]]] = []
+    for geometry_index, geometry in enumerate(geometries):
+        try:
+            _add_entries(
+                densify_config, geometry, geometry_index, min_scale_factor, max_unit_cost, entries, stitches, stats
+            )
+        except InfValCoordinateError:
+            failed.add(geometry_index)
+    if len(entries) == 0:
+        return failed
+
+    nr_vertices = sum(len(entry.positions) for entry in entries)
+    shm_in = _write_entries(entries, nr_vertices)
+    try:
+        units = _get_work_units(entries, shm_in.name, nr_vertices, max_unit_cost)
+        with ExitStack() as stack:
+            process_executor = executor or stack.enter_context(get_process_pool(densify_config, processes))
+            if stats is not None:
+                stats.set_work_units(len(units), processes)
+            # busy time is measured in the worker processes, since stats cannot be shared with them
+            futures = _submit_longest_first(process_executor, processes, units, None)
+            consumed = 0
+            try:
+                for future in futures:
+                    result = future.result()
+                    consumed += 1
+                    _read_results(result.shm_name, entries, result.first, result.last)
+                    failed.update(entries[e].geometry_index for e in result.failed_entries)
+                    if stats is not None:
+                        stats.add_worker_time(result.worker_name, result.seconds)
+            finally:
+                _discard_results(futures[consumed:])
+    finally:
+        shm_in.close()
+        shm_in.unlink()
+
+    for geometry_index, linestring, parts in stitches:
+        if geometry_index not in failed:
+            _stitch_ranges(linestring, parts)
+    return failed
+
+
+def get_process_pool(densify_config: DenseConfig, processes: int) -> ProcessPoolExecutor:
+    """Pool of worker processes initialized with densify_config, see densify_geometries_in_processes."""
+    # spawn instead of fork, since forking a process with running threads (e.g. of pyproj or pyarrow) may deadlock
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(densify_config,),
+    )
+
+
+def _get_work_units(
+    entries: list[_Entry], shm_in_name: str, nr_vertices: int, max_unit_cost: float
+) -> list[tuple[float, partial[_UnitResult]]]:
+    """Group consecutive entries in work units of up to max_unit_cost, so small linestrings are densified in batches."""
+    units: list[tuple[float, partial[_UnitResult]]] = []
+    first = 0
+    cost = 0.0
+    for i, entry in enumerate(entries):
+        cost += entry.cost
+        if cost >= max_unit_cost or i == len(entries) - 1:
+            units.append((cost, partial(_densify_entries, shm_in_name, len(entries), nr_vertices, first, i + 1)))
+            first = i + 1
+            cost = 0.0
+    return units
+
+
+def _add_entries(  # noqa: PLR0913
+    densify_config: DenseConfig,
+    geometry: GeojsonGeomNoGeomCollection,
+    geometry_index: int,
+    min_scale_factor: float | None,
+    max_unit_cost: float,
+    entries: list[_Entry],
+    stitches: list[tuple[int, LineStringCoords, list[list[Position]]]],
+    stats: DenseStats | None,
+) -> None:
+    """Add entries for the linestrings of geometry, geometries that need no work in a worker are processed in place."""
+    if isinstance(geometry.coordinates, tuple):  # point geometry
+        if densify_config.dst_crs is not None:
+            reproject_geometry(densify_config, geometry)
+        return
+    skip_geometry = _skip_by_bbox_prefilter(densify_config, geometry, min_scale_factor, stats)
+    for linestring in _get_linestrings(geometry.coordinates):
+        if stats is not None:
+            stats.increment("vertices", len(linestring))
+        skip = (
+            skip_geometry
+            or _skip_linestring_by_bbox_prefilter(densify_config, linestring, min_scale_factor, stats)
+            or len(linestring) < 2  # noqa: PLR2004
+        )
+        if skip and densify_config.dst_crs is None:
+            continue
+        dimensions = {len(p) for p in linestring}
+        if len(dimensions) > 1:  # mixed 2D/3D positions cannot be stored in shared memory, densify in this process
+            _densify_and_reproject_linestring(densify_config, linestring, skip, min_scale_factor, None)
+            continue
+        flags = (FLAG_THREE_DIMENSIONAL if dimensions == {THREE_DIMENSIONAL} else 0) | (
+            FLAG_SKIP_DENSIFY if skip else 0
+        )
+        cost = _estimate_linestring_cost(densify_config, linestring, 0, len(linestring) - 1, not skip)
+        if cost <= max_unit_cost:
+            entries.append(_Entry(geometry_index, linestring, flags, cost, None, 0))
+            continue
+        ranges = _split_linestring_by_cost(densify_config, linestring, max_unit_cost, not skip)
+        parts: list[list[Position]] = [[] for _ in ranges]
+        prec = densify_config.kernel.precision
+        for part_index, (start, end, range_cost) in enumerate(ranges):
+            positions = linestring[start : end + 1]
+            if start > 0 and not skip:
+                # first line segment of a vertex range starts at the rounded vertex, as in densify_vertex_range
+                positions = [_round_coordinates(positions[0], prec), *positions[1:]]
+            entries.append(_Entry(geometry_index, positions, flags, range_cost, parts, part_index))
+        stitches.append((geometry_index, linestring, parts))
+
+
+def _write_entries(entries: list[_Entry], nr_vertices: int) -> SharedMemory:
+    """Write entries in new shared memory block: offsets (nr of entries + 1) and flags as int64, followed by x, y and z coordinates of all vertices as float64."""
+    nr_ints = 2 * len(entries) + 1
+    shm = SharedMemory(create=True, size=ITEM_SIZE * (nr_ints + 3 * nr_vertices))
+    ints = shm.buf[0 : ITEM_SIZE * nr_ints].cast("q")
+    floats = shm.buf[ITEM_SIZE * nr_ints :].cast("d")
+    try:
+        offset = 0
+        for i, entry in enumerate(entries):
+            ints[i] = offset
+            ints[len(entries) + 1 + i] = entry.flags
+            _write_positions(floats, nr_vertices, offset, entry.positions, entry.flags)
+            offset += len(entry.positions)
+        ints[len(entries)] = offset
+    finally:
+        ints.release()
+        floats.release()
+    return shm
+
+
+def _write_positions(
+    floats: memoryview, nr_vertices: int, offset: int, positions: Sequence[Position], flags: int
+) -> None:
+    end = offset + len(positions)
+    floats[offset:end] = array("d", [p[0] for p in positions])
+    floats[nr_vertices + offset : nr_vertices + end] = array("d", [p[1] for p in positions])
+    if flags & FLAG_THREE_DIMENSIONAL:
+        floats[2 * nr_vertices + offset : 2 * nr_vertices + end] = array("d", [p[2] for p in positions])  # type: ignore[misc]
+
+
+def _read_positions(floats: memoryview, nr_vertices: int, start: int, end: int, flags: int) -> list[Position]:
+    xs = floats[start:end].tolist()
+    ys = floats[nr_vertices + start : nr_vertices + end].tolist()
+    if flags & FLAG_THREE_DIMENSIONAL:
+        zs = floats[2 * nr_vertices + start : 2 * nr_vertices + end].tolist()
+        return list(map(Position3D, xs, ys, zs))
+    return list(map(Position2D, xs, ys))
+
+
+def _init_worker(densify_config: DenseConfig) -> None:
+    global _worker_config  # noqa: PLW0603
+    _worker_config = densify_config
+
+
+def _densify_entries(shm_in_name: str, nr_entries: int, nr_vertices: int, first: int, last: int) -> _UnitResult:
+    """Densify entries first up to last in worker process, writes results in shared memory block laid out as offsets (nr of entries + 1) followed by coordinates, see _write_entries."""
+    if _worker_config is None:
+        raise RuntimeError("worker process not initialized with DenseConfig")
+    start_time = time.perf_counter()
+    results: list[list[Position]] = []
+    flags: list[int] = []
+    failed: list[int] = []
+    shm_in = SharedMemory(name=shm_in_name)
+    ints = shm_in.buf[0 : ITEM_SIZE * (2 * nr_entries + 1)].cast("q")
+    floats = shm_in.buf[ITEM_SIZE * (2 * nr_entries + 1) :].cast("d")
+    try:
+        for e in range(first, last):
+            flags.append(ints[nr_entries + 1 + e])
+            positions = _read_positions(floats, nr_vertices, ints[e], ints[e + 1], flags[-1])
+            try:
+                results.append(_densify_positions(_worker_config, positions, flags[-1]))
+            except InfValCoordinateError:
+                failed.append(e)
+                results.append([])
+    finally:
+        ints.release()
+        floats.release()
+        shm_in.close()
+
+    nr_results = sum(len(positions) for positions in results)
+    shm_out = SharedMemory(create=True, size=ITEM_SIZE * (len(results) + 1 + 3 * nr_results))
+    out_ints = shm_out.buf[0 : ITEM_SIZE * (len(results) + 1)].cast("q")
+    out_floats = shm_out.buf[ITEM_SIZE * (len(results) + 1) :].cast("d")
+    try:
+        offset = 0
+        for i, positions in enumerate(results):
+            out_ints[i] = offset
+            _write_positions(out_floats, nr_results, offset, positions, flags[i])
+            offset += len(positions)
+        out_ints[len(results)] = offset
+    finally:
+        out_ints.release()
+        out_floats.release()
+        shm_out.close()
+    return _UnitResult(shm_out.name, first, last, failed, current_process().name, time.perf_counter() - start_time)
+
+
+def _densify_positions(densify_config: DenseConfig, positions: list[Position], flags: int) -> list[Position]:
+    if not flags & FLAG_SKIP_DENSIFY:
+        positions = densify_vertex_range(densify_config, positions, 0, len(positions) - 1)
+    if densify_config.dst_crs is not None:
+        positions = _reproject_positions(densify_config, positions)
+    return positions
+
+
+def _discard_results(futures: Sequence[Future[_UnitResult]]) -> None:
+    """Cancel pending work units and unlink the shared memory blocks of finished work units whose results are not read, so no blocks leak when a work unit raises."""
+    for future in futures:
+        future.cancel()
+    wait(futures)
+    for future in futures:
+        if not future.cancelled() and future.exception() is None:
+            shm_out = SharedMemory(name=future.result().shm_name)
+            shm_out.close()
+            shm_out.unlink()
+
+
+def _read_results(shm_out_name: str, entries: list[_Entry], first: int, last: int) -> None:
+    """Read results of entries first up to last from shared memory block written by _densify_entries into their targets, and unlink block."""
+    shm_out = SharedMemory(name=shm_out_name)
+    nr_results = last - first
+    ints = shm_out.buf[0 : ITEM_SIZE * (nr_results + 1)].cast("q")
+    floats = shm_out.buf[ITEM_SIZE * (nr_results + 1) :].cast("d")
+    try:
+        nr_vertices = ints[nr_results]
+        for i, entry in enumerate(entries[first:last]):
+            if ints[i] == ints[i + 1]:  # failed entry
+                continue
+            positions = _read_positions(floats, nr_vertices, ints[i], ints[i + 1], entry.flags)
+            if entry.parts is None:
+                linestring = cast(LineStringCoords, entry.positions)
+                linestring[:] = positions
+            else:
+                entry.parts[entry.part_index] = positions
+    finally:
+        ints.release()
+        floats.release()
+        shm_out.close()
+        shm_out.unlink()
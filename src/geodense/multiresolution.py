@@ -0,0 +1,209 @@
+import logging
+import os
+from collections.abc import Callable, Iterator, Sequence
+from functools import partial
+from typing import cast
+
+from geojson_pydantic import Feature
+from geojson_pydantic.types import LineStringCoords
+from pydantic import BaseModel
+
+from geodense.geojson import CrsFeatureCollection
+from geodense.lib import (
+    InfValCoordinateError,
+    densify_geojson_object,
+    densify_geometry,
+    geometry_inf_val_error,
+    get_densify_config,
+    get_feature_counter,
+    get_geodesic_inverses,
+    get_min_scale_factor_geojson,
+    get_progress_reporter,
+    textio_to_geojson,
+    traverse_geojson_geometries,
+    validate_dependent_file_args,
+    validate_geom_type,
+)
+from geodense.models import DenseConfig, DenseStats, GeodenseError
+from geodense.streams import get_compression, open_input, open_output, strip_compression_ext
+from geodense.types import GeodesicInverse, GeojsonGeomNoGeomCollection, GeojsonObject
+
+logger = logging.getLogger("geodense")
+
+GeometryKey = tuple[int, int]  # feature index and index of geometry in feature, in traversal order
+LineStringKey = tuple[int, int, int]  # GeometryKey and index of linestring in geometry, in traversal order
+
+
+def densify_geojson_object_multi(
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    max_segment_lengths: Sequence[float],
+    stats: DenseStats | None = None,
+) -> list[GeojsonObject]:
+    """Densify geometries in geojson_obj for each of max_segment_lengths, returns densified copy of geojson_obj per max segment length.
+
+    See iter_densify_geojson_object_multi, which yields the densified copies one at a time.
+    """
+    return list(iter_densify_geojson_object_multi(densify_config, geojson_obj, max_segment_lengths, stats))
+
+
+def iter_densify_geojson_object_multi(
+    densify_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    max_segment_lengths: Sequence[float],
+    stats: DenseStats | None = None,
+) -> Iterator[GeojsonObject]:
+    """Densify geometries in geojson_obj for each of max_segment_lengths, yields densified copy of geojson_obj per max segment length.
+
+    The result for a max segment length equals the result of densify_geojson_object with that max segment length. The
+    inverse geodesic (distance and azimuth) of each line segment is calculated once, for the smallest max segment
+    length, and shared by all max segment lengths, which then only add their own forward interpolation and
+    reprojection. Densification in projection has no geodesics to share, so densifies per max segment length.
+    Adaptive densification (tolerance) does not depend on max segment length, so cannot be combined. Stats are only
+    collected for the first max segment length.
+
+    Each max segment length is densified when its result is requested, so memory holds geojson_obj, the result of one
+    max segment length and the shared inverse geodesics, which take about as much memory as the input coordinates.
+    The inverse geodesics are released once the last max segment length is densified.
+    """
+    if len(max_segment_lengths) == 0:
+        raise GeodenseError("max_segment_lengths cannot be empty")
+    if densify_config.tolerance is not None:
+        raise GeodenseError("multiple max segment lengths cannot be combined with tolerance")
+    validate_geom_type(geojson_obj, "densify")
+    configs = [densify_config.with_max_segment_length(x) for x in max_segment_lengths]
+    if densify_config.in_projection:
+        for i, config in enumerate(configs):
+            yield densify_geojson_object(config, geojson_obj, stats if i == 0 else None)
+        return
+
+    min_scale_factor = get_min_scale_factor_geojson(densify_config, geojson_obj)
+    geodesic_config = densify_config.with_max_segment_length(min(max_segment_lengths))
+    inverses: dict[LineStringKey, list[GeodesicInverse | None]] = {}
+    for i, config in enumerate(configs):
+        yield _densify_shared_inverses(
+            config,
+            geodesic_config,
+            geojson_obj,
+            min_scale_factor,
+            stats if i == 0 else None,
+            inverses,
+            release=i == len(configs) - 1,
+        )
+    inverses.clear()
+
+
+def densify_file_multi(  # noqa: PLR0913
+    input_file_path: str,
+    output_file_path: str,
+    max_segment_lengths: Sequence[float],
+    overwrite: bool = False,
+    densify_in_projection: bool = False,
+    src_crs: str | None = None,
+    dst_crs: str | None = None,
+    progress: bool = False,
+) -> list[str]:
+    """Densify geometries in input file for each of max_segment_lengths, writes an output file per max segment length and returns their paths.
+
+    The output paths are output_file_path with the max segment length appended to the file name (see
+    get_multi_output_path). Each output file is written as soon as its max segment length is densified, before the
+    next max segment length is densified. See densify_file for the other arguments and
+    iter_densify_geojson_object_multi for what is shared between the max segment lengths and what is kept in memory.
+    """
+    if len(set(max_segment_lengths)) != len(max_segment_lengths):
+        raise GeodenseError(f"max_segment_lengths must be unique, received: {max_segment_lengths}")
+    if output_file_path == "-":
+        raise GeodenseError("cannot write output of multiple max segment lengths to stdout")
+    output_paths = [get_multi_output_path(output_file_path, x) for x in max_segment_lengths]
+    for output_path in output_paths:
+        validate_dependent_file_args(input_file_path, output_path, overwrite)
+
+    with open_input(input_file_path) as src:
+        geojson_obj = textio_to_geojson(src)
+    config = get_densify_config(
+        geojson_obj, input_file_path, max_segment_lengths[0], densify_in_projection, src_crs, None, dst_crs
+    )
+    stats = DenseStats()
+    results = iter_densify_geojson_object_multi(config, geojson_obj, max_segment_lengths, stats)
+    with get_progress_reporter(progress, stats, geojson_obj, "densify"):
+        result = next(results)  # stats are only collected for the first max segment length
+    logger.info(stats.prefilter_message())
+    _write_multi_output(output_paths[0], result, src_crs, dst_crs)
+    del result  # release before densifying the next max segment length
+    for output_path in output_paths[1:]:
+        _write_multi_output(output_path, next(results), src_crs, dst_crs)
+    return output_paths
+
+
+def get_multi_output_path(output_file_path: str, max_segment_length: float) -> str:
+    """Output path for max_segment_length, with max_segment_length appended to the file name, e.g. out_200.json.gz for out.json.gz and 200."""
+    compression = get_compression(output_file_path)
+    base, ext = os.path.splitext(strip_compression_ext(output_file_path))
+    return f"{base}_{max_segment_length:g}{ext}{output_file_path[len(base) + len(ext) :] if compression else ''}"
+
+
+def _traverse_with_key(
+    geojson_obj: GeojsonObject,
+    geometry_callback: Callable[[GeometryKey, GeojsonGeomNoGeomCollection], None],
+    stats: DenseStats | None,
+) -> GeojsonObject:
+    """Traverse geometries of geojson_obj as traverse_geojson_geometries, geometry_callback is called with the GeometryKey of the geometry and the geometry."""
+    feature_index = 0
+    geometry_index = 0
+    feature_counter = get_feature_counter(stats)
+
+    def _geometry_callback(geometry: GeojsonGeomNoGeomCollection) -> None:
+        nonlocal geometry_index
+        key = (feature_index, geometry_index)
+        geometry_index += 1
+        geometry_callback(key, geometry)
+
+    def _node_callback(node: GeojsonObject) -> None:
+        nonlocal feature_index, geometry_index
+        if isinstance(node, Feature):
+            feature_index += 1
+            geometry_index = 0
+        if feature_counter is not None:
+            feature_counter(node)
+
+    return traverse_geojson_geometries(geojson_obj, cast(Callable, _geometry_callback), _node_callback)
+
+
+def _write_multi_output(output_path: str, result: GeojsonObject, src_crs: str | None, dst_crs: str | None) -> None:
+    if isinstance(result, CrsFeatureCollection):
+        for crs in (src_crs, dst_crs):
+            if crs is not None:
+                result.set_crs_auth_code(crs)
+    with open_output(output_path) as out_f:
+        out_f.write(cast(BaseModel, result).model_dump_json(indent=1, exclude_none=True))
+
+
+def _densify_shared_inverses(  # noqa: PLR0913
+    config: DenseConfig,
+    geodesic_config: DenseConfig,
+    geojson_obj: GeojsonObject,
+    min_scale_factor: float | None,
+    stats: DenseStats | None,
+    inverses: dict[LineStringKey, list[GeodesicInverse | None]],
+    release: bool,
+) -> GeojsonObject:
+    """Densified copy of geojson_obj for config, the inverse geodesics of a linestring are calculated with geodesic_config on first use and cached in inverses, when release is True they are removed from inverses after use."""
+
+    def _get_inverses(
+        key: GeometryKey, linestring_index: int, linestring: LineStringCoords
+    ) -> list[GeodesicInverse | None]:
+        linestring_key = (*key, linestring_index)
+        result = inverses.pop(linestring_key, None) if release else inverses.get(linestring_key)
+        if result is None:
+            result = get_geodesic_inverses(geodesic_config, linestring)
+            if not release:
+                inverses[linestring_key] = result
+        return result
+
+    def _densify_geometry(key: GeometryKey, geometry: GeojsonGeomNoGeomCollection) -> None:
+        densify_geometry(config, geometry, min_scale_factor, stats, partial(_get_inverses, key))
+
+    try:
+        return _traverse_with_key(geojson_obj, _densify_geometry, stats)
+    except InfValCoordinateError as e:
+        raise geometry_inf_val_error(e) from e
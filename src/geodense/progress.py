@@ -0,0 +1,183 @@
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import TYPE_CHECKING, TextIO
+
+from geodense.models import DenseStats, format_mebibytes
+
+if TYPE_CHECKING:
+    from rich.progress import Progress, TaskID
+
+DEFAULT_PROGRESS_INTERVAL = 1.0  # seconds between progress updates
+
+
+class ProgressReporter:
+    """Reports progress of densify or density-check on stderr, by polling the counters of DenseStats from a background thread.
+
+    Renders a rich progress bar when stream is a terminal, otherwise writes a line of plain text per interval. Since
+    the counters are polled, processing is not slowed down by rendering, and no reporter needs to exist when progress
+    reporting is disabled.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: "ProgressReporter",
+        stats: DenseStats,
+        description: str,
+        total_features: int | None = None,
+        total_vertices: int | None = None,
+        interval: float = DEFAULT_PROGRESS_INTERVAL,
+        stream: TextIO | None = None,
+    ) -> None:
+        self.stats = stats
+        self.description = description
+        self.total_features = total_features
+        self.total_vertices = total_vertices
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stderr
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="geodense-progress", daemon=True)
+        self._start_time = time.monotonic()
+        self._rich_progress: Progress | None = None
+        self._rich_task_id: TaskID | None = None
+
+    def __enter__(self: "ProgressReporter") -> "ProgressReporter":
+        self._start_time = time.monotonic()
+        if self.stream.isatty():
+            self._start_rich_progress()
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self: "ProgressReporter",
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._render()
+        if self._rich_progress is not None:
+            self._rich_progress.stop()
+
+    def vertices_per_second(self: "ProgressReporter") -> float:
+        elapsed = time.monotonic() - self._start_time
+        return self.stats.vertices / elapsed if elapsed > 0 else 0.0
+
+    def message(self: "ProgressReporter") -> str:
+        elapsed = time.monotonic() - self._start_time
+        vertices_per_second = self.vertices_per_second()
+        features = f"{self.stats.features}" + (f"/{self.total_features}" if self.total_features is not None else "")
+        vertices = f"{self.stats.vertices}" + (f"/{self.total_vertices}" if self.total_vertices is not None else "")
+        return f"{self.description}: {features} features, {vertices} vertices, {vertices_per_second:.0f} vertices/s, {elapsed:.1f}s elapsed"
+
+    def _run(self: "ProgressReporter") -> None:
+        while not self._stop.wait(self.interval):
+            self._render()
+
+    def _render(self: "ProgressReporter") -> None:
+        if self._rich_progress is not None and self._rich_task_id is not None:
+            self._rich_progress.update(
+                self._rich_task_id,
+                completed=self.stats.vertices,
+                features=self.stats.features,
+                vertices_per_second=f"{self.vertices_per_second():.0f}",
+            )
+            self._rich_progress.refresh()
+        else:
+            self.stream.write(self.message() + "\n")
+            self.stream.flush()
+
+    def _start_rich_progress(self: "ProgressReporter") -> None:
+        # rich is a dependency of rich-argparse, only imported when rendering to a terminal
+        from rich.console import Console
+        from rich.progress import (
+            BarColumn,
+            Progress,
+            TaskProgressColumn,
+            TextColumn,
+            TimeElapsedColumn,
+            TimeRemainingColumn,
+        )
+
+        self._rich_progress = Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TextColumn("{task.fields[features]} features"),
+            TextColumn("{task.completed:.0f} vertices"),
+            TextColumn("{task.fields[vertices_per_second]} vertices/s"),
+            TimeElapsedColumn(),
+            TimeRemainingColumn(),
+            console=Console(file=self.stream),
+            auto_refresh=False,
+        )
+        self._rich_task_id = self._rich_progress.add_task(
+            self.description, total=self.total_vertices, features=0, vertices_per_second="0"
+        )
+        self._rich_progress.start()
+
+
+class MemoryStats:
+    """Memory usage per stage of densify or density-check, traced with tracemalloc, and peak RSS of the process.
+
+    Used as context manager, tracing starts on enter and the report is written to stream on exit. When not enabled,
+    nothing is traced or reported. Tracing allocations slows down processing considerably.
+    """
+
+    def __init__(self: "MemoryStats", enabled: bool = True, stream: TextIO | None = None) -> None:
+        self.enabled = enabled
+        self.stream = stream if stream is not None else sys.stderr
+        self.stages: list[tuple[str, int, int]] = []  # stage name, traced bytes at end of stage, peak traced bytes
+        self._started_tracing = False
+
+    def __enter__(self: "MemoryStats") -> "MemoryStats":
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(
+        self: "MemoryStats",
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self.enabled and exc_type is None:
+            self.stream.write(self.message() + "\n")
+
+    @contextmanager
+    def stage(self: "MemoryStats", name: str) -> Iterator[None]:
+        """Record traced memory at the end of the stage and the peak of traced memory during the stage."""
+        if not self.enabled or not tracemalloc.is_tracing():
+            yield
+            return
+        tracemalloc.reset_peak()
+        yield
+        current, peak = tracemalloc.get_traced_memory()
+        self.stages.append((name, current, peak))
+
+    def message(self: "MemoryStats") -> str:
+        lines = [
+            f"memory {name}: peak {format_mebibytes(peak)}, retained {format_mebibytes(current)}"
+            for name, current, peak in self.stages
+        ]
+        peak_rss = get_peak_rss()
+        lines.append(f"memory peak RSS: {format_mebibytes(peak_rss) if peak_rss is not None else 'unknown'}")
+        return "\n".join(lines)
+
+
+def get_peak_rss() -> int | None:
+    """Peak resident set size of the process in bytes, None when not available on platform."""
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # bytes on macOS, kilobytes on Linux
@@ -0,0 +1,115 @@
+import io
+import json
+from typing import cast
+
+from pydantic import BaseModel
+from pyproj import CRS
+
+from geodense.geojson import CrsFeatureCollection
+from geodense.lib import (
+    check_density_report_segments,
+    densify_geojson_object,
+    dict_to_geojson,
+    geojson_to_json_raw,
+    text_to_geojson_raw,
+    write_density_report,
+)
+from geodense.models import DenseConfig, DenseStats, GeodenseError, RawGeojson
+from geodense.types import GeojsonObject, ReportFormat
+
+
+class Densifier:
+    """Reusable densify and density-check session for a source CRS and set of parameters, with in-memory JSON input and output.
+
+    The DenseConfig, and with it the pyproj objects (created once per thread), is built once and reused for every
+    call, and no filesystem access is needed, so a Densifier can serve many requests of a web service. Input is a
+    GeoJSON FeatureCollection, Feature or Geometry as (UTF-8 encoded) JSON bytes, a crs member of the input must match
+    src_crs. See densify_file and check_density_file for the parameters.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: "Densifier",
+        src_crs: str,
+        max_segment_length: float | None = None,
+        in_projection: bool = False,
+        tolerance: float | None = None,
+        dst_crs: str | None = None,
+        threads: int | None = None,
+        raw_passthrough: bool = False,
+    ) -> None:
+        self.src_crs = src_crs
+        self.dst_crs = dst_crs
+        self.threads = threads
+        self.raw_passthrough = raw_passthrough
+        self.config = DenseConfig(
+            CRS.from_authority(*src_crs.split(":")),
+            max_segment_length,
+            in_projection,
+            tolerance,
+            CRS.from_authority(*dst_crs.split(":")) if dst_crs is not None else None,
+        )
+
+    def densify_bytes(self: "Densifier", data: bytes, stats: DenseStats | None = None) -> bytes:
+        """Densify GeoJSON in data, returns densified GeoJSON as JSON bytes."""
+        raw_geojson: RawGeojson | None = None
+        if self.raw_passthrough:
+            geojson_obj, raw_geojson = text_to_geojson_raw(data.decode("utf-8"))
+        else:
+            geojson_obj = self._parse(data)
+        self._validate_crs(geojson_obj)
+        geojson_t = densify_geojson_object(self.config, geojson_obj, stats, self.threads)
+        if isinstance(geojson_t, CrsFeatureCollection):
+            geojson_t.set_crs_auth_code(self.dst_crs or self.src_crs)
+        if raw_geojson is not None:
+            return geojson_to_json_raw(raw_geojson, geojson_obj, geojson_t, self.dst_crs is not None).encode("utf-8")
+        return cast(BaseModel, geojson_t).model_dump_json(indent=1, exclude_none=True).encode("utf-8")
+
+    def check_bytes(
+        self: "Densifier",
+        data: bytes,
+        report_format: ReportFormat = "geojson",
+        report_geometry: bool = False,
+        stats: DenseStats | None = None,
+    ) -> tuple[bool, bytes, int]:
+        """Check density of GeoJSON in data, returns check status, report and nr of failed line segments.
+
+        The report is empty when the check succeeds, see check_density_file for the report formats.
+        """
+        geojson_obj = self._parse(data)
+        self._validate_crs(geojson_obj)
+        report = _ReportBuffer()
+        failed_segment_count = write_density_report(
+            check_density_report_segments(self.config, geojson_obj, stats, self.threads),
+            lambda _: report,  # newlines are not translated by StringIO, as in a file opened with newline=""
+            report_format,
+            report_geometry,
+            self.src_crs,
+        )
+        return failed_segment_count == 0, report.value.encode("utf-8"), failed_segment_count
+
+    def _parse(self: "Densifier", data: bytes) -> GeojsonObject:
+        try:
+            src_json = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise GeodenseError(f"received invalid JSON: {e}") from e
+        return dict_to_geojson(src_json)
+
+    def _validate_crs(self: "Densifier", geojson_obj: GeojsonObject) -> None:
+        if not isinstance(geojson_obj, CrsFeatureCollection):
+            return
+        crs = geojson_obj.get_crs_auth_code()
+        if crs is not None and crs != self.src_crs:
+            raise GeodenseError(f"crs of GeoJSON {crs} does not match src_crs {self.src_crs} of Densifier")
+
+
+class _ReportBuffer(io.StringIO):
+    """StringIO that keeps its value after close, since the report is closed when written."""
+
+    def __init__(self: "_ReportBuffer") -> None:
+        super().__init__()
+        self.value = ""
+
+    def close(self: "_ReportBuffer") -> None:
+        if not self.closed:
+            self.value = self.getvalue()
+        super().close()
@@ -0,0 +1,128 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import sys
+import threading
+from typing import BinaryIO, TextIO
+
+# compression format: (file extension, magic bytes)
+COMPRESSION_FORMATS: dict[str, tuple[str, bytes]] = {
+    "gzip": (".gz", b"\x1f\x8b"),
+    "bz2": (".bz2", b"BZh"),
+    "xz": (".xz", b"\xfd7zXZ\x00"),
+}
+WRITE_BUFFER_SIZE = 2**20  # bytes handed to background compression thread at once
+WRITE_QUEUE_SIZE = 16  # max nr of buffers waiting for background compression thread
+
+
+def strip_compression_ext(path: str) -> str:
+    """Returns path without extension of compression format, e.g. foo.geojson for foo.geojson.gz."""
+    base, _ = os.path.splitext(path)
+    return base if get_compression(path) is not None else path
+
+
+def get_compression(path: str) -> str | None:
+    """Compression format of path by file extension, None when not compressed."""
+    _, ext = os.path.splitext(path)
+    return next((name for name, (name_ext, _) in COMPRESSION_FORMATS.items() if ext == name_ext), None)
+
+
+def detect_compression(header: bytes) -> str | None:
+    """Compression format by magic bytes at start of file, None when not compressed."""
+    return next((name for name, (_, magic) in COMPRESSION_FORMATS.items() if header.startswith(magic)), None)
+
+
+def open_input(path: str) -> TextIO:
+    """Open input file as text, or stdin when path is "-", decompressing input compressed with one of COMPRESSION_FORMATS.
+
+    The compression format is determined by file extension, or else by magic bytes at the start of the input. Files are
+    decoded as UTF-8, whether compressed or not.
+    """
+    if path == "-":
+        stdin_buffer: io.BufferedReader | None = getattr(sys.stdin, "buffer", None)
+        if stdin_buffer is None:  # stdin replaced by text stream
+            return sys.stdin
+        compression = detect_compression(stdin_buffer.peek(8))
+        return (
+            sys.stdin
+            if compression is None
+            else io.TextIOWrapper(_open_compressed(stdin_buffer, compression, "rb"), encoding="utf-8")
+        )
+
+    binary = open(path, "rb")  # noqa: SIM115
+    compression = get_compression(path) or detect_compression(binary.peek(8))
+    if compression is None:
+        return io.TextIOWrapper(binary, encoding="utf-8")
+    return io.TextIOWrapper(_open_compressed(binary, compression, "rb"), encoding="utf-8")
+
+
+def open_output(path: str, newline: str | None = None) -> TextIO:
+    """Open output file as text, or stdout when path is "-", compressing output when extension of path is one of COMPRESSION_FORMATS.
+
+    Compression runs on a background thread, so it overlaps with producing the output.
+    """
+    if path == "-":
+        return sys.stdout
+    compression = get_compression(path)
+    if compression is None:
+        return open(path, "w", encoding="utf-8", newline=newline)  # noqa: SIM115
+    writer = BackgroundWriter(_open_compressed(path, compression, "wb"))
+    return io.TextIOWrapper(io.BufferedWriter(writer, WRITE_BUFFER_SIZE), encoding="utf-8", newline=newline)
+
+
+def _open_compressed(file: str | BinaryIO, compression: str, mode: str) -> BinaryIO:
+    if compression == "gzip":
+        return gzip.open(file, mode)  # type: ignore[return-value]
+    if compression == "bz2":
+        return bz2.open(file, mode)  # type: ignore[return-value]
+    return lzma.open(file, mode)  # type: ignore[return-value]
+
+
+class BackgroundWriter(io.RawIOBase):
+    """Writable raw stream passing written bytes to a background thread, that writes them to target and closes target on close.
+
+    Compressors release the GIL, so compressing on the background thread overlaps with the thread producing the output.
+    Exceptions raised by target are reraised on the next write or on close.
+    """
+
+    def __init__(self: "BackgroundWriter", target: BinaryIO) -> None:
+        self._target = target
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._exception: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="geodense-writer", daemon=True)
+        self._thread.start()
+
+    def writable(self: "BackgroundWriter") -> bool:
+        return True
+
+    def write(self: "BackgroundWriter", b: bytes | bytearray | memoryview) -> int:  # type: ignore[override]
+        self._raise_exception()
+        self._queue.put(bytes(b))
+        return len(b)
+
+    def close(self: "BackgroundWriter") -> None:
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            super().close()
+            self._raise_exception()
+
+    def _run(self: "BackgroundWriter") -> None:
+        while (data := self._queue.get()) is not None:
+            if self._exception is not None:  # keep consuming queue after exception, so writer is not blocked
+                continue
+            try:
+                self._target.write(data)
+            except BaseException as e:
+                self._exception = e
+        try:
+            self._target.close()
+        except BaseException as e:
+            self._exception = self._exception or e
+
+    def _raise_exception(self: "BackgroundWriter") -> None:
+        if self._exception is not None:
+            raise self._exception
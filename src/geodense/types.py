@@ -1,5 +1,5 @@
 from collections.abc import Sequence
-from typing import TypeAlias, TypeVar
+from typing import Literal, TypeAlias, TypeVar
 
 from geojson_pydantic import (
     Feature,
@@ -36,3 +36,11 @@ GeojsonCoordinates: TypeAlias = (
 Nested: TypeAlias = Sequence[T | None | "Nested"]
 
 ReportLineString = tuple[float, tuple[Position, Position]]
+
+# feature index, part index, segment index, segment length, segment
+ReportSegment = tuple[int, int, int, float, tuple[Position, Position]]
+
+# start point in base geographic crs, azimuth and geodesic distance of line segment
+GeodesicInverse = tuple[tuple[float, float], float, float]
+
+ReportFormat: TypeAlias = Literal["geojson", "ndjson", "csv"]
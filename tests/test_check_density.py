@@ -1,18 +1,36 @@
+import csv
+import json
+import math
 import os
+import random
 from functools import partial
 from unittest import mock
 
 import pytest
 from geojson_pydantic import Feature
-from pyproj import CRS
+from pyproj import CRS, Proj
 
+from geodense.filters import FeatureFilter
 from geodense.lib import (
+    SCALE_FACTOR_SAFETY_FACTOR,
     _flatten,
+    _geodesic_distance_upper_bound,
+    _get_bbox,
+    _get_geometries,
+    _get_linestrings,
+    _get_min_scale_factor,
+    bbox_may_exceed_max_segment_length,
+    check_density_features,
     check_density_file,
+    check_density_geojson_object,
     check_density_geometry,
+    check_density_report_segments,
+    sample_density_file,
+    sample_density_geojson_object,
+    textio_to_geojson,
     transform_geojson_geometries,
 )
-from geodense.models import DenseConfig, GeodenseError
+from geodense.models import DenseConfig, DenseStats, GeodenseError
 from geodense.types import Nested, ReportLineString
 
 
@@ -86,3 +104,390 @@ def test_densify_file_exception(linestring_3d_feature_gj):
         match=r"unable to calculate geodesic distance, output calculation geodesic distance: nan, expected: floating-point number",
     ):
         _: Nested[ReportLineString] = transform_geojson_geometries(feature, _check_density_geometry)
+
+
+def test_geodesic_distance_upper_bound_is_conservative():
+    geod = CRS.from_epsg(4258).get_geod()
+    rnd = random.Random(42)  # noqa: S311
+    for _ in range(10000):
+        a = (rnd.uniform(-180, 180), rnd.uniform(-90, 90))
+        scale = rnd.choice([1e-5, 1e-3, 1e-1, 10])
+        b = (a[0] + rnd.uniform(-scale, scale), max(-90, min(90, a[1] + rnd.uniform(-scale, scale))))
+        _, _, dist = geod.inv(*a, *b)
+        assert _geodesic_distance_upper_bound(a, b, geod) >= dist
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length"),
+    [
+        ("linestrings.json", "EPSG:28992", 100),
+        ("linestrings.json", "EPSG:28992", 200.001),
+        ("linestrings_4326.json", "OGC:CRS84", 200),
+        ("polygon_feature_with_holes.json", "EPSG:28992", 5000),
+        ("linestring_3d_feature.json", "EPSG:7415", 500),
+    ],
+)
+def test_check_density_fast_reject_equals_exact(test_dir, input_file, src_crs, max_segment_length):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_user_input(src_crs), max_segment_length)
+
+    report = check_density_geojson_object(d_conf, geojson_obj)
+    with mock.patch("geodense.lib._geodesic_distance_upper_bound", mock.MagicMock(return_value=float("inf"))):
+        report_exact = check_density_geojson_object(d_conf, geojson_obj)
+
+    assert report == report_exact
+
+
+def test_min_scale_factor_includes_safety_factor(test_dir):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_epsg(28992))
+    bbox = _get_bbox(geojson_obj)
+    min_scale_factor = _get_min_scale_factor(d_conf, bbox)
+    assert min_scale_factor is not None
+
+    rnd = random.Random(42)  # noqa: S311
+    xs = [rnd.uniform(bbox[0], bbox[2]) for _ in range(1000)]
+    ys = [rnd.uniform(bbox[1], bbox[3]) for _ in range(1000)]
+    lons, lats = d_conf.transformer.transform(xs, ys)
+    min_sampled = min(Proj(d_conf.src_crs).get_factors(lons, lats).tissot_semiminor)
+    assert min_sampled * SCALE_FACTOR_SAFETY_FACTOR >= min_scale_factor
+
+
+@pytest.mark.parametrize(
+    ("crs", "expectation"),
+    [("EPSG:28992", True), ("EPSG:7415", True), ("EPSG:2263", False)],  # EPSG:2263 has unit US survey foot
+)
+def test_min_scale_factor_only_metric_crs(crs, expectation):
+    d_conf = DenseConfig(CRS.from_user_input(crs))
+    bbox = (1000.0, 1000.0, 2000.0, 2000.0)
+    assert (_get_min_scale_factor(d_conf, bbox) is not None) == expectation
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", 200),
+        ("linestrings.json", "EPSG:28992", 199.9),
+        ("linestrings_3d.json", "EPSG:7415", 100),
+    ],
+)
+def test_check_density_scale_factor_equals_exact(test_dir, input_file, src_crs, max_segment_length):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_user_input(src_crs), max_segment_length)
+
+    report = check_density_geojson_object(d_conf, geojson_obj)
+    with mock.patch("geodense.lib._get_min_scale_factor", mock.MagicMock(return_value=None)):
+        report_exact = check_density_geojson_object(d_conf, geojson_obj)
+
+    assert len(report.features) > 0
+    assert report == report_exact
+
+
+def test_bbox_may_exceed_max_segment_length_is_conservative():
+    d_conf = DenseConfig(CRS.from_epsg(4258), 1000)
+    geod = d_conf.geod
+    rnd = random.Random(42)  # noqa: S311
+    for _ in range(2000):
+        x_min, y_min = rnd.uniform(-180, 179.9), rnd.uniform(-90, 89.9)
+        bbox = (x_min, y_min, x_min + rnd.uniform(0, 0.02), min(90, y_min + rnd.uniform(0, 0.02)))
+        if bbox_may_exceed_max_segment_length(d_conf, bbox, None):
+            continue
+        _, _, diagonal_1 = geod.inv(bbox[0], bbox[1], bbox[2], bbox[3])
+        _, _, diagonal_2 = geod.inv(bbox[0], bbox[3], bbox[2], bbox[1])
+        _, _, bottom = geod.inv(bbox[0], bbox[1], bbox[2], bbox[1])
+        _, _, top = geod.inv(bbox[0], bbox[3], bbox[2], bbox[3])
+        assert max(diagonal_1, diagonal_2, bottom, top) <= d_conf.max_segment_length
+
+
+@pytest.mark.parametrize(
+    ("max_segment_length", "expected_skipped_geometries"),
+    [(200, 0), (20000, 7), (60000, 40)],
+)
+def test_check_density_bbox_prefilter(test_dir, max_segment_length, expected_skipped_geometries):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_epsg(28992), max_segment_length)
+
+    stats = DenseStats()
+    report = check_density_geojson_object(d_conf, geojson_obj, stats)
+    with mock.patch("geodense.lib.bbox_may_exceed_max_segment_length", mock.MagicMock(return_value=True)):
+        report_no_prefilter = check_density_geojson_object(d_conf, geojson_obj)
+
+    assert stats.geometries == 40  # noqa: PLR2004
+    assert stats.skipped_geometries == expected_skipped_geometries
+    assert report == report_no_prefilter
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", 200),
+        ("linestrings.json", "EPSG:28992", 199.9),
+        ("linestrings_3d.json", "EPSG:7415", 200),
+        ("feature-geometry-collection.json", "EPSG:28992", 10),
+    ],
+)
+def test_check_density_threads_equals_serial(test_dir, input_file, src_crs, max_segment_length):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_user_input(src_crs), max_segment_length)
+
+    report = check_density_geojson_object(d_conf, geojson_obj)
+    report_threads = check_density_geojson_object(d_conf, geojson_obj, threads=4)
+
+    assert len(report.features) > 0
+    assert report == report_threads
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", 200),
+        ("gemeenten-40.json", "EPSG:28992", 20000),
+        ("linestrings_3d.json", "EPSG:7415", 200),
+    ],
+)
+@mock.patch("geodense.lib.LINESTRING_CHUNK_SIZE", 25)
+def test_check_density_threads_chunked_linestrings_equals_serial(test_dir, input_file, src_crs, max_segment_length):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_user_input(src_crs), max_segment_length)
+
+    stats = DenseStats()
+    stats_threads = DenseStats()
+    report = check_density_geojson_object(d_conf, geojson_obj, stats)
+    report_threads = check_density_geojson_object(d_conf, geojson_obj, stats_threads, threads=4)
+
+    assert report == report_threads
+    assert [stats.geometries, stats.skipped_geometries, stats.linestrings, stats.skipped_linestrings] == [
+        stats_threads.geometries,
+        stats_threads.skipped_geometries,
+        stats_threads.linestrings,
+        stats_threads.skipped_linestrings,
+    ]
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length"),
+    [
+        ("fc-geometry-collection.json", "EPSG:28992", 100),
+        ("multipolygon.json", "EPSG:7415", 1000),
+        ("polygon_feature_with_holes.json", "EPSG:28992", 5000),
+        ("gemeenten-40.json", "EPSG:28992", 5000),
+    ],
+)
+def test_check_density_report_segments_indices(test_dir, input_file, src_crs, max_segment_length):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_user_input(src_crs), max_segment_length)
+    features = geojson_obj.features if hasattr(geojson_obj, "features") else [geojson_obj]
+
+    report_segments = list(check_density_report_segments(d_conf, geojson_obj))
+
+    assert len(report_segments) == len(check_density_geojson_object(d_conf, geojson_obj).features)
+    for feature_index, part_index, segment_index, _, segment in report_segments:
+        linestrings = [
+            ls for g in _get_geometries(features[feature_index].geometry) for ls in _get_linestrings(g.coordinates)
+        ]
+        linestring = linestrings[part_index]
+        assert segment == (linestring[segment_index], linestring[segment_index + 1])
+
+
+@mock.patch("geodense.lib.LINESTRING_CHUNK_SIZE", 25)
+def test_check_density_report_segments_threads_equals_serial(test_dir):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_epsg(28992), 200)
+
+    assert list(check_density_report_segments(d_conf, geojson_obj)) == list(
+        check_density_report_segments(d_conf, geojson_obj, threads=4)
+    )
+
+
+@pytest.mark.parametrize("report_geometry", [True, False])
+def test_check_density_file_ndjson_report(tmpdir, test_dir, report_geometry):
+    report_path = os.path.join(tmpdir, "report.ndjson")
+    result, _, nr_segments = check_density_file(
+        os.path.join(test_dir, "data/fc-geometry-collection.json"),
+        100,
+        report_path,
+        report_format="ndjson",
+        report_geometry=report_geometry,
+    )
+
+    with open(report_path) as f:
+        records = [json.loads(line) for line in f]
+    assert not result
+    assert len(records) == nr_segments
+    assert records[0]["feature_index"] == 0
+    assert records[0]["part_index"] == 0
+    assert records[0]["segment_index"] == 0
+    assert records[0]["segment_length"] > 100  # noqa: PLR2004
+    assert ("geometry" in records[0]) is report_geometry
+
+
+@pytest.mark.parametrize("report_geometry", [True, False])
+def test_check_density_file_csv_report(tmpdir, test_dir, report_geometry):
+    report_path = os.path.join(tmpdir, "report.csv")
+    result, _, nr_segments = check_density_file(
+        os.path.join(test_dir, "data/linestrings.json"),
+        100,
+        report_path,
+        report_format="csv",
+        report_geometry=report_geometry,
+    )
+
+    with open(report_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert not result
+    assert len(rows) == nr_segments
+    assert float(rows[0]["segment_length"]) > 100  # noqa: PLR2004
+    assert rows[0]["wkt"].startswith("LINESTRING") if report_geometry else "wkt" not in rows[0]
+
+
+def test_check_density_file_compact_report_not_written_when_ok(tmpdir, test_dir):
+    report_path = os.path.join(tmpdir, "report.csv")
+    result, _, nr_segments = check_density_file(
+        os.path.join(test_dir, "data/linestrings.json"), 1000000, report_path, report_format="csv"
+    )
+
+    assert result
+    assert nr_segments == 0
+    assert not os.path.exists(report_path)
+
+
+def test_check_density_file_report_extension_mismatch(tmpdir, test_dir):
+    with pytest.raises(
+        GeodenseError,
+        match=r"unsupported file extension of density-check report for report format csv, received: .json",
+    ):
+        check_density_file(
+            os.path.join(test_dir, "data/linestrings.json"),
+            100,
+            os.path.join(tmpdir, "report.json"),
+            report_format="csv",
+        )
+
+
+@pytest.mark.parametrize("use_bbox", [True, False])
+def test_check_density_features_equals_report_segments(test_dir, use_bbox):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+        f.seek(0)
+        features_json = json.load(f)["features"]
+    c = DenseConfig(CRS.from_epsg(28992), 1000)
+    bbox = _get_bbox(geojson_obj) if use_bbox else None
+
+    result = list(check_density_features(c, (feature for feature in features_json), bbox=bbox))
+
+    assert len(result) == len(features_json)
+    assert [segment for segments in result for segment in segments] == list(
+        check_density_report_segments(c, geojson_obj)
+    )
+
+
+def test_check_density_features_feature_outside_bbox_raises(test_dir):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(CRS.from_epsg(28992), 1000)
+    x_min, y_min, x_max, y_max = _get_bbox(geojson_obj)
+
+    with pytest.raises(GeodenseError, match=r"of feature \d+ is not within bbox"):
+        list(check_density_features(c, geojson_obj.features, bbox=(x_min + 1000, y_min, x_max, y_max)))
+
+
+@pytest.mark.parametrize("threads", [None, 2])
+def test_check_density_feature_filter(test_dir, threads):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(CRS.from_epsg(28992), 100)
+    selected = {i for i, f in enumerate(geojson_obj.features) if f.properties["ligt_in_provincie_code"] == "28"}
+    stats = DenseStats()
+
+    result = list(
+        check_density_report_segments(c, geojson_obj, stats, threads, FeatureFilter(['ligt_in_provincie_code="28"']))
+    )
+
+    expected = [segment for segment in check_density_report_segments(c, geojson_obj) if segment[0] in selected]
+    assert len(expected) > 0
+    assert result == expected
+    assert stats.unselected_features == len(geojson_obj.features) - len(selected)
+
+
+def test_check_density_file_feature_filter(test_dir):
+    in_file = os.path.join(test_dir, "data/linestrings.json")
+
+    result, report_path, nr_segments = check_density_file(in_file, 100, bbox=(0, 0, 1, 1))
+
+    assert result
+    assert report_path is None
+    assert nr_segments == 0
+
+
+@pytest.mark.parametrize(("max_segment_length", "sample"), [(200, 0.1), (1000, 0.1), (200, 2000)])
+def test_sample_density_estimates_failure_rate(test_dir, max_segment_length, sample):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(CRS.from_epsg(28992), max_segment_length)
+    failed_segments = len(list(check_density_report_segments(c, geojson_obj)))
+
+    result = sample_density_geojson_object(c, geojson_obj, sample)
+
+    expected_rate = failed_segments / result.nr_segments
+    assert result.nr_segments == sum(
+        len(ls) - 1
+        for f in geojson_obj.features
+        for g in _get_geometries(f.geometry)
+        for ls in _get_linestrings(g.coordinates)
+    )
+    assert result.sample_size == (math.ceil(sample * result.nr_segments) if sample < 1 else sample)
+    assert result.failed_samples > 0
+    assert result.lower <= expected_rate <= result.upper
+    assert result.failure_rate == pytest.approx(expected_rate, rel=0.25)
+
+
+def test_sample_density_same_seed_same_result(test_dir):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(CRS.from_epsg(28992), 200)
+
+    result = [vars(sample_density_geojson_object(c, geojson_obj, 500, seed)) for seed in (1, 1, 2)]
+
+    assert result[0] == result[1]
+    assert result[0] != result[2]
+
+
+def test_sample_density_no_failures_upper_bound(test_dir):
+    with open(os.path.join(test_dir, "data", "linestrings.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(CRS.from_epsg(28992), 20000)
+
+    result = sample_density_geojson_object(c, geojson_obj, 100)
+
+    assert (result.failed_samples, result.failure_rate, result.lower) == (0, 0, 0)
+    assert result.upper == pytest.approx(1 - 0.05 ** (1 / 100))
+
+
+def test_sample_density_sample_capped_at_nr_segments(test_dir):
+    with open(os.path.join(test_dir, "data", "linestrings.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(CRS.from_epsg(28992), 100)
+
+    result = sample_density_geojson_object(c, geojson_obj, 10**9)
+
+    assert result.sample_size == result.nr_segments
+
+
+@pytest.mark.parametrize("sample", [0, -0.5, 1.5])
+def test_sample_density_invalid_sample_raises(test_dir, sample):
+    with pytest.raises(GeodenseError, match=r"sample should be a fraction between 0 and 1, or a whole nr"):
+        sample_density_file(os.path.join(test_dir, "data", "linestrings.json"), 100, sample)
+
+
+def test_sample_density_file_feature_filter(test_dir):
+    result = sample_density_file(os.path.join(test_dir, "data", "linestrings.json"), 100, 0.5, bbox=(0, 0, 1, 1))
+
+    assert (result.nr_segments, result.sample_size, result.failed_samples) == (0, 0, 0)
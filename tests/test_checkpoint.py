@@ -0,0 +1,138 @@
+import json
+import os
+import pkgutil
+from unittest import mock
+
+import pytest
+
+from geodense.checkpoint import get_checkpoint_path
+from geodense.lib import _densify_geojson_object, densify_file
+from geodense.models import GeodenseError
+
+
+def _densify_interrupted(in_file, out_file, nr_batches, **kwargs):
+    """Densify with checkpoints, interrupted while densifying batch nr_batches + 1."""
+    nr_calls = 0
+
+    def _densify_or_interrupt(*args, **kwargs):
+        nonlocal nr_calls
+        nr_calls += 1
+        if nr_calls > nr_batches:
+            raise KeyboardInterrupt
+        return _densify_geojson_object(*args, **kwargs)
+
+    with (
+        mock.patch("geodense.lib._densify_geojson_object", side_effect=_densify_or_interrupt),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        densify_file(in_file, out_file, **kwargs)
+
+
+@pytest.mark.parametrize("dst_crs", [None, "EPSG:4258"])
+def test_densify_file_checkpoint_equals_densify_file(tmpdir, test_dir, dst_crs):
+    in_file = os.path.join(test_dir, "data", "gemeenten-40.json")
+    out_file = os.path.join(tmpdir, "out.json")
+    out_file_checkpoint = os.path.join(tmpdir, "out_checkpoint.json")
+    densify_file(in_file, out_file, max_segment_length=200, dst_crs=dst_crs)
+
+    densify_file(in_file, out_file_checkpoint, max_segment_length=200, dst_crs=dst_crs, checkpoint_interval=7)
+
+    with open(out_file) as f, open(out_file_checkpoint) as f_checkpoint:
+        assert json.load(f_checkpoint) == json.load(f)
+    assert not os.path.exists(get_checkpoint_path(out_file_checkpoint))
+
+
+@pytest.mark.parametrize("nr_batches", [0, 1, 3])
+def test_densify_file_resume(tmpdir, test_dir, nr_batches):
+    in_file = os.path.join(test_dir, "data", "gemeenten-40.json")
+    out_file = os.path.join(tmpdir, "out.json")
+    out_file_resumed = os.path.join(tmpdir, "out_resumed.json")
+    densify_file(in_file, out_file, max_segment_length=200, checkpoint_interval=10)
+    _densify_interrupted(in_file, out_file_resumed, nr_batches, max_segment_length=200, checkpoint_interval=10)
+    with open(get_checkpoint_path(out_file_resumed)) as f:
+        checkpoints = [json.loads(line) for line in f]
+    with open(out_file_resumed, "a") as f:
+        f.write(',\n{"type": "Feature", "geom')  # output written after last checkpoint
+
+    densify_file(in_file, out_file_resumed, max_segment_length=200, checkpoint_interval=10, resume=True)
+
+    assert [c["feature_index"] for c in checkpoints] == [10 * (i + 1) - 1 for i in range(nr_batches)]
+    with open(out_file) as f, open(out_file_resumed) as f_resumed:
+        assert f_resumed.read() == f.read()
+    assert not os.path.exists(get_checkpoint_path(out_file_resumed))
+
+
+def test_densify_file_resume_partial_checkpoint_record(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "out.json")
+    out_file_resumed = os.path.join(tmpdir, "out_resumed.json")
+    densify_file(in_file, out_file, max_segment_length=100, checkpoint_interval=2)
+    _densify_interrupted(in_file, out_file_resumed, 2, max_segment_length=100, checkpoint_interval=2)
+    with open(get_checkpoint_path(out_file_resumed), "a") as f:
+        f.write('{"feature_index": 5, "input_off')
+
+    densify_file(in_file, out_file_resumed, max_segment_length=100, checkpoint_interval=2, resume=True)
+
+    with open(out_file) as f, open(out_file_resumed) as f_resumed:
+        assert f_resumed.read() == f.read()
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        ({"max_segment_length": 100}, r"cannot resume, input file or parameters differ from those of the checkpoint"),
+        ({"max_segment_length": 200, "dst_crs": "EPSG:4258"}, r"cannot resume, input file or parameters differ"),
+    ],
+)
+def test_densify_file_resume_different_parameters_raises(tmpdir, test_dir, kwargs, expected):
+    in_file = os.path.join(test_dir, "data", "gemeenten-40.json")
+    out_file = os.path.join(tmpdir, "out.json")
+    _densify_interrupted(in_file, out_file, 1, max_segment_length=200, checkpoint_interval=10)
+
+    with pytest.raises(GeodenseError, match=expected):
+        densify_file(in_file, out_file, checkpoint_interval=10, resume=True, **kwargs)
+
+
+def test_densify_file_resume_without_checkpoint_raises(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "out.json")
+    densify_file(in_file, out_file, max_segment_length=100, checkpoint_interval=2)
+
+    with pytest.raises(GeodenseError, match=r"cannot resume, no checkpoint file .+ found, the output is complete"):
+        densify_file(in_file, out_file, max_segment_length=100, resume=True)
+
+
+@pytest.mark.parametrize(
+    ("input_file", "output_file", "kwargs", "expected"),
+    [
+        ("linestrings.json", "out.json.gz", {}, r"checkpoints require an uncompressed output file"),
+        ("linestrings.json", "out.json", {"raw_passthrough": True}, r"raw_passthrough cannot be combined with"),
+        ("geometry.json", "out.json", {"src_crs": "EPSG:28992"}, r"checkpoints require GeoJSON FeatureCollection"),
+    ],
+)
+def test_densify_file_checkpoint_invalid_args_raises(tmpdir, test_dir, input_file, output_file, kwargs, expected):  # noqa: PLR0913
+    with pytest.raises(GeodenseError, match=expected):
+        densify_file(
+            os.path.join(test_dir, "data", input_file),
+            os.path.join(tmpdir, output_file),
+            checkpoint_interval=2,
+            **kwargs,
+        )
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "pool"),
+    [({"threads": 2}, "geodense.lib.ThreadPoolExecutor"), ({"processes": 2}, "geodense.multiprocess.get_process_pool")],
+)
+def test_densify_file_checkpoint_starts_worker_pool_once(tmpdir, test_dir, kwargs, pool):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "out.json")
+    out_file_checkpoint = os.path.join(tmpdir, "out_checkpoint.json")
+    densify_file(in_file, out_file, max_segment_length=100)
+
+    with mock.patch(pool, wraps=pkgutil.resolve_name(pool)) as pool_mock:
+        densify_file(in_file, out_file_checkpoint, max_segment_length=100, checkpoint_interval=2, **kwargs)
+
+    assert pool_mock.call_count == 1
+    with open(out_file) as f, open(out_file_checkpoint) as f_checkpoint:
+        assert json.load(f_checkpoint) == json.load(f)
@@ -9,7 +9,7 @@ import pytest
 from cli_test_helpers import ArgvContext
 
 import geodense
-from geodense.main import check_density_cmd, main
+from geodense.main import check_density_cmd, densify_cmd, main
 from geodense.models import DEFAULT_MAX_SEGMENT_LENGTH, GeodenseError
 
 
@@ -40,6 +40,183 @@ def test_cli_densify_cmd(mock_command, tmpdir, test_dir):
     assert mock_command.called
 
 
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_tolerance(mock_command, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, "--tolerance", "0.01"):
+        main()
+
+    assert mock_command.call_args.kwargs["tolerance"] == 0.01  # noqa: PLR2004
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_dst_crs(mock_command, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, "--dst-crs", "EPSG:4258"):
+        main()
+
+    assert mock_command.call_args.kwargs["dst_crs"] == "EPSG:4258"
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_threads(mock_command, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, "--threads", "4"):
+        main()
+
+    assert mock_command.call_args.kwargs["threads"] == 4  # noqa: PLR2004
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_progress(mock_command, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, "--progress"):
+        main()
+
+    assert mock_command.call_args.kwargs["progress"] is True
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_compressed_files(mock_command, tmpdir):
+    in_filepath = os.path.join(tmpdir, "linestrings.json.gz")
+    out_filepath = os.path.join(tmpdir, "linestrings.geojson.xz")
+    with open(in_filepath, "wb"):
+        pass
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath):
+        main()
+
+    assert mock_command.call_args.kwargs["input_file"] == in_filepath
+    assert mock_command.call_args.kwargs["output_file"] == out_filepath
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_raw_passthrough(mock_command, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, "--raw-passthrough"):
+        main()
+
+    assert mock_command.call_args.kwargs["raw_passthrough"] is True
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_estimate(mock_command, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, "--estimate"):
+        main()
+
+    assert mock_command.call_args.kwargs["estimate"] is True
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_estimate_without_output_file(mock_command, test_dir):
+    with ArgvContext("geodense", "densify", f"{test_dir}/data/linestrings.json", "--estimate"):
+        main()
+
+    assert mock_command.call_args.kwargs["output_file"] is None
+    assert mock_command.call_args.kwargs["estimate"] is True
+
+
+def test_densify_cmd_without_output_file_exits(test_dir):
+    with pytest.raises(SystemExit) as cm:
+        densify_cmd(f"{test_dir}/data/linestrings.json", None, max_segment_length=100)
+
+    assert cm.value.code == 1
+
+
+@pytest.mark.parametrize(
+    ("option", "expected_message"),
+    [
+        (["--max-output-vertices", "1"], "--max-output-vertices"),
+        (["--checkpoint"], "--checkpoint"),
+        (["--resume"], "--resume"),
+        (["--progress"], "--progress"),
+        (["--memory-stats"], "--memory-stats"),
+    ],
+)
+def test_cli_densify_cmd_estimate_unsupported_options(test_dir, caplog, option, expected_message):
+    with (
+        ArgvContext("geodense", "densify", f"{test_dir}/data/linestrings.json", "--estimate", "-m", "100", *option),
+        pytest.raises(SystemExit) as cm,
+    ):
+        main()
+
+    assert cm.value.code == 1
+    assert f"--estimate cannot be combined with {expected_message}" in caplog.text
+
+
+@pytest.mark.parametrize(
+    ("options", "expected_output"),
+    [
+        ([], r"^estimated output: 2756 vertices \(input: 1383 vertices\)"),
+        (["--bbox", "0,0,1,1"], r"^estimated output: 1383 vertices \(input: 1383 vertices\)"),
+        (["--bbox", "0,0,1,1", "--drop-unselected"], r"^estimated output: 0 vertices \(input: 0 vertices\)"),
+    ],
+)
+def test_cli_densify_cmd_estimate_selected_features(test_dir, capsys, options, expected_output):
+    with ArgvContext("geodense", "densify", f"{test_dir}/data/linestrings.json", "--estimate", "-m", "100", *options):
+        main()
+
+    assert re.match(expected_output, capsys.readouterr().out)
+
+
+def test_densify_cmd_estimate_does_not_write_output(tmpdir, test_dir, capsys):
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    densify_cmd(f"{test_dir}/data/linestrings.json", out_filepath, max_segment_length=100, estimate=True)
+
+    assert re.match(r"^estimated output: 2756 vertices \(input: 1383 vertices\)", capsys.readouterr().out)
+    assert not os.path.exists(out_filepath)
+
+
+@patch("geodense.main.check_density_cmd")
+def test_cli_check_density_cmd_memory_stats(mock_command, test_dir):
+    with ArgvContext("geodense", "check-density", f"{test_dir}/data/linestrings.json", "--memory-stats"):
+        main()
+
+    assert mock_command.call_args.kwargs["memory_stats"] is True
+
+
+@patch("geodense.main.check_density_cmd")
+def test_cli_check_density_cmd_threads(mock_command, test_dir):
+    with ArgvContext("geodense", "check-density", f"{test_dir}/data/linestrings.json", "-j", "2"):
+        main()
+
+    assert mock_command.call_args.kwargs["threads"] == 2  # noqa: PLR2004
+
+
+@patch("geodense.main.check_density_cmd")
+def test_cli_check_density_cmd_report_format(mock_command, tmpdir, test_dir):
+    report_path = os.path.join(tmpdir, "report.csv")
+    with ArgvContext(
+        "geodense",
+        "check-density",
+        f"{test_dir}/data/linestrings.json",
+        "--report-format",
+        "csv",
+        "--report-geometry",
+        "-r",
+        report_path,
+    ):
+        main()
+
+    assert mock_command.call_args.kwargs["report_format"] == "csv"
+    assert mock_command.call_args.kwargs["report_geometry"] is True
+    assert mock_command.call_args.kwargs["density_check_report_path"] == report_path
+
+
 @patch(
     "geodense.main.check_density_file",
     MagicMock(return_value=(True, "/tmp/bla/foobar.json", 0)),  # noqa: S108
@@ -201,3 +378,134 @@ def test_cli_shows_help_text_invoked_help(capsys):
     out, _ = capsys.readouterr()
     assert re.match(USAGE_REGEX, out)
     assert "show this help message and exit" in out
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_processes(mock_command, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, "--processes", "2"):
+        main()
+
+    assert mock_command.call_args.kwargs["processes"] == 2  # noqa: PLR2004
+
+
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_feature_filter(mock_command, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext(
+        "geodense",
+        "densify",
+        in_filepath,
+        out_filepath,
+        "--where",
+        "type=border",
+        "--where",
+        "level>=2",
+        "--bbox",
+        "100000,400000,200000,500000",
+        "--drop-unselected",
+    ):
+        main()
+
+    assert mock_command.call_args.kwargs["where"] == ["type=border", "level>=2"]
+    assert mock_command.call_args.kwargs["bbox"] == (100000, 400000, 200000, 500000)
+    assert mock_command.call_args.kwargs["drop_unselected"]
+
+
+@pytest.mark.parametrize("bbox", ["1,2,3", "a,b,c,d", "3,0,1,1"])
+def test_cli_check_density_cmd_invalid_bbox(test_dir, bbox):
+    with (
+        ArgvContext("geodense", "check-density", f"{test_dir}/data/linestrings.json", "--bbox", bbox),
+        pytest.raises(SystemExit),
+    ):
+        main()
+
+
+@pytest.mark.parametrize(("args", "expected"), [(["--checkpoint"], 1000), (["--checkpoint", "50"], 50), ([], None)])
+@patch("geodense.main.densify_cmd")
+def test_cli_densify_cmd_checkpoint(mock_command, tmpdir, test_dir, args, expected):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, *args, "--resume"):
+        main()
+
+    assert mock_command.call_args.kwargs["checkpoint_interval"] == expected
+    assert mock_command.call_args.kwargs["resume"]
+
+
+@patch("geodense.main.densify_file_multi")
+def test_cli_densify_cmd_multiple_max_segment_lengths(mock_densify_file_multi, tmpdir, test_dir):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with ArgvContext("geodense", "densify", in_filepath, out_filepath, "--max-segment-length", "50,200,1000"):
+        main()
+
+    assert mock_densify_file_multi.call_args.args[0:3] == (in_filepath, out_filepath, [50, 200, 1000])
+
+
+def test_cli_densify_cmd_multiple_max_segment_lengths_unsupported_option(tmpdir, test_dir, caplog):
+    in_filepath = f"{test_dir}/data/linestrings.json"
+    out_filepath = os.path.join(tmpdir, "linestrings.json")
+
+    with (
+        ArgvContext("geodense", "densify", in_filepath, out_filepath, "-m", "50,200", "--threads", "2"),
+        pytest.raises(SystemExit),
+    ):
+        main()
+
+    assert "multiple max segment lengths cannot be combined with --threads" in caplog.text
+
+
+@pytest.mark.parametrize(("max_segment_length", "expected_exit_code"), [(100, 1), (20000, 0)])
+def test_check_density_cmd_sample(test_dir, max_segment_length, expected_exit_code, capsys):
+    input_file = os.path.join(test_dir, "data", "linestrings.json")
+
+    with pytest.raises(SystemExit) as cm:
+        check_density_cmd(input_file, max_segment_length, src_crs="EPSG:28992", sample=0.2, seed=1)
+
+    assert cm.value.code == expected_exit_code
+    assert re.search(
+        r"estimated [\d.]+% of 1373 line segments exceed max-segment-length \(95% confidence interval",
+        capsys.readouterr().out,
+    )
+
+
+@patch("geodense.main.check_density_cmd")
+def test_cli_check_density_cmd_sample(mock_command, test_dir):
+    with ArgvContext(
+        "geodense", "check-density", f"{test_dir}/data/linestrings.json", "--sample", "0.01", "--seed", "3"
+    ):
+        main()
+
+    assert mock_command.call_args.kwargs["sample"] == 0.01  # noqa: PLR2004
+    assert mock_command.call_args.kwargs["seed"] == 3  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ("option", "expected_message"),
+    [
+        (["-r", "report.json"], "--density-check-report-path"),
+        (["--report-format", "csv"], "--report-format"),
+        (["--report-geometry"], "--report-geometry"),
+        (["--threads", "2"], "--threads"),
+        (["--progress"], "--progress"),
+        (["--memory-stats"], "--memory-stats"),
+    ],
+)
+def test_cli_check_density_cmd_sample_unsupported_options(test_dir, tmpdir, caplog, option, expected_message):
+    if option[0] == "-r":
+        option = ["-r", os.path.join(tmpdir, option[1])]
+    with (
+        ArgvContext("geodense", "check-density", f"{test_dir}/data/linestrings.json", "--sample", "0.1", *option),
+        pytest.raises(SystemExit) as cm,
+    ):
+        main()
+
+    assert cm.value.code == 1
+    assert f"--sample cannot be combined with {expected_message}" in caplog.text
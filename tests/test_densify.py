@@ -1,20 +1,37 @@
+import io
 import json
 import os
 import re
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext as does_not_raise
 from contextlib import suppress
+from itertools import pairwise
+from unittest import mock
 
 import pyproj
 import pytest
+from geojson_pydantic import Feature, LineString, Polygon
+from geojson_pydantic.types import Position2D
 
+from geodense.filters import FeatureFilter
+from geodense.geojson import CrsFeatureCollection
 from geodense.lib import (
-    _get_intermediate_nr_points_and_segment_length,
+    _count_linestring_vertices,
+    _estimate_linestring_cost,
+    _get_bbox,
+    _split_linestring_by_cost,
+    densify_features,
     densify_file,
     densify_geojson_object,
+    estimate_densify_geojson_object,
+    geojson_to_json_raw,
+    get_intermediate_nr_points_and_segment_length,
+    interpolate_geodesic,
+    text_to_geojson_raw,
     textio_to_geojson,
 )
-from geodense.models import DenseConfig, GeodenseError
+from geodense.models import DenseConfig, DenseStats, GeodenseError
 
 
 @pytest.mark.parametrize(
@@ -62,6 +79,27 @@ def test_linestring_d10_transformed(linestring_d10_feature_gj):
     assert len(feature_t.geometry.coordinates) == feature_t_coord_length
 
 
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length"),
+    [
+        ("linestrings.json", "EPSG:28992", 100),
+        ("linestrings.json", "EPSG:28992", 200),
+        ("linestrings_4326.json", "OGC:CRS84", 150),
+        ("polygon_feature_with_holes.json", "EPSG:28992", 1000),
+    ],
+)
+def test_densify_fast_reject_equals_exact(test_dir, input_file, src_crs, max_segment_length):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(pyproj.CRS.from_user_input(src_crs), max_segment_length)
+
+    geojson_t = densify_geojson_object(c, geojson_obj)
+    with mock.patch("geodense.lib._geodesic_distance_upper_bound", mock.MagicMock(return_value=float("inf"))):
+        geojson_t_exact = densify_geojson_object(c, geojson_obj)
+
+    assert geojson_t == geojson_t_exact
+
+
 def test_linestring_d10_no_op(linestring_d10_feature_gj):
     feature = linestring_d10_feature_gj
 
@@ -77,6 +115,38 @@ def test_linestring_d10_no_op(linestring_d10_feature_gj):
     assert len(feature_t_in_proj.geometry.coordinates) == len(feature.geometry.coordinates)
 
 
+def test_linestring_d10_bbox_prefilter_untouched(linestring_d10_feature_gj):
+    feature = linestring_d10_feature_gj
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 15)
+    stats = DenseStats()
+
+    feature_t = densify_geojson_object(c, feature, stats)
+
+    assert stats.skipped_geometries == 1
+    assert stats.linestrings == 0
+    assert feature_t.geometry.coordinates == feature.geometry.coordinates
+
+
+def test_polygon_bbox_prefilter_rings():
+    polygon = Polygon(
+        type="Polygon",
+        coordinates=[
+            [(0, 0), (1000, 0), (1000, 1000), (0, 1000), (0, 0)],
+            [(10.12345678, 10), (20, 10), (20, 20), (10.12345678, 10)],
+        ],
+    )
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 100, True)
+    stats = DenseStats()
+
+    polygon_t = densify_geojson_object(c, polygon, stats)
+
+    assert stats.skipped_geometries == 0
+    assert stats.linestrings == 2  # noqa: PLR2004
+    assert stats.skipped_linestrings == 1
+    assert len(polygon_t.coordinates[0]) > len(polygon.coordinates[0])
+    assert polygon_t.coordinates[1] == polygon.coordinates[1]  # untouched, so not rounded
+
+
 def test_linestring_transformed(linestring_feature_gj):
     feature = linestring_feature_gj
 
@@ -158,7 +228,7 @@ def test_maxlinesegment_param(linestring_feature_gj):
 )
 def test_get_intermediate_nr_points_and_segment_length(input_args, expectation):
     # test distance > max_segment_length
-    result = _get_intermediate_nr_points_and_segment_length(*input_args)
+    result = get_intermediate_nr_points_and_segment_length(*input_args)
     assert result == expectation
 
 
@@ -184,7 +254,7 @@ def test_get_intermediate_nr_points_and_segment_length(input_args, expectation):
 )
 def test_get_intermediate_nr_points_and_segment_length_raises(input_args, expectation):
     with expectation:
-        _get_intermediate_nr_points_and_segment_length(*input_args)
+        get_intermediate_nr_points_and_segment_length(*input_args)
 
 
 def test_densify_file(test_dir):
@@ -223,6 +293,372 @@ def test_densify_file_crs_matches_input(test_dir, input_file, src_crs, expectati
         assert crs == expectation
 
 
+def test_densify_file_tolerance(tmpdir, test_dir):
+    in_file = "linestring_feature.json"
+    out_file = os.path.join(tmpdir, in_file)
+    out_file_tolerance = os.path.join(tmpdir, f"tolerance-{in_file}")
+    densify_file(os.path.join(test_dir, "data", in_file), out_file, src_crs="EPSG:28992")
+    densify_file(os.path.join(test_dir, "data", in_file), out_file_tolerance, src_crs="EPSG:28992", tolerance=0.001)
+
+    with open(out_file) as f, open(out_file_tolerance) as f_tolerance:
+        nr_vertices = len(json.load(f)["geometry"]["coordinates"])
+        nr_vertices_tolerance = len(json.load(f_tolerance)["geometry"]["coordinates"])
+    assert 2 < nr_vertices_tolerance < nr_vertices  # noqa: PLR2004
+
+
+def test_densify_file_dst_crs(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "linestrings.json")
+    densify_file(in_file, out_file, dst_crs="EPSG:4258")
+
+    with open(in_file) as f:
+        geojson_obj = densify_geojson_object(DenseConfig(pyproj.CRS.from_epsg(28992)), textio_to_geojson(f))
+    transformer = pyproj.Transformer.from_crs("EPSG:28992", "EPSG:4258", always_xy=True)
+    with open(out_file) as f:
+        geojson_obj_t = json.load(f)
+
+    assert geojson_obj_t["crs"]["properties"]["name"] == "urn:ogc:def:crs:EPSG::4258"
+    for ft, ft_t in zip(geojson_obj.features, geojson_obj_t["features"], strict=True):
+        coords = ft.geometry.coordinates
+        coords_t = ft_t["geometry"]["coordinates"]
+        assert len(coords) == len(coords_t)
+        for pos, pos_t in zip(coords, coords_t, strict=True):
+            assert transformer.transform(*pos) == pytest.approx(tuple(pos_t), abs=1e-9)
+
+
+def test_densify_dst_crs_infinite_coordinates_drops_geometry():
+    feature = Feature(
+        type="Feature",
+        properties={},
+        geometry=LineString(type="LineString", coordinates=[(-170, -52), (-169, -52)]),
+    )
+    c = DenseConfig(
+        pyproj.CRS.from_epsg(4258), 1000, dst_crs=pyproj.CRS.from_epsg(3035)
+    )  # LAEA Europe, antipode of projection center cannot be projected
+
+    feature_t = densify_geojson_object(c, feature)
+
+    assert feature_t.geometry is None
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", 200),
+        ("linestrings.json", "EPSG:28992", 100),
+        ("linestrings_3d.json", "EPSG:7415", 200),
+        ("polygon_feature_with_holes.json", "EPSG:28992", 1000),
+        ("feature-geometry-collection.json", "EPSG:28992", 200),
+        ("geometry.json", "EPSG:28992", 200),
+    ],
+)
+def test_densify_threads_equals_serial(test_dir, input_file, src_crs, max_segment_length):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(pyproj.CRS.from_user_input(src_crs), max_segment_length)
+
+    stats = DenseStats()
+    geojson_t = densify_geojson_object(c, geojson_obj)
+    geojson_t_threads = densify_geojson_object(c, geojson_obj, stats, threads=4)
+
+    assert geojson_t == geojson_t_threads
+    assert stats.linestrings > 0
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length", "dst_crs"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", 1000, None),
+        ("gemeenten-40.json", "EPSG:28992", 60000, "EPSG:4258"),  # all geometries skipped by prefilter
+        ("linestrings_3d.json", "EPSG:7415", 200, None),
+        ("linestrings.json", "EPSG:28992", 100, None),
+        ("polygon_feature_with_holes.json", "EPSG:28992", 1000, "EPSG:4258"),
+    ],
+)
+@mock.patch("geodense.lib.LINESTRING_CHUNK_SIZE", 25)
+def test_densify_threads_chunked_linestrings_equals_serial(test_dir, input_file, src_crs, max_segment_length, dst_crs):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(
+        pyproj.CRS.from_user_input(src_crs),
+        max_segment_length,
+        dst_crs=pyproj.CRS.from_user_input(dst_crs) if dst_crs is not None else None,
+    )
+
+    stats = DenseStats()
+    stats_threads = DenseStats()
+    geojson_t = densify_geojson_object(c, geojson_obj, stats)
+    geojson_t_threads = densify_geojson_object(c, geojson_obj, stats_threads, threads=4)
+
+    assert geojson_t == geojson_t_threads
+    assert [stats.geometries, stats.skipped_geometries, stats.linestrings, stats.skipped_linestrings] == [
+        stats_threads.geometries,
+        stats_threads.skipped_geometries,
+        stats_threads.linestrings,
+        stats_threads.skipped_linestrings,
+    ]
+
+
+def test_densify_threads_long_linestring_equals_serial():
+    coords = [(100000 + i * 150, 450000 + (i % 7) * 90) for i in range(25001)]
+    feature = Feature(type="Feature", properties={}, geometry=LineString(type="LineString", coordinates=coords))
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 100)
+
+    with mock.patch("geodense.lib.LINESTRING_CHUNK_SIZE", 1000):
+        feature_t_threads = densify_geojson_object(c, feature, threads=4)
+    feature_t = densify_geojson_object(c, feature)
+
+    assert feature_t == feature_t_threads
+
+
+def test_densify_threads_skewed_features_balanced():
+    coastline = [(100000 + i * 150, 450000 + (i % 7) * 90) for i in range(5001)]
+    parcels = [[(100000 + i * 10, 400000), (100000 + i * 10, 400150)] for i in range(200)]
+    features = [
+        Feature(type="Feature", properties={}, geometry=LineString(type="LineString", coordinates=coords))
+        for coords in [*parcels[0:100], coastline, *parcels[100:]]
+    ]
+    fc = CrsFeatureCollection(type="FeatureCollection", features=features)
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 100)
+
+    stats = DenseStats()
+    fc_t_threads = densify_geojson_object(c, fc, stats, threads=4)
+    fc_t = densify_geojson_object(c, fc)
+
+    assert fc_t == fc_t_threads
+    assert stats.work_units > len(features)  # coastline is split in vertex ranges
+    assert stats.threads == 4  # noqa: PLR2004
+    assert stats.balance() is not None
+    assert re.match(r"^scheduled \d+ work units on 4 threads, balance \d\.\d\d", stats.balance_message())
+
+
+def test_split_linestring_by_cost():
+    linestring = [Position2D(i * 1000, 0) for i in range(101)]
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 100)
+
+    ranges = _split_linestring_by_cost(c, linestring, 100, densify=True)
+
+    assert [(start, end) for start, end, _ in ranges] == [*pairwise(range(0, 100, 9)), (99, 100)]
+    assert all(cost <= 100 for _, _, cost in ranges)  # noqa: PLR2004
+    assert sum(cost for _, _, cost in ranges) == pytest.approx(
+        _estimate_linestring_cost(c, linestring, 0, 100, densify=True) + len(ranges) - 1
+    )
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "config_args"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", {"max_segment_length": 200}),
+        ("linestrings.json", "EPSG:28992", {"max_segment_length": 100, "in_projection": True}),
+        ("linestrings_3d.json", "EPSG:7415", {"max_segment_length": 200}),
+        ("polygon_feature_with_holes.json", "EPSG:28992", {"max_segment_length": 1000}),
+        ("feature-geometry-collection.json", "EPSG:28992", {"max_segment_length": 10}),
+    ],
+)
+def test_estimate_densify_output_vertices(test_dir, input_file, src_crs, config_args):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(pyproj.CRS.from_user_input(src_crs), **config_args)
+
+    estimate = estimate_densify_geojson_object(c, geojson_obj)
+    geojson_t = densify_geojson_object(c, geojson_obj)
+
+    assert estimate.input_vertices == _count_linestring_vertices(geojson_obj)
+    assert estimate.output_vertices == _count_linestring_vertices(geojson_t)
+    assert estimate.output_vertices > estimate.input_vertices
+    assert estimate.output_bytes > 0
+    assert estimate.seconds is not None
+
+
+def test_estimate_densify_tolerance_raises(linestring_feature_gj):
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), tolerance=0.01)
+
+    with pytest.raises(GeodenseError, match=r"cannot estimate output of adaptive densification"):
+        estimate_densify_geojson_object(c, linestring_feature_gj)
+
+
+def test_densify_file_max_output_vertices(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "linestrings.json")
+
+    with pytest.raises(
+        GeodenseError, match=r"^estimated nr of output vertices 2756 exceeds max_output_vertices 2755, increase"
+    ):
+        densify_file(in_file, out_file, max_segment_length=100, max_output_vertices=2755)
+    assert not os.path.exists(out_file)
+
+    densify_file(in_file, out_file, max_segment_length=100, max_output_vertices=2756)
+    assert os.path.exists(out_file)
+
+
+def test_densify_features_equals_densify_geojson_object(test_dir):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        features_json = json.load(f)["features"]
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 200)
+    fc = CrsFeatureCollection(type="FeatureCollection", features=features_json)
+
+    stats = DenseStats()
+    features_t = list(densify_features(c, (feature for feature in features_json), stats, _get_bbox(fc)))
+
+    assert features_t == densify_geojson_object(c, fc).features
+    assert stats.features == len(features_json)
+
+
+def test_densify_features_is_lazy(linestring_feature_gj):
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 10)
+
+    def _features():
+        yield linestring_feature_gj
+        raise AssertionError("second feature should not be read")
+
+    feature_t = next(densify_features(c, _features()))
+
+    assert len(feature_t.geometry.coordinates) > len(linestring_feature_gj.geometry.coordinates)
+
+
+def test_densify_features_invalid_feature_raises():
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 10)
+
+    with pytest.raises(GeodenseError, match=r"expected GeoJSON Feature, received: LineString"):
+        list(densify_features(c, [{"type": "LineString", "coordinates": [[0, 0], [100, 100]]}]))
+
+
+def test_densify_features_feature_outside_bbox_raises(linestring_feature_gj):
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 10)
+
+    with pytest.raises(GeodenseError, match=r"of feature 0 is not within bbox \(0, 0, 1, 1\), bbox should contain"):
+        list(densify_features(c, [linestring_feature_gj], bbox=(0, 0, 1, 1)))
+
+
+def test_densify_features_only_points_raises(point_feature_gj):
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 10)
+
+    with pytest.raises(GeodenseError, match=r"cannot run densify on GeoJSON that only contains \(Multi\)Point"):
+        list(densify_features(c, [point_feature_gj, point_feature_gj]))
+
+
+def test_densify_threads_infinite_coordinates_drops_geometry():
+    feature = Feature(
+        type="Feature",
+        properties={},
+        geometry=LineString(type="LineString", coordinates=[(-170, -52), (-169, -52)]),
+    )
+    c = DenseConfig(pyproj.CRS.from_epsg(4258), 1000, dst_crs=pyproj.CRS.from_epsg(3035))
+
+    feature_t = densify_geojson_object(c, feature, threads=2)
+
+    assert feature_t.geometry is None
+
+
+def test_densify_geometry_infinite_coordinates_raises():
+    geometry = LineString(type="LineString", coordinates=[(-170, -52), (-169, -52)])
+    c = DenseConfig(pyproj.CRS.from_epsg(4258), 1000, dst_crs=pyproj.CRS.from_epsg(3035))
+
+    with pytest.raises(GeodenseError, match=r"resulted in infinite coordinates, unlike the geometry of a Feature"):
+        densify_geojson_object(c, geometry)
+
+
+def test_dense_config_pyproj_objects_thread_local():
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 200)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        transformer_worker, geod_worker = executor.submit(lambda: (c.transformer, c.geod)).result()
+
+    assert c.transformer is c.transformer
+    assert c.transformer is not transformer_worker
+    assert c.geod is not geod_worker
+
+
+@pytest.mark.parametrize(
+    ("src_crs", "kwargs", "expected"),
+    [
+        (28992, {}, (True, False, True, 4, None)),
+        (4258, {}, (True, False, False, 9, None)),
+        (28992, {"in_projection": True}, (False, True, True, 4, None)),
+        (28992, {"tolerance": 1}, (False, False, True, 4, None)),
+        (4258, {"dst_crs": pyproj.CRS.from_epsg(3035)}, (True, False, False, 9, 4)),
+    ],
+)
+def test_dense_config_kernel(src_crs, kwargs, expected):
+    c = DenseConfig(pyproj.CRS.from_epsg(src_crs), 200, **kwargs)
+
+    kernel = c.kernel
+
+    assert (
+        kernel.geodesic,
+        kernel.in_projection,
+        kernel.is_projected,
+        kernel.precision,
+        kernel.dst_precision,
+    ) == expected
+    assert (kernel.transformer is not None, kernel.back_transformer is not None) == (kernel.is_projected,) * 2
+    assert (kernel.geod, kernel.transformer, kernel.dst_transformer) == (c.geod, c.transformer, c.dst_transformer)
+    assert c.kernel is kernel
+
+
+def test_dense_config_kernel_thread_local_and_per_max_segment_length():
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 200)
+    kernel = c.kernel
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        kernel_worker = executor.submit(lambda: c.kernel).result()
+    kernel_copy = c.with_max_segment_length(50).kernel
+
+    assert kernel_worker.transformer is not kernel.transformer
+    assert (kernel_copy.max_segment_length, kernel.max_segment_length) == (50, 200)
+    assert kernel_copy.transformer is kernel.transformer
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("max_segment_length", 100),
+        ("tolerance", 1),
+        ("dst_crs", pyproj.CRS.from_epsg(4258)),
+        ("src_crs", pyproj.CRS.from_epsg(3035)),
+    ],
+)
+def test_dense_config_kernel_follows_field_changes(field, value):
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 1000)
+    expected = DenseConfig(pyproj.CRS.from_epsg(28992), 1000)
+    setattr(expected, field, value)
+    a, b = Position2D(100000, 400000), Position2D(105000, 400000)
+    _ = interpolate_geodesic(a, b, c)
+
+    setattr(c, field, value)
+
+    assert c.kernel[:7] == expected.kernel[:7]  # resolved fields, without pyproj objects
+    assert (c.kernel.dst_transformer is None) == (expected.kernel.dst_transformer is None)
+    assert interpolate_geodesic(a, b, c) == interpolate_geodesic(a, b, expected)
+
+
+def test_dense_config_set_pyproj_objects():
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 200)
+    geod = pyproj.Geod(ellps="WGS84")
+    dst_transformer = pyproj.Transformer.from_crs(28992, 4258, always_xy=True)
+
+    c.geod = geod
+    c.dst_transformer = dst_transformer
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        geod_worker = executor.submit(lambda: c.geod).result()
+    assert (c.geod, c.kernel.geod, geod_worker) == (geod, geod, geod)
+    assert c.kernel.dst_transformer is dst_transformer
+    assert c.transformer is not None
+    assert c.with_max_segment_length(50).geod is geod
+
+
+def test_densify_file_threads(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "linestrings.json")
+    out_file_threads = os.path.join(tmpdir, "linestrings_threads.json")
+    densify_file(in_file, out_file, max_segment_length=100)
+    densify_file(in_file, out_file_threads, max_segment_length=100, threads=3)
+
+    with open(out_file) as f, open(out_file_threads) as f_threads:
+        assert f.read() == f_threads.read()
+
+
 def test_densify_file_negative(tmpdir, test_dir):
     in_file = "linestrings.json"
     out_file = os.path.join(tmpdir, in_file)
@@ -345,3 +781,198 @@ def test_densify_file_json_no_crs_outputs_message_stderr(caplog, test_dir, tmpdi
     assert re.match(
         expected_warning, output
     ), f"stderr expected message is: {expected_warning}, actual message was: {output}"
+
+
+RAW_FEATURE_COLLECTION = """{
+  "type": "FeatureCollection",
+  "name": "raw",
+  "crs": {"type": "name", "properties": {"name": "urn:ogc:def:crs:EPSG::28992"}},
+  "features": [
+    {"type": "Feature", "id": 1, "properties": {"length": 1.50, "count": 1E5, "name": "\\u00e9\u00e9n"},
+     "geometry": {"type": "LineString", "coordinates": [[100000.0, 400000.0], [101000.0, 400000.0]]}},
+    {"type": "Feature", "properties": {"nested": {"values": [1.0, 2.00]}},
+     "geometry": {"type": "LineString", "coordinates": [[100000.0, 400000.0], [100010.0, 400000.0]]}}
+  ]
+}"""
+
+
+def test_raw_passthrough_keeps_properties_and_unchanged_geometries():
+    geojson_obj, raw_geojson = text_to_geojson_raw(RAW_FEATURE_COLLECTION)
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 200)
+
+    output = geojson_to_json_raw(raw_geojson, geojson_obj, densify_geojson_object(c, geojson_obj))
+
+    assert all(f.properties is None for f in geojson_obj.features)
+    assert '"properties":{"length": 1.50, "count": 1E5, "name": "\\u00e9\u00e9n"}' in output
+    assert '"properties":{"nested": {"values": [1.0, 2.00]}}' in output
+    assert '"geometry":{"type": "LineString", "coordinates": [[100000.0, 400000.0], [100010.0, 400000.0]]}' in output
+    expected = json.loads(
+        densify_geojson_object(c, textio_to_geojson(io.StringIO(RAW_FEATURE_COLLECTION))).model_dump_json()
+    )
+    result = json.loads(output)
+    assert result["features"][0]["geometry"] == expected["features"][0]["geometry"]
+    assert result["features"][0]["id"] == 1
+    assert result["crs"] == json.loads(RAW_FEATURE_COLLECTION)["crs"]
+
+
+def test_raw_passthrough_dst_crs_reencodes_geometries_and_crs():
+    geojson_obj, raw_geojson = text_to_geojson_raw(RAW_FEATURE_COLLECTION)
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 200, dst_crs=pyproj.CRS.from_epsg(4258))
+    geojson_obj_t = densify_geojson_object(c, geojson_obj)
+    geojson_obj_t.set_crs_auth_code("EPSG:4258")
+
+    result = json.loads(geojson_to_json_raw(raw_geojson, geojson_obj, geojson_obj_t, dst_crs=True))
+
+    assert result["crs"]["properties"]["name"] == "urn:ogc:def:crs:EPSG::4258"
+    assert result["features"][1]["geometry"]["coordinates"][0][0] < 180  # noqa: PLR2004
+    assert result["features"][1]["properties"] == {"nested": {"values": [1.0, 2.0]}}
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs"),
+    [
+        ("linestrings.json", None),
+        ("polygon_feature_with_holes.json", "EPSG:28992"),
+        ("fc-geometry-collection.json", None),
+        ("geometry.json", "EPSG:28992"),
+    ],
+)
+def test_densify_file_raw_passthrough(tmpdir, test_dir, input_file, src_crs):
+    in_file = os.path.join(test_dir, "data", input_file)
+    out_file = os.path.join(tmpdir, "out.json")
+    out_file_raw = os.path.join(tmpdir, "out_raw.json")
+    densify_file(in_file, out_file, max_segment_length=100, src_crs=src_crs)
+    densify_file(in_file, out_file_raw, max_segment_length=100, src_crs=src_crs, raw_passthrough=True)
+
+    with open(out_file) as f, open(out_file_raw) as f_raw, open(in_file) as f_in:
+        expected, result, input_json = json.load(f), json.load(f_raw), json.load(f_in)
+    if expected["type"] != "FeatureCollection":
+        assert result == expected
+        return
+    for feature_in, feature_expected, feature in zip(
+        input_json["features"], expected["features"], result["features"], strict=True
+    ):
+        assert feature["properties"] == feature_in["properties"]
+        assert feature["geometry"] == feature_expected["geometry"]
+
+
+def test_text_to_geojson_raw_invalid_json():
+    with pytest.raises(GeodenseError, match=r"received invalid GeoJSON file, Expecting ',' delimiter"):
+        text_to_geojson_raw('{"type": "FeatureCollection" "features": []}')
+
+
+@pytest.mark.parametrize(
+    ("where", "properties", "expected"),
+    [
+        (["code=0603"], {"code": "0603"}, True),  # 0603 is not valid JSON, so compared as string
+        (['code="0603"'], {"code": "0603"}, True),
+        (["type=national_border"], {"type": "national_border"}, True),
+        (["type != national_border"], {"type": "national_border"}, False),
+        (["population>=1000"], {"population": 1000}, True),
+        (["population<1000"], {"population": "many"}, False),
+        (["population<1000"], {}, False),
+        (["admin.level=2"], {"admin": {"level": 2}}, True),
+        (["admin.level=2", "active=true"], {"admin": {"level": 2}, "active": False}, False),
+        (["name=null"], {"name": None}, True),
+    ],
+)
+def test_feature_filter_where(where, properties, expected):
+    assert FeatureFilter(where).matches(properties, (0, 0, 1, 1)) == expected
+
+
+def test_feature_filter_bbox():
+    feature_filter = FeatureFilter(bbox=(0, 0, 10, 10))
+
+    assert feature_filter.matches({}, (10, 10, 20, 20))
+    assert not feature_filter.matches({}, (10.5, 0, 20, 20))
+    assert not feature_filter.matches({}, None)
+
+
+@pytest.mark.parametrize(
+    ("where", "bbox", "expected"),
+    [
+        ([">=1000"], None, r"invalid where predicate: >=1000"),
+        (["population"], None, r"invalid where predicate: population"),
+        (None, (10, 0, 0, 10), r"invalid bbox \(10, 0, 0, 10\)"),
+    ],
+)
+def test_feature_filter_invalid_raises(where, bbox, expected):
+    with pytest.raises(GeodenseError, match=expected):
+        FeatureFilter(where, bbox)
+
+
+@pytest.mark.parametrize("dst_crs", [None, "EPSG:4258"])
+@pytest.mark.parametrize("drop_unselected", [False, True])
+def test_densify_feature_filter(test_dir, dst_crs, drop_unselected):
+    with open(os.path.join(test_dir, "data", "gemeenten-40.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(
+        pyproj.CRS.from_epsg(28992), 200, dst_crs=pyproj.CRS.from_user_input(dst_crs) if dst_crs is not None else None
+    )
+    c_reproject = DenseConfig(pyproj.CRS.from_epsg(28992), 1e9, dst_crs=c.dst_crs)
+    selected = [f.properties["ligt_in_provincie_code"] == "28" for f in geojson_obj.features]
+    stats = DenseStats()
+
+    result = densify_geojson_object(
+        c, geojson_obj, stats, feature_filter=FeatureFilter(['ligt_in_provincie_code="28"'], None, drop_unselected)
+    )
+
+    densified = densify_geojson_object(c, geojson_obj).features
+    passed_through = densify_geojson_object(c_reproject, geojson_obj).features  # only reprojected
+    expected = [
+        feature_t if is_selected else feature_p
+        for feature_t, feature_p, is_selected in zip(densified, passed_through, selected, strict=True)
+        if is_selected or not drop_unselected
+    ]
+    assert 0 < sum(selected) < len(selected)
+    assert result.features == expected
+    assert stats.features == len(selected)
+    assert stats.unselected_features == len(selected) - sum(selected)
+
+
+def test_densify_feature_filter_none_selected(linestring_feature_gj):
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 10)
+
+    result = densify_geojson_object(c, linestring_feature_gj, feature_filter=FeatureFilter(bbox=(0, 0, 1, 1)))
+
+    assert result == linestring_feature_gj
+
+
+def test_densify_feature_filter_geometry_raises(test_dir):
+    with open(os.path.join(test_dir, "data", "geometry.json")) as f:
+        geojson_obj = textio_to_geojson(f)
+
+    with pytest.raises(GeodenseError, match=r"feature filter requires GeoJSON FeatureCollection or Feature input"):
+        densify_geojson_object(
+            DenseConfig(pyproj.CRS.from_epsg(28992), 10), geojson_obj, feature_filter=FeatureFilter(bbox=(0, 0, 1, 1))
+        )
+
+
+def test_densify_file_feature_filter(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "out.json")
+    with open(in_file) as f:
+        geojson_obj = textio_to_geojson(f)
+    bbox = _get_bbox(geojson_obj.features[0])
+
+    densify_file(in_file, out_file, max_segment_length=100, bbox=bbox, drop_unselected=True)
+
+    with open(out_file) as f:
+        result = textio_to_geojson(f)
+    assert len(result.features) < len(geojson_obj.features)
+    assert (
+        result.features[0]
+        == densify_geojson_object(DenseConfig(pyproj.CRS.from_epsg(28992), 100), geojson_obj).features[0]
+    )
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        ({"raw_passthrough": True, "where": ["a=1"]}, r"raw_passthrough cannot be combined with where"),
+        ({"drop_unselected": True}, r"drop_unselected requires where or bbox"),
+    ],
+)
+def test_densify_file_feature_filter_invalid_args_raises(tmpdir, test_dir, kwargs, expected):
+    with pytest.raises(GeodenseError, match=expected):
+        densify_file(os.path.join(test_dir, "data", "linestrings.json"), os.path.join(tmpdir, "out.json"), **kwargs)
@@ -0,0 +1,278 @@
+import importlib
+import io
+import json
+import os
+import sys
+from unittest import mock
+
+import pyproj
+import pytest
+
+from geodense.lib import check_density_report_segments, densify_geojson_object, textio_to_geojson
+from geodense.models import DenseConfig, DenseStats, GeodenseError
+
+pa = pytest.importorskip("pyarrow")
+
+from geodense.geoarrow import (  # noqa: E402
+    check_density_geoarrow,
+    check_density_geoarrow_file,
+    densify_geoarrow,
+    densify_geoarrow_file,
+    get_geometry_column,
+    read_geoarrow_ipc,
+    write_geoarrow_ipc,
+)
+
+GEOMETRY_TYPES = {
+    "LineString": "geoarrow.linestring",
+    "Polygon": "geoarrow.polygon",
+    "MultiPolygon": "geoarrow.multipolygon",
+}
+LIST_LEVELS = {"geoarrow.linestring": 1, "geoarrow.polygon": 2, "geoarrow.multipolygon": 3}
+
+
+def _coordinate_type(dims, interleaved):
+    if interleaved:
+        return pa.list_(pa.field("xyz"[:dims], pa.float64()), dims)
+    return pa.struct([(name, pa.float64()) for name in "xyz"[:dims]])
+
+
+def _geoarrow_type(geometry_type, dims, interleaved):
+    result = _coordinate_type(dims, interleaved)
+    for _ in range(LIST_LEVELS[geometry_type]):
+        result = pa.list_(result)
+    return result
+
+
+def _to_geoarrow_coordinates(coordinates, interleaved):
+    if isinstance(coordinates[0], int | float):
+        return list(coordinates) if interleaved else dict(zip("xyz", coordinates, strict=False))
+    return [_to_geoarrow_coordinates(c, interleaved) for c in coordinates]
+
+
+def _to_geojson_coordinates(coordinates):
+    if isinstance(coordinates, dict):
+        return [coordinates[name] for name in "xyz" if name in coordinates]
+    if isinstance(coordinates[0], float):
+        return coordinates
+    return [_to_geojson_coordinates(c) for c in coordinates]
+
+
+def _to_2d(coordinates):
+    if isinstance(coordinates[0], int | float):
+        return coordinates[0:2]
+    return [_to_2d(c) for c in coordinates]
+
+
+def _read_geojson(test_dir, input_file):
+    """Read GeoJSON test data, positions are made 2D when 2D and 3D positions are mixed, as GeoArrow has one dimension per column."""
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson = json.load(f)
+    features = geojson["features"]
+    if (
+        len(
+            {
+                str(_to_2d(feature["geometry"]["coordinates"])) == str(feature["geometry"]["coordinates"])
+                for feature in features
+            }
+        )
+        > 1
+    ):
+        for feature in features:
+            feature["geometry"]["coordinates"] = _to_2d(feature["geometry"]["coordinates"])
+    return textio_to_geojson(io.StringIO(json.dumps(geojson)))
+
+
+def _to_geoarrow(geojson_obj, interleaved=False):
+    geometries = [json.loads(feature.geometry.model_dump_json()) for feature in geojson_obj.features]
+    geometry_type = GEOMETRY_TYPES[geometries[0]["type"]]
+    dims = len(
+        geojson_obj.features[0].geometry.coordinates[0][0][0]
+        if geometry_type == "geoarrow.multipolygon"
+        else (
+            geojson_obj.features[0].geometry.coordinates[0][0]
+            if geometry_type == "geoarrow.polygon"
+            else geojson_obj.features[0].geometry.coordinates[0]
+        )
+    )
+    array = pa.array(
+        [_to_geoarrow_coordinates(g["coordinates"], interleaved) for g in geometries],
+        type=_geoarrow_type(geometry_type, dims, interleaved),
+    )
+    return array, geometry_type
+
+
+def _geojson_coordinates(geojson_obj):
+    return [
+        json.loads(feature.geometry.model_dump_json())["coordinates"] if feature.geometry is not None else None
+        for feature in geojson_obj.features
+    ]
+
+
+def _geoarrow_coordinates(array):
+    return [_to_geojson_coordinates(g) if g is not None else None for g in array.to_pylist()]
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length", "dst_crs"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", 200, None),
+        ("gemeenten-40.json", "EPSG:28992", 1000, "EPSG:4258"),
+        ("linestrings.json", "EPSG:28992", 100, None),
+        ("linestrings_3d.json", "EPSG:7415", 200, None),
+        ("linestrings_4326.json", "EPSG:4326", 1000, None),
+        ("polygons.json", "EPSG:28992", 500, "EPSG:4258"),
+    ],
+)
+@pytest.mark.parametrize("interleaved", [False, True])
+def test_densify_geoarrow_equals_geojson(test_dir, input_file, src_crs, max_segment_length, dst_crs, interleaved):  # noqa: PLR0913
+    geojson_obj = _read_geojson(test_dir, input_file)
+    array, geometry_type = _to_geoarrow(geojson_obj, interleaved)
+    c = DenseConfig(
+        pyproj.CRS.from_user_input(src_crs),
+        max_segment_length,
+        dst_crs=pyproj.CRS.from_user_input(dst_crs) if dst_crs is not None else None,
+    )
+
+    stats = DenseStats()
+    stats_geoarrow = DenseStats()
+    geojson_t = densify_geojson_object(c, geojson_obj, stats)
+    array_t = densify_geoarrow(c, array, geometry_type, stats_geoarrow)
+
+    assert array_t.type == array.type
+    assert _geoarrow_coordinates(array_t) == _geojson_coordinates(geojson_t)
+    assert [stats.features, stats.geometries, stats.skipped_geometries, stats.linestrings, stats.vertices] == [
+        stats_geoarrow.features,
+        stats_geoarrow.geometries,
+        stats_geoarrow.skipped_geometries,
+        stats_geoarrow.linestrings,
+        stats_geoarrow.vertices,
+    ]
+
+
+def test_densify_geoarrow_in_projection_equals_geojson(test_dir):
+    geojson_obj = _read_geojson(test_dir, "linestrings.json")
+    array, geometry_type = _to_geoarrow(geojson_obj)
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 100, in_projection=True)
+
+    array_t = densify_geoarrow(c, array, geometry_type)
+
+    assert _geoarrow_coordinates(array_t) == _geojson_coordinates(densify_geojson_object(c, geojson_obj))
+
+
+def test_densify_geoarrow_chunked_sliced_and_nulls(test_dir):
+    geojson_obj = _read_geojson(test_dir, "linestrings.json")
+    array, geometry_type = _to_geoarrow(geojson_obj)
+    expected = _geojson_coordinates(densify_geojson_object(DenseConfig(pyproj.CRS.from_epsg(28992), 100), geojson_obj))
+    with_nulls = pa.concat_arrays([array.slice(0, 3), pa.nulls(1, array.type), array.slice(3)])
+    chunked = pa.chunked_array([with_nulls.slice(0, 5), with_nulls.slice(5)])
+
+    chunked_t = densify_geoarrow(DenseConfig(pyproj.CRS.from_epsg(28992), 100), chunked, geometry_type)
+
+    assert chunked_t.num_chunks == 2  # noqa: PLR2004
+    assert _geoarrow_coordinates(chunked_t) == [*expected[0:3], None, *expected[3:]]
+
+
+def test_densify_geoarrow_infinite_coordinates_sets_null():
+    array = pa.array(
+        [[{"x": -170, "y": -52}, {"x": -169, "y": -52}]], type=_geoarrow_type("geoarrow.linestring", 2, False)
+    )
+    c = DenseConfig(pyproj.CRS.from_epsg(4258), 1000, dst_crs=pyproj.CRS.from_epsg(3035))
+
+    array_t = densify_geoarrow(c, array, "geoarrow.linestring")
+
+    assert array_t.to_pylist() == [None]
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "in_projection"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", False),
+        ("linestrings.json", "EPSG:28992", False),
+        ("linestrings.json", "EPSG:28992", True),
+        ("linestrings_3d.json", "EPSG:7415", False),
+    ],
+)
+def test_check_density_geoarrow_equals_geojson(test_dir, input_file, src_crs, in_projection):
+    geojson_obj = _read_geojson(test_dir, input_file)
+    array, geometry_type = _to_geoarrow(geojson_obj)
+    c = DenseConfig(pyproj.CRS.from_user_input(src_crs), 100, in_projection=in_projection)
+
+    expected = list(check_density_report_segments(c, geojson_obj))
+    result = list(check_density_geoarrow(c, array, geometry_type))
+
+    assert len(result) > 0
+    assert [r[0:4] for r in result] == [e[0:4] for e in expected]
+    assert [[list(p) for p in r[4]] for r in result] == [[list(p) for p in e[4]] for e in expected]
+
+
+def test_get_geometry_column():
+    schema = pa.schema(
+        [
+            pa.field("id", pa.int64()),
+            pa.field(
+                "geometry",
+                pa.list_(pa.list_(_coordinate_type(2, False))),
+                metadata={"ARROW:extension:name": "geoarrow.polygon"},
+            ),
+        ]
+    )
+
+    assert get_geometry_column(schema) == (1, "geoarrow.polygon")
+    with pytest.raises(GeodenseError, match=r"unsupported geometry type of column id"):
+        get_geometry_column(schema, "id")
+    with pytest.raises(GeodenseError, match=r"no GeoArrow geometry column found"):
+        get_geometry_column(pa.schema([pa.field("id", pa.int64())]))
+
+
+def _write_geoarrow_file(test_dir, input_file, path):
+    geojson_obj = _read_geojson(test_dir, input_file)
+    array, geometry_type = _to_geoarrow(geojson_obj)
+    metadata = {
+        "ARROW:extension:name": geometry_type,
+        "ARROW:extension:metadata": json.dumps({"crs": pyproj.CRS.from_epsg(28992).to_json_dict()}),
+    }
+    table = pa.table(
+        {"id": pa.array(range(len(array))), "geometry": array},
+        schema=pa.schema([pa.field("id", pa.int64()), pa.field("geometry", array.type, metadata=metadata)]),
+    )
+    write_geoarrow_ipc(table, path)
+    return geojson_obj
+
+
+def test_densify_geoarrow_file(tmpdir, test_dir):
+    in_file = os.path.join(tmpdir, "linestrings.arrow")
+    out_file = os.path.join(tmpdir, "linestrings_densified.arrow")
+    geojson_obj = _write_geoarrow_file(test_dir, "linestrings.json", in_file)
+
+    densify_geoarrow_file(in_file, out_file, max_segment_length=100, dst_crs="EPSG:4258")
+
+    table = read_geoarrow_ipc(out_file)
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 100, dst_crs=pyproj.CRS.from_epsg(4258))
+    field = table.schema.field("geometry")
+    assert table.column("id").to_pylist() == list(range(len(geojson_obj.features)))
+    assert field.metadata[b"ARROW:extension:name"] == b"geoarrow.linestring"
+    assert pyproj.CRS.from_json_dict(json.loads(field.metadata[b"ARROW:extension:metadata"])["crs"]) == c.dst_crs
+    assert _geoarrow_coordinates(table.column("geometry")) == _geojson_coordinates(
+        densify_geojson_object(c, geojson_obj)
+    )
+
+
+def test_check_density_geoarrow_file(tmpdir, test_dir):
+    in_file = os.path.join(tmpdir, "linestrings.arrow")
+    report_file = os.path.join(tmpdir, "report.ndjson")
+    _write_geoarrow_file(test_dir, "linestrings.json", in_file)
+
+    result, report_path, nr_segments = check_density_geoarrow_file(in_file, 100, report_file, report_format="ndjson")
+
+    assert not result
+    assert report_path == report_file
+    with open(report_file) as f:
+        assert len(f.readlines()) == nr_segments > 0
+
+
+def test_import_without_pyarrow_raises_import_error():
+    with mock.patch.dict(sys.modules, {"pyarrow": None, "pyarrow.ipc": None}):
+        sys.modules.pop("geodense.geoarrow")  # restored with sys.modules on exit
+        with pytest.raises(ImportError, match=r"GeoArrow support requires pyarrow"):
+            importlib.import_module("geodense.geoarrow")
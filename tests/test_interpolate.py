@@ -1,4 +1,6 @@
+import random
 from copy import deepcopy
+from itertools import pairwise
 
 import pytest
 from geojson_pydantic.types import Position2D, Position3D
@@ -6,14 +8,21 @@ from pyproj import CRS
 
 from geodense.lib import (
     THREE_DIMENSIONAL,
-    _add_vertices_to_line_segment,
+    _cartesian_distance_to_line,
+    _deviation_from_chord,
+    _get_intermediate_points,
+    _round_coordinates,
     densify_line_segment,
+    densify_vertex_range,
+    interpolate_geodesic,
+    interpolate_geodesic_adaptive,
     interpolate_src_proj,
 )
 from geodense.models import (
     DEFAULT_PRECISION_DEGREES,
     DEFAULT_PRECISION_METERS,
     DenseConfig,
+    GeodenseError,
 )
 
 
@@ -60,7 +69,7 @@ def test_interpolate_round_projected():
     points_proj = [tuple_2_pos(x) for x in [(0.12345678, 0.12345678), (10.12345678, 10.12345678)]]
 
     c = DenseConfig(CRS.from_epsg(28992), 10, True)
-    _add_vertices_to_line_segment(points_proj, 0, c)
+    points_proj = densify_vertex_range(c, points_proj, 0, 1)
 
     assert all(
         [str(x)[::-1].find(".") == DEFAULT_PRECISION_METERS for p in points_proj for x in p]
@@ -80,7 +89,7 @@ def test_interpolate_round_geographic():
     ]
 
     c = DenseConfig(CRS.from_epsg(4258), 10)
-    _add_vertices_to_line_segment(points_geog, 0, c)
+    points_geog = densify_vertex_range(c, points_geog, 0, 1)
 
     assert all(
         [
@@ -134,3 +143,115 @@ def test_interpolate_3d(linestring, in_proj, expectation):
 
     densify_line_segment(c, linestring)
     assert linestring == expectation
+
+
+@pytest.mark.parametrize("tolerance", [1, 0.1, 0.01])
+def test_interpolate_geodesic_adaptive_within_tolerance(tolerance):
+    a, b = tuple_2_pos((10000, 300000)), tuple_2_pos((250000, 600000))
+    c = DenseConfig(CRS.from_epsg(28992), tolerance=tolerance)
+    points_t = interpolate_geodesic_adaptive(a, b, c)
+
+    # every vertex of the (dense) geodesic lies within tolerance of the adaptively densified linestring
+    geodesic = interpolate_geodesic(a, b, DenseConfig(CRS.from_epsg(28992), 1000))
+    linestring = [a, *points_t, b]
+    for p in geodesic:
+        deviation = min(_cartesian_distance_to_line(p, s, e) for s, e in pairwise(linestring))
+        assert deviation <= tolerance
+    assert len(points_t) < len(geodesic)
+
+
+def test_interpolate_geodesic_adaptive_3d():
+    a, b = tuple_2_pos((10000, 300000, 0)), tuple_2_pos((250000, 600000, 100))
+    c = DenseConfig(CRS.from_epsg(7415), tolerance=0.1)
+    points_t = interpolate_geodesic_adaptive(a, b, c)
+    expected_nr_of_points = 7
+    assert len(points_t) == expected_nr_of_points
+    assert [p.altitude for p in points_t] == [12.5 * (i + 1) for i in range(expected_nr_of_points)]
+
+
+def test_interpolate_geodesic_adaptive_short_segment_no_op():
+    points = [tuple_2_pos(x) for x in [(5.0, 52.0), (5.001, 52.001)]]
+    c = DenseConfig(CRS.from_epsg(4258), tolerance=0.01)
+    assert interpolate_geodesic_adaptive(*points, c) == []
+
+
+@pytest.mark.parametrize(
+    ("p", "closest"),
+    [((5.001, 52.2), (5.0, 52.2)), ((5.001, 52.5), (5.0, 52.5)), ((4.999, 51.9), (5.0, 52.0))],
+)
+def test_deviation_from_chord_geographic_is_distance_to_chord(p, closest):
+    c = DenseConfig(CRS.from_epsg(4258), tolerance=0.01)
+    a, b = tuple_2_pos((5.0, 52.0)), tuple_2_pos((5.0, 53.0))
+    _, _, expected = c.geod.inv(*p, *closest)
+
+    assert _deviation_from_chord(tuple_2_pos(p), a, b, c.kernel) == pytest.approx(expected)
+
+
+def test_tolerance_in_projection_raises():
+    with pytest.raises(GeodenseError, match=r"tolerance can only be used with geodesic densification"):
+        DenseConfig(CRS.from_epsg(28992), tolerance=1, in_projection=True)
+
+
+def _densify_line_segment_in_place(c, linestring):
+    """Reference implementation, inserting vertices of each line segment in place with slice assignment."""
+    kernel = c.kernel
+    i = 0
+    while i < len(linestring) - 1:
+        points = [
+            _round_coordinates(p, kernel.precision) for p in _get_intermediate_points(*linestring[i : i + 2], kernel)
+        ]
+        linestring[i] = _round_coordinates(linestring[i], kernel.precision)
+        linestring[i + 1] = _round_coordinates(linestring[i + 1], kernel.precision)
+        linestring[i + 1 : i + 1] = points
+        i += len(points) + 1
+
+
+@pytest.mark.parametrize(("start", "end"), [(0, 4), (0, 2), (2, 4), (1, 3)])
+def test_densify_vertex_range_equals_part_of_linestring(start, end):
+    linestring = [tuple_2_pos(p) for p in [(5.0, 52.0), (5.01, 52.0), (5.01, 52.0001), (5.1, 52.1), (4.9, 52.05)]]
+    c = DenseConfig(CRS.from_epsg(4258), max_segment_length=500)
+    densified = densify_vertex_range(c, linestring, 0, 4)
+    vertex_indices = [densified.index(_round_coordinates(p, c.kernel.precision)) for p in linestring]
+
+    assert densify_vertex_range(c, linestring, start, end) == densified[vertex_indices[start] : vertex_indices[end] + 1]
+
+
+@pytest.mark.parametrize(
+    ("epsg", "config_args", "dimensions"),
+    [
+        (28992, {"max_segment_length": 200}, 2),
+        (28992, {"max_segment_length": 200, "in_projection": True}, 2),
+        (7415, {"max_segment_length": 200}, 3),
+        (7415, {"max_segment_length": 200, "in_projection": True}, 3),
+        (28992, {"tolerance": 0.00001}, 2),
+    ],
+)
+def test_densify_line_segment_equals_in_place_insertion(epsg, config_args, dimensions):
+    rnd = random.Random(42)  # noqa: S311
+    linestring = [tuple_2_pos((155000.123456, 463000.123456, 10.123456)[:dimensions])]
+    for _ in range(100):
+        x, y, *h = linestring[-1]
+        step = rnd.choice([10, 250, 2000])
+        linestring.append(
+            tuple_2_pos((x + rnd.uniform(-step, step), y + rnd.uniform(-step, step), *[z + 1.123456 for z in h]))
+        )
+    linestring_expected = deepcopy(linestring)
+    c = DenseConfig(CRS.from_epsg(epsg), **config_args)
+
+    densify_line_segment(c, linestring)
+    _densify_line_segment_in_place(c, linestring_expected)
+
+    assert len(linestring) > 101  # noqa: PLR2004
+    assert linestring == linestring_expected
+
+
+def test_densify_line_segment_geographic_equals_in_place_insertion():
+    linestring = [tuple_2_pos(p) for p in [(5.0, 52.0), (5.01, 52.0), (5.01, 52.0001), (5.1, 52.1), (4.9, 52.05)]]
+    linestring_expected = deepcopy(linestring)
+    c = DenseConfig(CRS.from_epsg(4258), max_segment_length=500)
+
+    densify_line_segment(c, linestring)
+    _densify_line_segment_in_place(c, linestring_expected)
+
+    assert len(linestring) > 5  # noqa: PLR2004
+    assert linestring == linestring_expected
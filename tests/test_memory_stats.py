@@ -0,0 +1,59 @@
+import io
+import os
+import re
+import tracemalloc
+
+from geodense.lib import check_density_file, densify_file
+from geodense.progress import MemoryStats, get_peak_rss
+
+
+def test_memory_stats_stages():
+    stream = io.StringIO()
+
+    with MemoryStats(stream=stream) as memory:
+        with memory.stage("allocate"):
+            data = bytearray(2**20)
+        with memory.stage("release"):
+            del data
+
+    assert not tracemalloc.is_tracing()
+    assert [name for name, _, _ in memory.stages] == ["allocate", "release"]
+    assert memory.stages[0][2] >= 2**20
+    assert memory.stages[1][1] < memory.stages[0][1]
+    assert re.search(r"^memory allocate: peak \d+\.\d MiB, retained \d+\.\d MiB$", stream.getvalue(), re.MULTILINE)
+    assert re.search(r"^memory peak RSS: \d+\.\d MiB$", stream.getvalue(), re.MULTILINE)
+
+
+def test_memory_stats_disabled():
+    stream = io.StringIO()
+
+    with MemoryStats(enabled=False, stream=stream) as memory, memory.stage("allocate"):
+        assert not tracemalloc.is_tracing()
+
+    assert memory.stages == []
+    assert stream.getvalue() == ""
+
+
+def test_get_peak_rss():
+    peak_rss = get_peak_rss()
+    assert peak_rss is None or peak_rss > 2**20
+
+
+def test_densify_file_memory_stats(tmpdir, test_dir, capsys):
+    densify_file(
+        os.path.join(test_dir, "data", "linestrings.json"),
+        os.path.join(tmpdir, "linestrings.json"),
+        max_segment_length=100,
+        memory_stats=True,
+    )
+
+    captured = capsys.readouterr()
+    assert re.findall(r"^memory (\w+): peak", captured.err, re.MULTILINE) == ["read", "densify", "serialize", "write"]
+    assert "memory peak RSS" in captured.err
+
+
+def test_check_density_file_memory_stats(test_dir, capsys):
+    check_density_file(os.path.join(test_dir, "data", "linestrings.json"), 100, memory_stats=True)
+
+    captured = capsys.readouterr()
+    assert re.findall(r"^memory (\w+): peak", captured.err, re.MULTILINE) == ["read", "check"]
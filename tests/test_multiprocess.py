@@ -0,0 +1,130 @@
+import glob
+import os
+import pickle
+import warnings
+from unittest import mock
+
+import pyproj
+import pytest
+from geojson_pydantic import Feature, LineString
+
+from geodense.geojson import CrsFeatureCollection
+from geodense.lib import densify_file, densify_geojson_object, textio_to_geojson
+from geodense.models import DenseConfig, DenseStats, GeodenseError
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length", "dst_crs"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", 200, None),
+        ("gemeenten-40.json", "EPSG:28992", 60000, "EPSG:4258"),  # all geometries skipped by prefilter
+        ("linestrings_3d.json", "EPSG:7415", 200, None),
+        ("polygon_feature_with_holes.json", "EPSG:28992", 1000, "EPSG:4258"),
+        ("feature-geometry-collection.json", "EPSG:28992", 200, None),
+        ("geometry.json", "EPSG:28992", 200, None),
+    ],
+)
+def test_densify_processes_equals_serial(test_dir, input_file, src_crs, max_segment_length, dst_crs):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(
+        pyproj.CRS.from_user_input(src_crs),
+        max_segment_length,
+        dst_crs=pyproj.CRS.from_user_input(dst_crs) if dst_crs is not None else None,
+    )
+
+    stats = DenseStats()
+    stats_processes = DenseStats()
+    geojson_t = densify_geojson_object(c, geojson_obj, stats)
+    geojson_t_processes = densify_geojson_object(c, geojson_obj, stats_processes, processes=2)
+
+    assert geojson_t == geojson_t_processes
+    assert [stats.geometries, stats.skipped_geometries, stats.vertices] == [
+        stats_processes.geometries,
+        stats_processes.skipped_geometries,
+        stats_processes.vertices,
+    ]
+
+
+def test_densify_processes_long_linestring_equals_serial():
+    coords = [(100000 + i * 150, 450000 + (i % 7) * 90) for i in range(5001)]
+    feature = Feature(type="Feature", properties={}, geometry=LineString(type="LineString", coordinates=coords))
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 100)
+
+    stats = DenseStats()
+    with mock.patch("geodense.lib.LINESTRING_CHUNK_SIZE", 500):
+        feature_t_processes = densify_geojson_object(c, feature, stats, processes=3)
+    feature_t = densify_geojson_object(c, feature)
+
+    assert feature_t == feature_t_processes
+    assert stats.work_units > 1
+
+
+def test_densify_processes_infinite_coordinates_drops_geometry():
+    feature = Feature(
+        type="Feature",
+        properties={},
+        geometry=LineString(type="LineString", coordinates=[(-170, -52), (-169, -52)]),
+    )
+    c = DenseConfig(pyproj.CRS.from_epsg(4258), 1000, dst_crs=pyproj.CRS.from_epsg(3035))
+
+    feature_t = densify_geojson_object(c, feature, processes=2)
+
+    assert feature_t.geometry is None
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="shared memory blocks are only listed in /dev/shm on Linux")  # noqa: S108
+def test_densify_processes_failing_work_unit_leaves_no_shared_memory():
+    features = [
+        Feature(
+            type="Feature",
+            properties={},
+            geometry=LineString(type="LineString", coordinates=[(5.0, 100.0 if i == 0 else 52.0), (5.1, 52.1)]),
+        )
+        for i in range(4000)
+    ]
+    fc = CrsFeatureCollection(type="FeatureCollection", features=features)
+    c = DenseConfig(pyproj.CRS.from_epsg(4326), 100)
+    shm_before = set(glob.glob("/dev/shm/psm_*"))  # noqa: S108
+
+    with pytest.raises(GeodenseError, match="unable to calculate geodesic distance"):
+        densify_geojson_object(c, fc, processes=2)
+
+    assert set(glob.glob("/dev/shm/psm_*")) - shm_before == set()  # noqa: S108
+
+
+def test_densify_processes_and_threads_raises():
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 100)
+    feature = Feature(
+        type="Feature", properties={}, geometry=LineString(type="LineString", coordinates=[(0, 0), (1000, 0)])
+    )
+
+    with pytest.raises(GeodenseError, match="threads and processes cannot be combined"):
+        densify_geojson_object(c, feature, threads=2, processes=2)
+
+
+def test_dense_config_pickle():
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), 200, dst_crs=pyproj.CRS.from_epsg(4258))
+    _ = c.transformer
+
+    c_unpickled = pickle.loads(pickle.dumps(c))  # noqa: S301
+
+    assert c_unpickled.src_crs == c.src_crs
+    assert c_unpickled.dst_crs == c.dst_crs
+    assert c_unpickled.max_segment_length == c.max_segment_length
+    assert c_unpickled.transformer is not None
+    assert c_unpickled.geod is not None
+    assert c_unpickled.kernel.max_segment_length == c.kernel.max_segment_length
+
+
+def test_densify_file_processes(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "linestrings.json")
+    out_file_processes = os.path.join(tmpdir, "linestrings_processes.json")
+    densify_file(in_file, out_file, max_segment_length=100)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", ResourceWarning)  # shared memory blocks are all released
+        densify_file(in_file, out_file_processes, max_segment_length=100, processes=2)
+
+    with open(out_file) as f, open(out_file_processes) as f_processes:
+        assert f.read() == f_processes.read()
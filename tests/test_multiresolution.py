@@ -0,0 +1,165 @@
+import os
+from unittest import mock
+
+import pyproj
+import pytest
+from geojson_pydantic import Feature, GeometryCollection, LineString, Point
+
+from geodense.lib import (
+    densify_file,
+    densify_geojson_object,
+    densify_geometry,
+    get_geodesic_inverses,
+    textio_to_geojson,
+)
+from geodense.models import DenseConfig, DenseStats, GeodenseError
+from geodense.multiresolution import densify_file_multi, densify_geojson_object_multi, get_multi_output_path
+from geodense.streams import open_output
+
+MAX_SEGMENT_LENGTHS = [50, 200, 1000]
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "dst_crs", "in_projection"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", None, False),
+        ("polygons.json", "EPSG:28992", "EPSG:4258", False),
+        ("linestrings.json", "EPSG:28992", None, True),
+        ("linestrings_3d.json", "EPSG:7415", None, False),
+        ("linestrings_4326.json", "EPSG:4326", None, False),
+        ("feature-geometry-collection.json", "EPSG:28992", None, False),
+        ("geometry.json", "EPSG:28992", None, False),
+    ],
+)
+def test_densify_multi_equals_densify(test_dir, input_file, src_crs, dst_crs, in_projection):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    c = DenseConfig(
+        pyproj.CRS.from_user_input(src_crs),
+        in_projection=in_projection,
+        dst_crs=pyproj.CRS.from_user_input(dst_crs) if dst_crs is not None else None,
+    )
+    stats = DenseStats()
+    stats_multi = DenseStats()
+
+    result = densify_geojson_object_multi(c, geojson_obj, MAX_SEGMENT_LENGTHS, stats_multi)
+
+    expected = [
+        densify_geojson_object(c.with_max_segment_length(x), geojson_obj, stats if i == 0 else None)
+        for i, x in enumerate(MAX_SEGMENT_LENGTHS)
+    ]
+    assert result == expected
+    assert [stats_multi.features, stats_multi.geometries, stats_multi.vertices] == [
+        stats.features,
+        stats.geometries,
+        stats.vertices,
+    ]
+
+
+def test_densify_multi_infinite_coordinates_drops_geometry():
+    geometry_collection = GeometryCollection(
+        type="GeometryCollection",
+        geometries=[
+            LineString(type="LineString", coordinates=[(-170, -52), (-169, -52)]),
+            Point(type="Point", coordinates=(5, 52)),
+        ],
+    )
+    features = [
+        Feature(type="Feature", properties={}, geometry=geometry_collection),
+        Feature(type="Feature", properties={}, geometry=LineString(type="LineString", coordinates=[(5, 52), (6, 52)])),
+    ]
+    c = DenseConfig(pyproj.CRS.from_epsg(4258), dst_crs=pyproj.CRS.from_epsg(3035))
+
+    for feature in features:
+        result = densify_geojson_object_multi(c, feature, MAX_SEGMENT_LENGTHS)
+
+        assert result == [densify_geojson_object(c.with_max_segment_length(x), feature) for x in MAX_SEGMENT_LENGTHS]
+    assert result[0].geometry is not None
+
+
+def test_densify_multi_geometry_infinite_coordinates_raises():
+    geometry = LineString(type="LineString", coordinates=[(-170, -52), (-169, -52)])
+    c = DenseConfig(pyproj.CRS.from_epsg(4258), dst_crs=pyproj.CRS.from_epsg(3035))
+
+    with pytest.raises(
+        GeodenseError, match=r"unlike the geometry of a Feature a GeoJSON geometry cannot be written as null"
+    ):
+        densify_geojson_object_multi(c, geometry, MAX_SEGMENT_LENGTHS)
+
+
+def test_densify_multi_tolerance_raises(linestring_feature_gj):
+    c = DenseConfig(pyproj.CRS.from_epsg(28992), tolerance=1)
+
+    with pytest.raises(GeodenseError, match=r"multiple max segment lengths cannot be combined with tolerance"):
+        densify_geojson_object_multi(c, linestring_feature_gj, MAX_SEGMENT_LENGTHS)
+
+
+@pytest.mark.parametrize(
+    ("output_file_path", "max_segment_length", "expected"),
+    [
+        ("out.json", 200, "out_200.json"),
+        ("data/out.geojson.gz", 12.5, "data/out_12.5.geojson.gz"),
+        ("out", 1000.0, "out_1000"),
+    ],
+)
+def test_get_multi_output_path(output_file_path, max_segment_length, expected):
+    assert get_multi_output_path(output_file_path, max_segment_length) == expected
+
+
+def test_densify_file_multi(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "out.json")
+
+    output_paths = densify_file_multi(in_file, out_file, MAX_SEGMENT_LENGTHS, dst_crs="EPSG:4258")
+
+    assert output_paths == [os.path.join(tmpdir, f"out_{x}.json") for x in MAX_SEGMENT_LENGTHS]
+    for output_path, max_segment_length in zip(output_paths, MAX_SEGMENT_LENGTHS, strict=True):
+        expected_path = os.path.join(tmpdir, f"expected_{max_segment_length}.json")
+        densify_file(in_file, expected_path, max_segment_length=max_segment_length, dst_crs="EPSG:4258")
+        with open(output_path) as f, open(expected_path) as f_expected:
+            assert f.read() == f_expected.read()
+
+
+def test_densify_file_multi_duplicate_max_segment_lengths_raises(tmpdir, test_dir):
+    with pytest.raises(GeodenseError, match=r"max_segment_lengths must be unique"):
+        densify_file_multi(
+            os.path.join(test_dir, "data", "linestrings.json"), os.path.join(tmpdir, "out.json"), [200, 200]
+        )
+
+
+def test_densify_file_multi_writes_output_before_densifying_next(tmpdir, test_dir):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "out.json")
+    events: list[tuple[str, float | str]] = []
+
+    def _densify_geometry(config, *args):
+        if not events or events[-1] != ("densify", config.max_segment_length):
+            events.append(("densify", config.max_segment_length))
+        densify_geometry(config, *args)
+
+    def _open_output(output_path):
+        events.append(("write", os.path.basename(output_path)))
+        return open_output(output_path)
+
+    with (
+        mock.patch("geodense.multiresolution.densify_geometry", side_effect=_densify_geometry),
+        mock.patch("geodense.multiresolution.open_output", side_effect=_open_output),
+    ):
+        densify_file_multi(in_file, out_file, MAX_SEGMENT_LENGTHS)
+
+    assert events == [event for x in MAX_SEGMENT_LENGTHS for event in (("densify", x), ("write", f"out_{x}.json"))]
+
+
+def test_densify_multi_calculates_inverse_geodesics_once(test_dir):
+    with open(os.path.join(test_dir, "data", "linestrings.json")) as src:
+        geojson_obj = textio_to_geojson(src)
+    config = DenseConfig(pyproj.CRS.from_authority("EPSG", "28992"))
+
+    def _count_calls(max_segment_lengths):
+        with mock.patch(
+            "geodense.multiresolution.get_geodesic_inverses", side_effect=get_geodesic_inverses
+        ) as get_inverses:
+            densify_geojson_object_multi(config, geojson_obj, max_segment_lengths)
+        return get_inverses.call_count
+
+    assert _count_calls(MAX_SEGMENT_LENGTHS) == _count_calls(MAX_SEGMENT_LENGTHS[:1]) > 0
@@ -0,0 +1,99 @@
+import io
+import os
+import re
+from unittest import mock
+
+import pytest
+from pyproj import CRS
+
+from geodense.lib import (
+    _count_linestring_vertices,
+    check_density_file,
+    check_density_report_segments,
+    densify_file,
+    densify_geojson_object,
+    textio_to_geojson,
+)
+from geodense.models import DenseConfig, DenseStats
+from geodense.progress import ProgressReporter
+
+
+@pytest.mark.parametrize(
+    ("input_file", "src_crs", "max_segment_length", "threads"),
+    [
+        ("gemeenten-40.json", "EPSG:28992", 60000, None),
+        ("gemeenten-40.json", "EPSG:28992", 60000, 4),
+        ("fc-geometry-collection.json", "EPSG:28992", 100, None),
+        ("polygon_feature_with_holes.json", "EPSG:28992", 1000, 2),
+    ],
+)
+@mock.patch("geodense.lib.LINESTRING_CHUNK_SIZE", 25)
+def test_stats_count_all_vertices(test_dir, input_file, src_crs, max_segment_length, threads):
+    with open(os.path.join(test_dir, "data", input_file)) as f:
+        geojson_obj = textio_to_geojson(f)
+    d_conf = DenseConfig(CRS.from_user_input(src_crs), max_segment_length)
+    nr_features = len(geojson_obj.features) if hasattr(geojson_obj, "features") else 1
+
+    densify_stats = DenseStats()
+    densify_geojson_object(d_conf, geojson_obj, densify_stats, threads)
+    check_stats = DenseStats()
+    list(check_density_report_segments(d_conf, geojson_obj, check_stats, threads))
+
+    assert densify_stats.vertices == _count_linestring_vertices(geojson_obj)
+    assert check_stats.vertices == _count_linestring_vertices(geojson_obj)
+    assert densify_stats.features == nr_features
+    assert check_stats.features == nr_features
+
+
+def test_stats_increment_only_locks_with_worker_threads():
+    stats = DenseStats()
+    stats._lock = mock.MagicMock()
+
+    stats.increment("vertices", 2)
+    stats.set_work_units(4, 2)
+    stats.increment("vertices", 3)
+
+    assert stats.vertices == 5  # noqa: PLR2004
+    assert stats._lock.__enter__.call_count == 2  # noqa: PLR2004, set_work_units and increment with worker threads
+
+
+def test_progress_reporter_plain_text():
+    stats = DenseStats()
+    stream = io.StringIO()
+
+    with ProgressReporter(stats, "densify", total_features=2, total_vertices=10, interval=0.01, stream=stream):
+        stats.increment("features")
+        stats.increment("vertices", 4)
+
+    last_line = stream.getvalue().splitlines()[-1]
+    assert re.match(r"^densify: 1/2 features, 4/10 vertices, \d+ vertices/s, \d+\.\ds elapsed$", last_line)
+
+
+def test_densify_file_progress(tmpdir, test_dir, capsys):
+    densify_file(
+        os.path.join(test_dir, "data", "linestrings.json"),
+        os.path.join(tmpdir, "linestrings.json"),
+        max_segment_length=100,
+        progress=True,
+    )
+
+    captured = capsys.readouterr()
+    assert re.search(r"densify: (\d+)/\1 features, (\d+)/\2 vertices", captured.err)
+
+
+def test_check_density_file_progress(test_dir, capsys):
+    check_density_file(os.path.join(test_dir, "data", "linestrings.json"), 100, progress=True)
+
+    captured = capsys.readouterr()
+    assert re.search(r"check-density: (\d+)/\1 features, (\d+)/\2 vertices", captured.err)
+
+
+def test_densify_file_no_progress(tmpdir, test_dir, capsys):
+    densify_file(
+        os.path.join(test_dir, "data", "linestrings.json"),
+        os.path.join(tmpdir, "linestrings.json"),
+        max_segment_length=100,
+    )
+
+    captured = capsys.readouterr()
+    assert captured.err == ""
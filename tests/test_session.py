@@ -0,0 +1,99 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from geodense.lib import check_density_file, densify_file
+from geodense.models import DenseStats, GeodenseError
+from geodense.session import Densifier
+
+
+@pytest.mark.parametrize("raw_passthrough", [False, True])
+def test_densifier_densify_bytes_equals_densify_file(tmpdir, test_dir, raw_passthrough):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    out_file = os.path.join(tmpdir, "linestrings.json")
+    densify_file(in_file, out_file, max_segment_length=100, raw_passthrough=raw_passthrough)
+    densifier = Densifier("EPSG:28992", 100, raw_passthrough=raw_passthrough)
+
+    with open(in_file, "rb") as f:
+        data = f.read()
+    stats = DenseStats()
+
+    assert densifier.densify_bytes(data, stats) == densifier.densify_bytes(data)
+    with open(out_file, "rb") as f:
+        assert densifier.densify_bytes(data) == f.read()
+    assert stats.linestrings > 0
+
+
+@pytest.mark.parametrize("raw_passthrough", [False, True])
+def test_densifier_densify_bytes_without_crs_equals_densify_file(tmpdir, test_dir, raw_passthrough):
+    with open(os.path.join(test_dir, "data", "linestrings.json")) as f:
+        geojson = json.load(f)
+    del geojson["crs"]
+    in_file = os.path.join(tmpdir, "linestrings-no-crs.json")
+    out_file = os.path.join(tmpdir, "linestrings-no-crs-dense.json")
+    with open(in_file, "w") as f:
+        json.dump(geojson, f)
+    densify_file(in_file, out_file, max_segment_length=100, src_crs="EPSG:28992", raw_passthrough=raw_passthrough)
+
+    with open(in_file, "rb") as f:
+        result = Densifier("EPSG:28992", 100, raw_passthrough=raw_passthrough).densify_bytes(f.read())
+
+    with open(out_file, "rb") as f:
+        assert result == f.read()
+
+
+def test_densifier_dst_crs(test_dir):
+    with open(os.path.join(test_dir, "data", "linestrings.json"), "rb") as f:
+        data = f.read()
+
+    result = json.loads(Densifier("EPSG:28992", 100, dst_crs="EPSG:4258").densify_bytes(data))
+
+    assert result["crs"]["properties"]["name"] == "urn:ogc:def:crs:EPSG::4258"
+
+
+@pytest.mark.parametrize(
+    ("report_format", "expected_report_start"),
+    [("geojson", b"{"), ("ndjson", b'{"feature_index"'), ("csv", b"feature")],
+)
+def test_densifier_check_bytes(test_dir, report_format, expected_report_start):
+    with open(os.path.join(test_dir, "data", "linestrings.json"), "rb") as f:
+        data = f.read()
+    densifier = Densifier("EPSG:28992", 100)
+
+    check_status, report, nr_segments = densifier.check_bytes(data, report_format)
+
+    _, _, expected_nr_segments = check_density_file(os.path.join(test_dir, "data", "linestrings.json"), 100)
+    assert not check_status
+    assert nr_segments == expected_nr_segments
+    assert report.startswith(expected_report_start)
+
+
+def test_densifier_check_bytes_ok_returns_empty_report(test_dir):
+    with open(os.path.join(test_dir, "data", "linestrings.json"), "rb") as f:
+        data = f.read()
+
+    assert Densifier("EPSG:28992", 1000000).check_bytes(data) == (True, b"", 0)
+
+
+def test_densifier_crs_mismatch_raises(test_dir):
+    with open(os.path.join(test_dir, "data", "linestrings.json"), "rb") as f:
+        data = f.read()
+
+    with pytest.raises(GeodenseError, match=r"crs of GeoJSON EPSG:28992 does not match src_crs EPSG:4258 of Densifier"):
+        Densifier("EPSG:4258", 100).densify_bytes(data)
+
+
+def test_densifier_invalid_json_raises():
+    with pytest.raises(GeodenseError, match=r"received invalid JSON"):
+        Densifier("EPSG:28992", 100).check_bytes(b'{"type": "Feature",')
+
+
+@mock.patch("geodense.lib.tempfile.mkdtemp")
+def test_check_density_file_ok_creates_no_temp_dir(mock_mkdtemp, test_dir):
+    check_status, report_path, _ = check_density_file(os.path.join(test_dir, "data", "linestrings.json"), 1000000)
+
+    assert check_status
+    assert report_path is None
+    mock_mkdtemp.assert_not_called()
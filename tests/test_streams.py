@@ -0,0 +1,118 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import shutil
+from unittest import mock
+
+import pytest
+
+from geodense.lib import check_density_file, densify_file
+from geodense.streams import (
+    BackgroundWriter,
+    detect_compression,
+    get_compression,
+    open_input,
+    open_output,
+    strip_compression_ext,
+)
+
+COMPRESSORS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+@pytest.mark.parametrize(
+    ("path", "expected_compression", "expected_stripped"),
+    [
+        ("foo.geojson.gz", "gzip", "foo.geojson"),
+        ("foo.json.bz2", "bz2", "foo.json"),
+        ("foo.json.xz", "xz", "foo.json"),
+        ("foo.json.zst", None, "foo.json.zst"),
+        ("foo.json", None, "foo.json"),
+    ],
+)
+def test_get_compression(path, expected_compression, expected_stripped):
+    assert get_compression(path) == expected_compression
+    assert strip_compression_ext(path) == expected_stripped
+
+
+@pytest.mark.parametrize(("ext", "expected"), [(".gz", "gzip"), (".bz2", "bz2"), (".xz", "xz")])
+def test_detect_compression(ext, expected):
+    buffer = io.BytesIO()
+    with COMPRESSORS[ext](buffer, "wb") as f:
+        f.write(b"{}")
+    assert detect_compression(buffer.getvalue()[0:8]) == expected
+    assert detect_compression(b'{"type": "Feature"}') is None
+
+
+@pytest.mark.parametrize("ext", [".gz", ".bz2", ".xz"])
+def test_open_output_input_roundtrip(tmpdir, ext):
+    path = os.path.join(tmpdir, f"out.json{ext}")
+    text = '{"type": "FeatureCollection", "name": "één"}' * 100000
+
+    with open_output(path) as f:
+        f.write(text)
+    with COMPRESSORS[ext](path, "rt", encoding="utf-8") as f:
+        assert f.read() == text
+    with open_input(path) as f:
+        assert f.read() == text
+
+
+@pytest.mark.parametrize("ext", ["", ".gz"])
+def test_open_input_output_utf8(tmpdir, ext):
+    path = os.path.join(tmpdir, f"out.json{ext}")
+
+    with open_output(path) as f:
+        assert f.encoding == "utf-8"
+        f.write('{"name": "één"}')
+    with open_input(path) as f:
+        assert f.encoding == "utf-8"
+        assert f.read() == '{"name": "één"}'
+
+
+def test_open_input_detects_compression_by_magic_bytes(tmpdir, test_dir):
+    path = os.path.join(tmpdir, "linestrings.json")
+    with open(os.path.join(test_dir, "data", "linestrings.json"), "rb") as src, gzip.open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+    with open_input(path) as f:
+        assert json.load(f)["type"] == "FeatureCollection"
+
+
+def test_background_writer_reraises_exception():
+    target = mock.MagicMock()
+    target.write.side_effect = OSError("disk full")
+    writer = BackgroundWriter(target)
+
+    writer.write(b"foo")
+    with pytest.raises(OSError, match="disk full"):
+        writer.close()
+    target.close.assert_called_once()
+
+
+@pytest.mark.parametrize("ext", [".gz", ".bz2", ".xz"])
+def test_densify_file_compressed(tmpdir, test_dir, ext):
+    in_file = os.path.join(test_dir, "data", "linestrings.json")
+    in_file_compressed = os.path.join(tmpdir, f"linestrings.json{ext}")
+    with open(in_file, "rb") as src, COMPRESSORS[ext](in_file_compressed, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    out_file = os.path.join(tmpdir, "out.json")
+    out_file_compressed = os.path.join(tmpdir, f"out.geojson{ext}")
+
+    densify_file(in_file, out_file, max_segment_length=100)
+    densify_file(in_file_compressed, out_file_compressed, max_segment_length=100)
+
+    with open(out_file) as f, COMPRESSORS[ext](out_file_compressed, "rt") as f_compressed:
+        assert f.read() == f_compressed.read()
+
+
+def test_check_density_file_compressed_report(tmpdir, test_dir):
+    report_path = os.path.join(tmpdir, "report.ndjson.gz")
+    result, _, nr_segments = check_density_file(
+        os.path.join(test_dir, "data", "linestrings.json"), 100, report_path, report_format="ndjson"
+    )
+
+    with gzip.open(report_path, "rt") as f:
+        assert len(f.readlines()) == nr_segments
+    assert not result
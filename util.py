@@ -1,6 +1,8 @@
 import argparse
 import json
+import math
 import sys
+import time
 
 
 def gen_code_cov_badge_cmd(args):
@@ -28,6 +30,101 @@ def gen_code_cov_badge_cmd(args):
             out_f.write(coverage_badge_config)
 
 
+def bench_densify_scaling_cmd(args):
+    """Densify rings of increasing size, time per vertex should be constant when densify scales linearly."""
+    from geojson_pydantic.types import Position2D
+    from pyproj import CRS
+
+    from geodense.lib import densify_line_segment
+    from geodense.models import DenseConfig
+
+    config = DenseConfig(CRS.from_epsg(28992), args.max_segment_length)
+    print(f"{'vertices':>10} {'output':>10} {'seconds':>10} {'us/vertex':>10}")
+    for size in args.sizes:
+        radius = size * args.segment_length / (2 * math.pi)
+        ring = [
+            Position2D(
+                longitude=155000 + radius * math.cos(2 * math.pi * i / size),
+                latitude=463000 + radius * math.sin(2 * math.pi * i / size),
+            )
+            for i in range(size)
+        ]
+        ring.append(ring[0])
+        start = time.perf_counter()
+        densify_line_segment(config, ring)
+        seconds = time.perf_counter() - start
+        print(f"{size:>10} {len(ring):>10} {seconds:>10.3f} {seconds / size * 1e6:>10.2f}")
+
+
+def bench_memory_cmd(args):
+    """Densify and check density of generated files of increasing size, reports peak traced memory per input vertex.
+
+    Exits with 1 when bytes per vertex exceeds --max-bytes-per-vertex, to catch memory regressions.
+    """
+    import os
+    import tempfile
+    import tracemalloc
+    from functools import partial
+
+    from geodense.lib import check_density_file, densify_file
+
+    vertices_per_feature = 1000
+    exceeded = False
+    print(f"{'command':>14} {'vertices':>10} {'peak MiB':>10} {'bytes/vertex':>13}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            input_file = os.path.join(tmp_dir, f"input-{size}.json")
+            features = [
+                {
+                    "type": "Feature",
+                    "properties": {"id": i},
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [
+                            [100000 + j * args.segment_length, 400000 + i * 100] for j in range(vertices_per_feature)
+                        ],
+                    },
+                }
+                for i in range(max(1, size // vertices_per_feature))
+            ]
+            nr_vertices = len(features) * vertices_per_feature
+            with open(input_file, "w") as f:
+                json.dump(
+                    {
+                        "type": "FeatureCollection",
+                        "crs": {"type": "name", "properties": {"name": "urn:ogc:def:crs:EPSG::28992"}},
+                        "features": features,
+                    },
+                    f,
+                )
+            del features
+            runs = {
+                "densify": partial(
+                    densify_file, input_file, os.path.join(tmp_dir, "output.json"), True, args.max_segment_length
+                ),
+                "check-density": partial(
+                    check_density_file,
+                    input_file,
+                    args.max_segment_length,
+                    os.path.join(tmp_dir, "report.json"),
+                    overwrite=True,
+                ),
+            }
+            for command, run in runs.items():
+                tracemalloc.start()
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                bytes_per_vertex = peak / nr_vertices
+                exceeded = exceeded or (
+                    args.max_bytes_per_vertex is not None and bytes_per_vertex > args.max_bytes_per_vertex
+                )
+                print(f"{command:>14} {nr_vertices:>10} {peak / 2**20:>10.1f} {bytes_per_vertex:>13.0f}")
+    if exceeded:
+        print(f"bytes/vertex exceeds --max-bytes-per-vertex {args.max_bytes_per_vertex}")
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="CLI tool to perform utility tasks in repository",
@@ -41,6 +138,25 @@ def main():
     cov_badge_parser.add_argument("input_file", type=str)
     cov_badge_parser.add_argument("output_file", type=str)
     cov_badge_parser.set_defaults(func=gen_code_cov_badge_cmd)
+    bench_scaling_parser = subparsers.add_parser(
+        "bench-densify-scaling",
+        description="Benchmark scaling of densify with the nr of vertices of a linestring",
+    )
+    bench_scaling_parser.add_argument(
+        "--sizes", type=lambda x: [int(y) for y in x.split(",")], default=[1000, 10000, 100000]
+    )
+    bench_scaling_parser.add_argument("--segment-length", type=float, default=300)
+    bench_scaling_parser.add_argument("--max-segment-length", type=float, default=200)
+    bench_scaling_parser.set_defaults(func=bench_densify_scaling_cmd)
+    bench_memory_parser = subparsers.add_parser(
+        "bench-memory",
+        description="Benchmark peak memory per input vertex of densify and check-density with the size of the input file",
+    )
+    bench_memory_parser.add_argument("--sizes", type=lambda x: [int(y) for y in x.split(",")], default=[10000, 100000])
+    bench_memory_parser.add_argument("--segment-length", type=float, default=300)
+    bench_memory_parser.add_argument("--max-segment-length", type=float, default=200)
+    bench_memory_parser.add_argument("--max-bytes-per-vertex", type=float, default=None)
+    bench_memory_parser.set_defaults(func=bench_memory_cmd)
     args = parser.parse_args()
 
     try: